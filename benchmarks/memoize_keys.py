@@ -0,0 +1,61 @@
+"""
+Benchmark of memoization hit path
+
+Compares cost of a cache hit between ``memoize``
+with hash-based keys, ``memoize`` with ``repr()`` based
+keys (how keys used to be computed) and ``functools.lru_cache``.
+
+Usage::
+
+    $ python benchmarks/memoize_keys.py
+"""
+from __future__ import print_function, unicode_literals
+import functools
+import timeit
+
+from django_auxilium.utils.functools.cache import MemoizeDecorator, Memoizing
+
+
+NUMBER = 100000
+
+
+class ReprMemoizing(Memoizing):
+    def _get_key(self, *args, **kwargs):
+        return repr(args) + repr(sorted(kwargs.items()))
+
+
+class ReprMemoizeDecorator(MemoizeDecorator):
+    cache_class = ReprMemoizing
+
+
+def compute(*args, **kwargs):
+    return len(args) + len(kwargs)
+
+
+CASES = [
+    ('single int', (5,), {}),
+    ('two strings', ('foo', 'bar'), {}),
+    ('kwargs', ('foo',), {'bar': 5, 'hello': 'world'}),
+    ('large tuple', (tuple(range(200)),), {}),
+]
+
+IMPLEMENTATIONS = [
+    ('memoize', MemoizeDecorator.as_decorator()),
+    ('memoize (repr keys)', ReprMemoizeDecorator.as_decorator()),
+]
+if hasattr(functools, 'lru_cache'):
+    IMPLEMENTATIONS.append(('lru_cache', functools.lru_cache(maxsize=None)))
+
+
+def main():
+    for case, args, kwargs in CASES:
+        print(case)
+        for name, decorator in IMPLEMENTATIONS:
+            f = decorator(compute)
+            f(*args, **kwargs)
+            seconds = timeit.timeit(lambda: f(*args, **kwargs), number=NUMBER)
+            print('    {0:<20} {1:>8.3f} us/call'.format(name, seconds / NUMBER * 1e6))
+
+
+if __name__ == '__main__':
+    main()
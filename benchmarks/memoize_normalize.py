@@ -0,0 +1,78 @@
+"""
+Benchmark of signature-normalized memoization keys
+
+Compares ``memoize`` with and without ``normalize=True``.
+First it measures cost of a cache hit for calls in different styles
+which shows overhead of binding parameters to the signature.
+Then it runs a workload where the same parameters are passed
+in mixed styles which shows how many computations binding saves.
+
+Usage::
+
+    $ python benchmarks/memoize_normalize.py
+"""
+from __future__ import print_function, unicode_literals
+import itertools
+import timeit
+
+from django_auxilium.utils.functools.cache import MemoizeDecorator
+
+
+NUMBER = 100000
+WORKLOAD_SIZE = 200
+
+
+def compute(a, b=2, c=None):
+    # somewhat expensive computation such as a query or serialization
+    return sum(range(2000)) + a + b
+
+
+STYLES = [
+    ('positional', lambda f, i: f(i, 2)),
+    ('keyword', lambda f, i: f(i, b=2)),
+    ('all keywords', lambda f, i: f(a=i, b=2)),
+    ('defaults', lambda f, i: f(i)),
+]
+
+IMPLEMENTATIONS = [
+    ('memoize', MemoizeDecorator.as_decorator()),
+    ('memoize (normalize)', MemoizeDecorator.as_decorator(normalize=True)),
+]
+
+
+def bench_hits():
+    print('cache hit')
+    for style, call in STYLES:
+        print('    {0}'.format(style))
+        for name, decorator in IMPLEMENTATIONS:
+            f = decorator(compute)
+            call(f, 5)
+            seconds = timeit.timeit(lambda: call(f, 5), number=NUMBER)
+            print('        {0:<20} {1:>8.3f} us/call'.format(name, seconds / NUMBER * 1e6))
+
+
+def bench_workload():
+    print('mixed style workload of {0} distinct calls'.format(WORKLOAD_SIZE))
+    calls = list(itertools.product(range(WORKLOAD_SIZE), [call for _, call in STYLES]))
+    for name, decorator in IMPLEMENTATIONS:
+        f = decorator(compute)
+
+        def run():
+            f.decorator.__dict__.pop('cached_value', None)
+            for i, call in calls:
+                call(f, i)
+
+        seconds = min(timeit.repeat(run, number=1, repeat=5))
+        run()
+        print('    {0:<20} {1:>8.3f} ms {2:>5} cached values'.format(
+            name, seconds * 1e3, len(f.decorator.cached_value)
+        ))
+
+
+def main():
+    bench_hits()
+    bench_workload()
+
+
+if __name__ == '__main__':
+    main()
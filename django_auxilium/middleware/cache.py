@@ -0,0 +1,47 @@
+from __future__ import print_function, unicode_literals
+
+from django_auxilium.utils.functools.cache_request import request_cache_scope
+
+
+class RequestCacheMiddleware(object):
+    """
+    Middleware for opening request cache scope for each request.
+
+    Within the scope, :py:data:`request_memoize <django_auxilium.utils.functools.cache_request.request_memoize>`
+    functions cache their values and all of them are discarded
+    once the request is processed.
+    That guarantees cached values never leak between requests.
+
+    This middleware should be placed before any other middleware
+    which might use request memoized functions.
+
+    See Also
+    --------
+    django_auxilium.utils.functools.cache_request.request_cache_scope
+        What is used to actually open the scope
+    """
+
+    def __init__(self, get_response=None):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with request_cache_scope():
+            return self.get_response(request)
+
+    def process_request(self, request):
+        """
+        Open request cache scope when used as old-style middleware
+        """
+        scope = request_cache_scope()
+        scope.__enter__()
+        request._request_cache_scope = scope
+
+    def process_response(self, request, response):
+        """
+        Close request cache scope opened in :py:meth:`process_request`
+        """
+        scope = getattr(request, '_request_cache_scope', None)
+        if scope is not None:
+            del request._request_cache_scope
+            scope.__exit__(None, None, None)
+        return response
@@ -1,3 +1,4 @@
 from .base import *  # noqa
+from .cache import *  # noqa
 from .fields import *  # noqa
 from .signals import *  # noqa
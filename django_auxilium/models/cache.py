@@ -0,0 +1,224 @@
+"""
+Caching utilities which are aware of Django models
+"""
+from __future__ import print_function, unicode_literals
+
+from django.db import models
+
+from django_auxilium.utils.functools.cache import MemoizeDecorator, NotInCache
+from django_auxilium.utils.functools.cache_batch import batch_cache_groups
+from django_auxilium.utils.functools.cache_django import DjangoMemoizing
+
+
+class ModelMemoizing(DjangoMemoizing):
+    """
+    Caching implementation which stores values of model methods
+    in Django cache keyed by the model row and its last modification time
+
+    Since values are keyed by ``(app_label.model, pk, modified)``
+    rather than by a model instance, all instances of the same
+    row share cached values, even across requests and processes.
+    When the row is saved, its ``modified`` timestamp changes
+    and so do the keys hence previously cached values are
+    implicitly invalidated and simply expire in the cache backend.
+
+    This is meant to be used with models which have
+    :py:class:`ModifiedModel <django_auxilium.models.base.ModifiedModel>`
+    as one of their bases. Unsaved instances (without ``pk``
+    or ``modified``) are never cached.
+
+    Parameters
+    ----------
+    parent : Model
+        Model instance which values are cached
+    attr : str
+        Same as :py:class:`DjangoMemoizing <django_auxilium.utils.functools.cache_django.DjangoMemoizing>`
+        ``attr`` parameter
+    modified_field : str, optional
+        Name of the field with last modification time.
+        By default is ``'modified'``.
+    cache_options
+        Any additional keyword arguments are passed to
+        :py:class:`DjangoMemoizing <django_auxilium.utils.functools.cache_django.DjangoMemoizing>`
+    """
+
+    def __init__(self, parent, attr, modified_field='modified', **cache_options):
+        super(ModelMemoizing, self).__init__(parent, attr, **cache_options)
+        self.modified_field = modified_field
+
+    def _get_row(self):
+        pk = self.parent.pk
+        modified = getattr(self.parent, self.modified_field)
+        if pk is None or modified is None:
+            return None
+        opts = self.parent._meta
+        return '{0}.{1}:{2}:{3}'.format(
+            opts.app_label, opts.model_name, pk, modified.isoformat(),
+        )
+
+    def _get_params(self, *args, **kwargs):
+        params = super(ModelMemoizing, self)._get_params(*args, **kwargs)
+        return '{0}:{1}'.format(self._get_row(), params)
+
+    def get(self, *args, **kwargs):
+        """
+        Get the cache value of the model row
+
+        Raises
+        ------
+        NotInCache
+            When the cache is not set or when instance is not saved
+        """
+        if self._get_row() is None:
+            raise NotInCache
+        return super(ModelMemoizing, self).get(*args, **kwargs)
+
+    def set(self, value, *args, **kwargs):
+        """
+        Store the cache value of the model row.
+        Nothing is stored for unsaved instances.
+        """
+        if self._get_row() is None:
+            return value
+        return super(ModelMemoizing, self).set(value, *args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """
+        Delete the cache value of the model row
+
+        Raises
+        ------
+        NotInCache
+            When the cache is not set or when instance is not saved
+        """
+        if self._get_row() is None:
+            raise NotInCache
+        return super(ModelMemoizing, self).delete(*args, **kwargs)
+
+
+class ModelMemoizeDecorator(MemoizeDecorator):
+    """
+    Decorator for memoizing model methods across all instances
+    of the same model row
+
+    See :py:class:`ModelMemoizing` for how the values are stored.
+
+    Examples
+    --------
+
+    ::
+
+        >>> import random
+        >>> from django.db import models
+        >>> from django_auxilium.models import ModifiedModel
+
+        >>> class Product(ModifiedModel):
+        ...     class Meta(object):
+        ...         app_label = str(random.randrange(1000, 2000))
+        ...     @model_memoize(timeout=60 * 60)
+        ...     def get_score(self, region):
+        ...         return 5
+
+    Parameters
+    ----------
+    backend : str, optional
+        Alias of Django cache as configured in ``settings.CACHES``
+        where to store cached values. By default is ``'default'``.
+    modified_field : str, optional
+        Same as :py:class:`ModelMemoizing` ``modified_field`` parameter
+    timeout : int, optional
+        Same as :py:class:`DjangoMemoizing <django_auxilium.utils.functools.cache_django.DjangoMemoizing>`
+        ``timeout`` parameter
+    version : int, str, optional
+        Same as :py:class:`DjangoMemoizing <django_auxilium.utils.functools.cache_django.DjangoMemoizing>`
+        ``version`` parameter
+    """
+    model_cache_class = ModelMemoizing
+    """
+    Caching implementation to use for model methods.
+    This attribute is meant to be changed in subclasses.
+    """
+
+    def __init__(self, backend='default', *args, **kwargs):
+        if kwargs.get('tiered'):
+            raise ValueError('`tiered` is not supported for model memoization')
+        super(ModelMemoizeDecorator, self).__init__(backend, *args, **kwargs)
+
+    def get_cache(self):
+        """
+        Custom implementation for getting the caching implementation
+        which makes sure decorator is not used for standalone functions
+        """
+        raise TypeError('Model memoization can only be used on model methods')
+
+    def get_cache_descriptor(self):
+        """
+        Custom implementation for getting the cache descriptor
+        which stores values via :py:attr:`model_cache_class`
+        in ``backend`` namespaced by the method import path
+        """
+        options = self.get_cache_descriptor_options()
+        options.setdefault('namespace', self.get_namespace())
+        return self.cache_descriptor_class(
+            self.to_wrap,
+            cache_class=self.model_cache_class,
+            alias=self.backend,
+            **options
+        )
+
+
+class BatchCacheQuerySet(models.QuerySet):
+    """
+    QuerySet which registers all model instances of a single
+    evaluation as a group in :py:data:`batch_cache_groups <django_auxilium.utils.functools.cache_batch.batch_cache_groups>`
+
+    That allows :py:data:`batch_cache_method <django_auxilium.utils.functools.cache_batch.batch_cache_method>`
+    to compute values for all instances from the same queryset
+    at once when accessed on any of them.
+
+    .. note::
+        Instances yielded by ``iterator()`` are not grouped
+        since they are never fetched all together.
+
+    Examples
+    --------
+    ::
+
+        >>> import random
+        >>> from django_auxilium.utils.functools import batch_cache_method
+
+        >>> def get_scores(products):
+        ...     return [0 for i in products]
+
+        >>> class Product(models.Model):
+        ...     class Meta(object):
+        ...         app_label = str(random.randrange(1000, 2000))
+        ...     objects = BatchCacheManager()
+        ...     score = batch_cache_method(get_scores)
+    """
+    groups = batch_cache_groups
+    """
+    Registry where instance groups are registered.
+    This attribute is meant to be changed in subclasses.
+    """
+
+    def _fetch_all(self):
+        fetched = self._result_cache is not None
+        super(BatchCacheQuerySet, self)._fetch_all()
+        if not fetched:
+            instances = [i for i in self._result_cache if isinstance(i, models.Model)]
+            if instances:
+                self.groups.register(instances)
+
+
+BatchCacheManager = models.Manager.from_queryset(BatchCacheQuerySet)
+"""
+Manager using :py:class:`BatchCacheQuerySet`
+"""
+
+
+model_memoize = ModelMemoizeDecorator.as_decorator(is_method=True)
+"""
+Shortcut for :py:class:`ModelMemoizeDecorator` which memoizes
+model methods across all instances of the same unchanged row
+"""
@@ -1,12 +1,18 @@
 from __future__ import print_function, unicode_literals
 import inspect
 from collections import namedtuple
+from functools import wraps
 
 import six
 from django.db import models
 from django.dispatch.dispatcher import Signal
 
-from django_auxilium.utils.functools import Decorator, cache
+from django_auxilium.utils.functools import (
+    Decorator,
+    WeakIdKeyDictionary,
+    cache,
+    get_cache_descriptors,
+)
 
 
 FieldSpec = namedtuple('FieldSpec', ['name', 'field'])
@@ -655,6 +661,214 @@ class AutoSignals(Decorator):
         kwargs.pop('signal').connect(**kwargs)
 
 
+class AutoCacheInvalidation(AutoSignals):
+    """
+    Model decorator which automatically clears values cached on model
+    instances by cache descriptors (e.g. :py:data:`cache_method <django_auxilium.utils.functools.cache.cache_method>`,
+    :py:data:`cache_property <django_auxilium.utils.functools.cache.cache_property>`
+    and :py:data:`memoize <django_auxilium.utils.functools.cache.memoize>`)
+    whenever the instance is saved, deleted or refreshed from db.
+
+    Signal receivers are connected the same way as by :py:class:`AutoSignals`
+    and ``refresh_from_db`` of the decorated model is wrapped
+    since Django does not send any signal for it.
+
+    By default all cached values are cleared. When ``fields`` are given,
+    cached values are only cleared when fields they depend on change.
+    Changed fields are known when:
+
+    * ``update_fields`` is passed to ``save()``
+    * model implements ``get_dirty_fields()`` which is used before saving.
+      This is implemented by
+      `django-dirtyfields <https://pypi.python.org/pypi/django-dirtyfields/>`_.
+    * ``fields`` is passed to ``refresh_from_db()``
+
+    Otherwise all cached values are cleared.
+
+    Examples
+    --------
+
+    ::
+
+        >>> import random
+        >>> from django_auxilium.utils.functools import cache_method, cache_property
+
+        >>> @auto_cache_invalidation(fields={'total': ['price', 'quantity']})
+        ... class Item(models.Model):
+        ...     class Meta(object):
+        ...         app_label = str(random.randrange(1000, 2000))
+        ...     name = models.CharField(max_length=32)
+        ...     price = models.IntegerField()
+        ...     quantity = models.IntegerField()
+        ...     @cache_property
+        ...     def total(self):
+        ...         return self.price * self.quantity
+        ...     @cache_method
+        ...     def label(self):
+        ...         return '{} x{}'.format(self.name, self.quantity)
+
+    Parameters
+    ----------
+    fields : dict, optional
+        Mapping of cached attribute names to model field names they depend on.
+        Cached attributes which are not in the mapping are cleared
+        on any change.
+    signal_pool : dict, optional
+        Same as :py:class:`AutoSignals` ``signal_pool`` parameter
+    dispatch_uid_pattern : str, optional
+        Pattern of the ``dispatch_uid`` of connected receivers.
+        ``signal`` and ``model`` are passed into the pattern.
+        By default is
+        ``'{signal}_{model._meta.app_label}.{model._meta.model_name}_clear_caches'``
+        which can be used to disconnect receivers at a later time.
+
+    Attributes
+    ----------
+    changed_fields : WeakIdKeyDictionary
+        Fields which changed as recorded before instances are saved
+    """
+
+    def __init__(self, fields=None, signal_pool=None, dispatch_uid_pattern=None):
+        super(AutoCacheInvalidation, self).__init__(getter=None, signal_pool=signal_pool)
+        self.fields = {k: set(v) for k, v in (fields or {}).items()}
+        self.dispatch_uid_pattern = (
+            dispatch_uid_pattern or
+            '{signal}_{model._meta.app_label}.{model._meta.model_name}_clear_caches'
+        )
+        self.changed_fields = WeakIdKeyDictionary()
+
+    def validate_model(self):
+        """
+        Validate that the decorated object is a valid Django model
+        class and that all cached attributes given in ``fields``
+        are cache descriptors on the model
+        """
+        if not inspect.isclass(self.to_wrap):
+            raise TypeError('This decorator can only be applied to classes')
+        if not issubclass(self.to_wrap, models.Model):
+            raise TypeError('Decorator can only be applied to Django models')
+
+        descriptors = get_cache_descriptors(self.to_wrap)
+        for name in self.fields:
+            if name not in descriptors:
+                raise AttributeError(
+                    'Cached attribute "{0}" cannot be found'.format(name)
+                )
+
+    def get_wrapped_object(self):
+        """
+        Return the given model with connected signals
+        and wrapped ``refresh_from_db``
+
+        See Also
+        --------
+        validate_model
+        connect_signals
+        wrap_refresh_from_db
+        """
+        self.validate_model()
+        self.connect_signals()
+        self.wrap_refresh_from_db()
+        return self.to_wrap
+
+    def tracks_changes(self):
+        """
+        Whether decorated model can tell which fields changed before save
+        """
+        return callable(getattr(self.to_wrap, 'get_dirty_fields', None))
+
+    def get_signals(self):
+        """
+        Get signals to be connected to the decorated model.
+        See :py:class:`AutoSignals` for the supported format.
+        """
+        def pre_save(sender, instance, *args, **kwargs):
+            self.changed_fields[instance] = set(instance.get_dirty_fields())
+
+        def post_save(sender, instance, *args, **kwargs):
+            changed_fields = self.changed_fields.pop(instance, None)
+            if kwargs.get('update_fields') is not None:
+                changed_fields = set(kwargs['update_fields'])
+            self.clear_caches(instance, changed_fields)
+
+        def post_delete(sender, instance, *args, **kwargs):
+            self.clear_caches(instance)
+
+        receivers = [post_save, post_delete]
+        if self.tracks_changes():
+            receivers.insert(0, pre_save)
+
+        return [
+            {
+                'receiver': receiver,
+                'weak': False,
+                'dispatch_uid': self.dispatch_uid_pattern.format(
+                    signal=receiver.__name__, model=self.to_wrap,
+                ),
+            }
+            for receiver in receivers
+        ]
+
+    def connect_signals(self):
+        """
+        Connect all signals as returned by :py:meth:`get_signals`
+        """
+        for signal in self.get_signals():
+            self.connect_signal(signal)
+
+    def wrap_refresh_from_db(self):
+        """
+        Wrap ``refresh_from_db`` of the decorated model so that
+        it clears cached values of refreshed fields
+
+        Django also uses ``refresh_from_db`` to load deferred fields
+        when they are accessed. Such fields are only loaded rather than
+        changed hence they do not clear any cached values.
+        """
+        refresh_from_db = self.to_wrap.refresh_from_db
+
+        @wraps(refresh_from_db)
+        def wrapper(instance, using=None, fields=None, *args, **kwargs):
+            if fields is None:
+                changed_fields = None
+            else:
+                changed_fields = set(fields) - instance.get_deferred_fields()
+            value = refresh_from_db(instance, using, fields, *args, **kwargs)
+            if changed_fields is None or changed_fields:
+                self.clear_caches(instance, changed_fields)
+            return value
+
+        self.to_wrap.refresh_from_db = wrapper
+
+    def clear_caches(self, instance, changed_fields=None):
+        """
+        Clear cached values of the given instance
+
+        Parameters
+        ----------
+        instance : Model
+            Model instance of which cached values to clear
+        changed_fields : set, optional
+            Names of changed fields. When not provided
+            all cached values are cleared.
+
+        Returns
+        -------
+        list
+            Names of cached attributes which were cleared
+        """
+        cleared = []
+        for name, descriptor in get_cache_descriptors(type(instance)).items():
+            depends_on = self.fields.get(name)
+            if changed_fields is not None and depends_on is not None:
+                if not depends_on & changed_fields:
+                    continue
+            if descriptor.clear(instance):
+                cleared.append(name)
+        return cleared
+
+
 file_field_auto_delete = FileFieldAutoDelete.as_decorator()
 file_field_auto_change_delete = FileFieldAutoChangeDelete.as_decorator()
 auto_signals = AutoSignals.as_decorator()
+auto_cache_invalidation = AutoCacheInvalidation.as_decorator()
@@ -1,3 +1,7 @@
 from .cache import *  # noqa
+from .cache_batch import *  # noqa
+from .cache_request import *  # noqa
+from .cache_sqlite import *  # noqa
+from .cache_warm import *  # noqa
 from .decorators import *  # noqa
 from .lazy import *  # noqa
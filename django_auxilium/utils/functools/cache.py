@@ -1,13 +1,96 @@
 from __future__ import print_function, unicode_literals
 import abc
+import copy
+import inspect
+import logging
+import sys
+import threading
+import time
 import types
-from functools import partial, wraps
+import weakref
+import zlib
+from collections import OrderedDict, deque, namedtuple
+from functools import partial
+from timeit import default_timer
 
 import six
+from django.db import connections
+from six.moves import copyreg, queue
 
 from .decorators import HybridDecorator
 
 
+try:
+    import asyncio
+except ImportError:  # pragma: no cover
+    asyncio = None
+
+
+log = logging.getLogger(__name__)
+
+
+def is_coroutine_function(f):
+    """
+    Check whether given callable is a coroutine function (``async def``)
+
+    Always ``False`` when ``asyncio`` is not available.
+    """
+    return asyncio is not None and asyncio.iscoroutinefunction(f)
+
+
+def get_qualified_name(f):
+    """
+    Get full import path of the given function
+    """
+    return '{0}.{1}'.format(
+        f.__module__,
+        getattr(f, '__qualname__', f.__name__),
+    )
+
+
+def deep_getsizeof(obj):
+    """
+    Estimate memory size of the given object in bytes
+    including all objects it references
+
+    References are followed through builtin containers
+    and instance attributes (``__dict__``). Each object is
+    counted once even when it is referenced multiple times.
+    Classes, modules and functions are counted however
+    not followed since they are usually shared.
+
+    Examples
+    --------
+    ::
+
+        >>> deep_getsizeof([b'foo' * 100]) > deep_getsizeof([b'foo'])
+        True
+    """
+    seen = set()
+    stack = [obj]
+    size = 0
+
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            stack.extend(obj)
+        elif not isinstance(obj, (type, types.ModuleType, types.FunctionType,
+                                  types.MethodType, types.BuiltinFunctionType)):
+            attrs = getattr(obj, '__dict__', None)
+            if attrs is not None:
+                stack.append(attrs)
+
+    return size
+
+
 class NotInCache(Exception):
     """
     Exception for when a value is not present in cache.
@@ -17,6 +100,34 @@ class NotInCache(Exception):
     """
 
 
+class StaleInCache(NotInCache):
+    """
+    Exception for when a value is present in cache however it is expired
+    though still within its ``stale_while_revalidate`` window
+
+    Since it is a subclass of :py:class:`NotInCache`, code which is not
+    aware of stale values simply treats them as missing.
+
+    Parameters
+    ----------
+    value : object
+        Stale cache value which can be served while it is being refreshed
+    """
+
+    def __init__(self, value):
+        super(StaleInCache, self).__init__()
+        self.value = value
+
+
+CacheEntry = namedtuple('CacheEntry', ['value', 'expires'])
+"""
+Cache entry which is stored by cache implementations
+when values should expire. ``expires`` is the
+:py:attr:`BaseCache.clock` time after which ``value``
+is no longer valid.
+"""
+
+
 class BaseCache(six.with_metaclass(abc.ABCMeta, object)):
     """
     Base class for implementing cache implementations
@@ -28,11 +139,67 @@ class BaseCache(six.with_metaclass(abc.ABCMeta, object)):
     attr : str
         Name of the attribute under which cache will be stored
         in the ``parent`` object
+    ttl : int, float, optional
+        Number of seconds cache values are valid for.
+        When given, values are stored as :py:class:`CacheEntry`
+        along with their expiry time. By default cache values
+        never expire.
+    clock : callable, optional
+        Callable which returns current time in seconds.
+        By default :py:attr:`default_clock` is used.
+        Mostly useful for controlling time in tests.
+    stats : CacheStats, optional
+        Statistics where to report events which only caching
+        implementation knows about such as evictions
+    stale_while_revalidate : int, float, optional
+        Number of seconds after ``ttl`` expires during which
+        expired value is still returned however as
+        :py:class:`StaleInCache` so that it can be served
+        while it is being refreshed. Once this window passes
+        as well, value is considered missing.
+        Can only be used along with ``ttl``.
+    """
+    default_clock = staticmethod(getattr(time, 'monotonic', time.time))
+    """
+    Callable used to determine current time when
+    ``clock`` is not explicitly provided.
+    This attribute is meant to be changed in subclasses
+    to customize the functionality.
     """
 
-    def __init__(self, parent, attr):
+    def __init__(self, parent, attr, ttl=None, clock=None, stats=None,
+                 stale_while_revalidate=None):
+        if stale_while_revalidate is not None and ttl is None:
+            raise ValueError('`stale_while_revalidate` can only be used along with `ttl`')
         self.parent = parent
         self.attr = attr
+        self.ttl = ttl
+        self.clock = clock or self.default_clock
+        self.stats = stats
+        self.stale_while_revalidate = stale_while_revalidate
+
+    def _pack(self, value):
+        if self.ttl is None:
+            return value
+        return CacheEntry(value, self.clock() + self.ttl)
+
+    def _unpack(self, stored):
+        if self.ttl is None:
+            return stored
+        return self._unpack_entry(stored)
+
+    def _unpack_entry(self, entry):
+        now = self.clock()
+        if entry.expires > now:
+            return entry.value
+        if self.stale_while_revalidate is None:
+            raise NotInCache
+        if entry.expires + self.stale_while_revalidate <= now:
+            raise NotInCache
+        raise StaleInCache(entry.value)
+
+    def _get_key(self, *args, **kwargs):
+        return None
 
     def get(self, *args, **kwargs):
         """
@@ -95,15 +262,30 @@ class Caching(BaseCache):
             When the cache is not set
         """
         try:
-            return getattr(self.parent, self.attr)
+            value = getattr(self.parent, self.attr)
         except AttributeError:
             raise NotInCache
 
+        try:
+            return self._unpack(value)
+        except StaleInCache:
+            raise
+        except NotInCache:
+            self._delete_attr()
+            raise
+
+    def _delete_attr(self):
+        # getattr/delattr instead of __dict__ so that
+        # cache can be stored in __slots__
+        value = getattr(self.parent, self.attr)
+        delattr(self.parent, self.attr)
+        return value
+
     def set(self, value, *args, **kwargs):
         """
         Store the cache value on the ``parent`` object
         """
-        setattr(self.parent, self.attr, value)
+        setattr(self.parent, self.attr, self._pack(value))
         return value
 
     def delete(self, *args, **kwargs):
@@ -116,9 +298,245 @@ class Caching(BaseCache):
             When the cache is not set and so cannot be deleted
         """
         try:
-            return self.parent.__dict__.pop(self.attr)
-        except KeyError:
+            value = self._delete_attr()
+        except AttributeError:
             raise NotInCache
+        return self._unpack(value)
+
+
+class LRUStore(OrderedDict):
+    """
+    Dictionary which holds at most ``maxsize`` items
+    or at most ``max_bytes`` bytes of values
+
+    When a new item is added and the store is full,
+    least recently used items are evicted. Both reading
+    and writing items mark them as most recently used.
+    All operations are ``O(1)`` except for computing
+    the size of added values when ``max_bytes`` is used.
+    Since reading reorders items, all operations are
+    guarded by a lock so the store can be shared by threads.
+
+    Examples
+    --------
+    ::
+
+        >>> store = LRUStore(2)
+        >>> store['a'] = 1
+        >>> store['b'] = 2
+        >>> store['a']
+        1
+        >>> store['c'] = 3
+        >>> sorted(store.keys())
+        ['a', 'c']
+        >>> store.evictions
+        1
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of items in the store.
+        When ``None``, store is unbounded.
+    stats : CacheStats, optional
+        Statistics where to additionally report evictions.
+        When ``max_bytes`` is used, store is also registered
+        in stats so that they report its usage.
+    max_bytes : int, optional
+        Maximum total size of values in the store in bytes
+        as estimated by ``sizer``. A value which alone is larger
+        than this budget is not stored and is counted as evicted
+        while other values are kept.
+        When ``None``, size of values is not tracked.
+    sizer : callable, optional
+        Callable which estimates size of a value in bytes.
+        By default :py:func:`deep_getsizeof` is used.
+    on_evict : callable, optional
+        Callable which is called with the key of each evicted item
+
+    ``stats`` and ``on_evict`` are not pickled or copied along with
+    the store since they are bound to the cache which created the store.
+    Restored stores are detached until :py:meth:`attach` is called.
+
+    Attributes
+    ----------
+    evictions : int
+        Number of items evicted from the store so far.
+        Useful to determine appropriate ``maxsize``.
+    nbytes : int
+        Total size of values in the store in bytes.
+        Always ``0`` when ``max_bytes`` is not used.
+    """
+    default_sizer = staticmethod(deep_getsizeof)
+    """
+    Callable used to estimate size of values when
+    ``sizer`` is not explicitly provided.
+    This attribute is meant to be changed in subclasses
+    to customize the functionality.
+    """
+
+    def __init__(self, maxsize=None, stats=None, max_bytes=None, sizer=None, on_evict=None,
+                 *args, **kwargs):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.sizer = sizer or self.default_sizer
+        self.sizes = {}
+        self.nbytes = 0
+        self.evictions = 0
+        # reordering and eviction mutate the store even on reads
+        # hence all operations are serialized like in functools.lru_cache
+        self.lock = threading.RLock()
+        self.attach(stats, on_evict)
+        super(LRUStore, self).__init__(*args, **kwargs)
+
+    def __reduce__(self):
+        # stats hold weak references and eviction callbacks
+        # can reference locks hence neither can be pickled
+        state = {
+            k: v for k, v in vars(self).items()
+            if k not in ('lock', 'sizes', 'nbytes', 'stats', 'on_evict')
+        }
+        with self.lock:
+            items = [(k, super(LRUStore, self).__getitem__(k)) for k in self]
+        return (
+            self.__class__,
+            (self.maxsize, None, self.max_bytes, self.sizer),
+            state,
+            None,
+            iter(items),
+        )
+
+    def attach(self, stats=None, on_evict=None):
+        """
+        Set ``stats`` and ``on_evict`` of the store
+
+        Used by caching implementations to attach
+        restored stores back to their cache.
+        See ``stats`` and ``on_evict`` parameters.
+        """
+        with self.lock:
+            self.stats = stats
+            self.on_evict = on_evict
+            if self.max_bytes is not None and stats is not None:
+                stats.stores[id(self)] = self
+
+    def __getitem__(self, key):
+        with self.lock:
+            value = super(LRUStore, self).__getitem__(key)
+            # reinserting moves key to the end which marks it as most recently used
+            super(LRUStore, self).__delitem__(key)
+            super(LRUStore, self).__setitem__(key, value)
+            return value
+
+    def __setitem__(self, key, value):
+        size = None
+        if self.max_bytes is not None:
+            size = self.sizer(value)
+
+        with self.lock:
+            if key in self:
+                self._discard(key)
+
+            if size is not None:
+                if size > self.max_bytes:
+                    # value cannot fit even in empty store
+                    # so there is no point evicting other values
+                    self._evicted(key)
+                    return
+                self.sizes[key] = size
+                self.nbytes += size
+                while self.nbytes > self.max_bytes:
+                    self._evict()
+            super(LRUStore, self).__setitem__(key, value)
+
+            if self.maxsize is not None:
+                while len(self) > self.maxsize:
+                    self._evict()
+
+    def __delitem__(self, key):
+        with self.lock:
+            if key not in self:
+                raise KeyError(key)
+            self._discard(key)
+
+    def _discard(self, key):
+        super(LRUStore, self).__delitem__(key)
+        self.nbytes -= self.sizes.pop(key, 0)
+
+    def _evict(self):
+        key = next(iter(self))
+        self._discard(key)
+        self._evicted(key)
+
+    def _evicted(self, key):
+        self.evictions += 1
+        if self.stats is not None:
+            self.stats.evictions += 1
+        if self.on_evict is not None:
+            self.on_evict(key)
+
+    def pop(self, key, *default):
+        """
+        Remove the item and return its value
+        without marking it as recently used
+        """
+        with self.lock:
+            if key not in self:
+                if default:
+                    return default[0]
+                raise KeyError(key)
+            value = super(LRUStore, self).__getitem__(key)
+            self._discard(key)
+            return value
+
+    def popitem(self, last=True):
+        """
+        Remove the most recently used item (or least recently used
+        when ``last`` is ``False``) and return its key and value
+        """
+        with self.lock:
+            if not self:
+                raise KeyError('store is empty')
+            key = next(reversed(self) if last else iter(self))
+            return key, self.pop(key)
+
+    def clear(self):
+        """
+        Remove all items
+        """
+        with self.lock:
+            super(LRUStore, self).clear()
+            self.sizes.clear()
+            self.nbytes = 0
+
+
+class MemoizeKey(list):
+    """
+    Memoization key for a set of function parameters
+
+    Python tuples do not cache their hash hence
+    looking up tuple keys in a dictionary rehashes all
+    of its items each time. This class computes the
+    hash once which keeps dictionary operations cheap
+    even when there are many parameters.
+
+    Parameters
+    ----------
+    items : tuple
+        Hashable items which constitute the key
+
+    Raises
+    ------
+    TypeError
+        When any of the items are not hashable
+    """
+    __slots__ = ('hashvalue',)
+
+    def __init__(self, items):
+        self[:] = items
+        self.hashvalue = hash(items)
+
+    def __hash__(self):
+        return self.hashvalue
 
 
 class Memoizing(BaseCache):
@@ -128,15 +546,152 @@ class Memoizing(BaseCache):
     hence is called memoization
 
     The cache is stored on the given attribute as a dictionary.
-    Keys are string representations of the given parameters
-    to the cached function and the values are their corresponding
+    Keys are computed from the given parameters to the cached
+    function and the values are their corresponding
     cache values. When the key is in the dictionary,
     that is used as cache value. Otherwise, in most cases
     :py:class:`NotInCache` is raised.
+
+    Keys are built out of parameters themselves (see :py:class:`MemoizeKey`)
+    so parameters should be hashable. Unhashable parameters such as
+    lists are still supported however for them key falls back to
+    ``repr()`` of the parameters which is much slower
+    and which relies on the ``repr()`` being unique for the values.
+
+    Parameters
+    ----------
+    parent : object
+        A parent object where cache is stored
+    attr : str
+        Name of the attribute under which cache will be stored
+        in the ``parent`` object
+    maxsize : int, optional
+        Maximum number of values to keep in the cache.
+        When given, the cache is stored in :py:class:`LRUStore`
+        which evicts least recently used values once the
+        limit is reached. By default cache is unbounded.
+    max_bytes : int, optional
+        Maximum total size of cached values in bytes.
+        When given, the cache is stored in :py:class:`LRUStore`
+        which evicts least recently used values once the
+        budget is exceeded. Current usage is reported
+        in ``stats``. By default size of values is not limited.
+    sizer : callable, optional
+        Callable which estimates size of a value in bytes
+        when ``max_bytes`` is used.
+        By default :py:func:`deep_getsizeof` is used.
+    ttl : int, float, optional
+        Same as :py:class:`BaseCache` ``ttl`` parameter.
+        Expiry time is tracked separately for each set of parameters.
+    clock : callable, optional
+        Same as :py:class:`BaseCache` ``clock`` parameter
+    stats : CacheStats, optional
+        Same as :py:class:`BaseCache` ``stats`` parameter.
+        Evictions are reported to it.
+    typed : bool, optional
+        Whether parameters of different types should be cached
+        separately even when they are equal. For example
+        when ``True``, ``f(1)`` and ``f(1.0)`` are cached separately.
+        By default is ``False``.
+    key : callable, optional
+        Custom callable for computing cache key.
+        It is given all the parameters of the cached function
+        and it should return a hashable key.
+    stale_while_revalidate : int, float, optional
+        Same as :py:class:`BaseCache` ``stale_while_revalidate`` parameter
+    """
+    kwargs_mark = (object(),)
+    """
+    Separator between positional and keyword parameters in the key
+    """
+    unhashable_mark = (object(),)
     """
+    Prefix of keys for unhashable parameters
+    """
+    fast_types = frozenset([int, six.text_type, six.binary_type])
+    """
+    Types which are used as keys directly when they are
+    the only parameter since they hash quickly
+    and they cannot collide with any other key
+    """
+    on_evict = None
+    """
+    Callable which is called with the key of each value evicted
+    due to ``maxsize`` or ``max_bytes``. Set by :py:class:`TaggedCache`
+    so that evicted values are removed from :py:class:`TagIndex`.
+    """
+
+    def __init__(self, parent, attr, maxsize=None, ttl=None, clock=None,
+                 typed=False, key=None, stats=None, stale_while_revalidate=None,
+                 max_bytes=None, sizer=None):
+        super(Memoizing, self).__init__(
+            parent, attr, ttl=ttl, clock=clock, stats=stats,
+            stale_while_revalidate=stale_while_revalidate,
+        )
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.sizer = sizer
+        self.typed = typed
+        self.key = key
+
+    @property
+    def container(self):
+        """
+        Object where the cache store is kept under ``attr``
+        which is the ``parent`` object.
+        This is meant to be changed in subclasses.
+        """
+        return self.parent
+
+    @property
+    def evictions(self):
+        """
+        Number of values evicted from the cache store
+        due to ``maxsize`` limit
+        """
+        store = getattr(self.container, self.attr, None)
+        return getattr(store, 'evictions', 0)
+
+    @property
+    def nbytes(self):
+        """
+        Total size of cached values in bytes
+        when ``max_bytes`` is used
+        """
+        store = getattr(self.container, self.attr, None)
+        return getattr(store, 'nbytes', 0)
+
+    def _get_store(self):
+        if self.maxsize is None and self.max_bytes is None:
+            return {}
+        return LRUStore(
+            self.maxsize, self.stats, max_bytes=self.max_bytes, sizer=self.sizer,
+            on_evict=self.on_evict,
+        )
 
     def _get_key(self, *args, **kwargs):
-        return repr(args) + repr(sorted(kwargs.items()))
+        if self.key is not None:
+            return self.key(*args, **kwargs)
+
+        key = args
+        if kwargs:
+            items = tuple(sorted(kwargs.items()))
+            key += self.kwargs_mark + items
+        if self.typed:
+            key += tuple(type(i) for i in args)
+            if kwargs:
+                key += tuple(type(v) for k, v in items)
+        elif len(key) == 1 and type(key[0]) in self.fast_types:
+            return key[0]
+
+        try:
+            return MemoizeKey(key)
+        except TypeError:
+            key = self.unhashable_mark + (repr(args), repr(sorted(kwargs.items())))
+            if self.typed:
+                key += tuple(type(i) for i in args)
+                key += tuple(type(v) for k, v in sorted(kwargs.items()))
+            return key
 
     def get(self, *args, **kwargs):
         """
@@ -150,24 +705,46 @@ class Memoizing(BaseCache):
         """
         key = self._get_key(*args, **kwargs)
         try:
-            return getattr(self.parent, self.attr)[key]
+            store = getattr(self.container, self.attr)
+            value = store[key]
         except (AttributeError, TypeError, KeyError):
             raise NotInCache
 
+        if self.ttl is None:
+            return value
+        try:
+            return self._unpack(value)
+        except StaleInCache:
+            raise
+        except NotInCache:
+            store.pop(key, None)
+            raise
+
     def set(self, value, *args, **kwargs):
         """
         Store the cache value on the ``parent`` object
         for the key as computed for the given parameters
         """
         key = self._get_key(*args, **kwargs)
+        container = self.container
         try:
-            store = getattr(self.parent, self.attr)
+            store = getattr(container, self.attr)
         except AttributeError:
-            store = {}
-            setattr(self.parent, self.attr, store)
-        store[key] = value
+            store = self._get_store()
+            setattr(container, self.attr, store)
+        else:
+            self._attach(store)
+        store[key] = self._pack(value)
         return value
 
+    def _attach(self, store):
+        # stores restored by pickle or copy are detached from their cache
+        # and only setting values can evict other values
+        if not isinstance(store, LRUStore):
+            return
+        if store.stats is not self.stats or store.on_evict is not self.on_evict:
+            store.attach(self.stats, self.on_evict)
+
     def delete(self, *args, **kwargs):
         """
         Delete the cache value from the ``parent`` object
@@ -180,221 +757,2395 @@ class Memoizing(BaseCache):
         """
         key = self._get_key(*args, **kwargs)
         try:
-            return getattr(self.parent, self.attr).pop(key)
+            value = getattr(self.container, self.attr).pop(key)
         except (AttributeError, TypeError, KeyError):
             raise NotInCache
+        return self._unpack(value)
 
 
-class CacheDescriptor(object):
+class ReprParamsMixin(object):
+    """
+    Mixin for caching implementations which store values outside
+    of the process and hence compute keys from ``repr()`` of the parameters
+
+    Unlike :py:class:`Memoizing` keys which are only valid within
+    a single process, parameters here are serialized to a string
+    which is stable across processes as long as ``repr()``
+    of the parameters is. ``typed`` and ``key`` options are honoured
+    the same way as in :py:class:`Memoizing` hence classes using this
+    mixin must set ``typed`` and ``key`` attributes.
     """
-    Cache descriptor to be used to add instance-level cache
-    to class methods.
 
-    .. note::
-        This descriptor could be used independently (and there are
-        even some examples below) however it is meant to be used
-        along with :py:class:`CacheDecorator` which provides much
-        cleaner API.
+    def _get_params(self, *args, **kwargs):
+        if self.key is not None:
+            return repr(self.key(*args, **kwargs))
+        items = sorted(kwargs.items())
+        params = repr(args) + repr(items)
+        if self.typed:
+            params += repr(tuple(type(i) for i in args))
+            params += repr(tuple(type(v) for k, v in items))
+        return params
 
-    Examples
-    --------
-    ::
 
-        >>> def bar(self):
-        ...     print('computing')
-        ...     return 'bar'
+CacheInfo = namedtuple(
+    'CacheInfo', ['hits', 'misses', 'evictions', 'pops', 'compute_time', 'nbytes'],
+)
+"""
+Snapshot of :py:class:`CacheStats` counters
+"""
 
-        >>> class Foo(object):
-        ...     foo = CacheDescriptor(bar)
 
-        >>> f = Foo()
-        >>> print(f.foo())
-        computing
-        bar
-        >>> print(f.foo())
-        bar
-        >>> print(f.foo.pop())
-        bar
-        >>> print(f.foo())
-        computing
-        bar
-        >>> f.foo.push('another value')
-        >>> print(f.foo())
-        another value
+class CacheStats(object):
+    """
+    Statistics of a single cached function or cache descriptor
+
+    Counters are updated without any locking hence
+    they are approximate when used by many threads.
 
     Parameters
     ----------
-    method : function
-        Callable which this descriptor is meant to wrap and cache
-    cache_class : type, optional
-        Caching implementation cache which should be used to
-        apply caching. By default :py:attr:`.default_cache_class` is used.
-    as_property : bool, optional
-        Whether to implement the descriptor as a property.
-        By default it is ``False``.
+    name : str
+        Name of the cached function, usually its full import path
 
-        .. warning::
-            This option as ``True`` can only be used with some
-            caching implementations such as :py:class:`Caching`.
-            Other implementations do not suppose this.
-    """
-    cache_attribute_pattern = '{name}_cache_{hash}'
-    """
-    String pattern for constructing the cache attribute
-    name under which cache will be stored on the instance.
-    This attribute is meant to be changed in subclasses
-    to customize the functionality.
-    """
-    default_cache_class = Caching
-    """
-    Cache implementation class which will be used
-    for the caching.
-    This attribute is meant to be changed in subclasses
-    to customize the functionality.
+    Attributes
+    ----------
+    hits : int
+        Number of times value was found in cache
+    misses : int
+        Number of times value was not found in cache
+    evictions : int
+        Number of values evicted from cache due to size limits
+    pops : int
+        Number of values explicitly removed from cache
+    compute_time : float
+        Total number of seconds spent computing missing values
+    stores : WeakValueDictionary
+        Stores with ``max_bytes`` budget which report
+        their usage to these stats keyed by their ``id()``
+        since stores are not hashable. See :py:class:`LRUStore`.
     """
 
-    def __init__(self, method, cache_class=None, as_property=False):
-        self.method = method
-        self.cache_attribute = self.cache_attribute_pattern.format(
-            name=method.__name__,
-            hash=abs(hash(method.__name__)),
-        )
-        self.cache_class = cache_class or self.default_cache_class
-        self.as_property = as_property
+    def __init__(self, name):
+        self.name = name
+        self.stores = weakref.WeakValueDictionary()
+        self.clear()
 
-    def get_cache(self, instance):
+    @property
+    def nbytes(self):
         """
-        Helper method which given returns cache implementation instance
-        for the given instance with given parameters
+        Current total size of values in all live :py:attr:`stores` in bytes.
+        Unlike other counters, it is not reset by :py:meth:`clear`.
         """
-        return self.cache_class(instance, self.cache_attribute)
+        return sum(i.nbytes for i in list(self.stores.values()))
 
-    def getter(self, instance, *args, **kwargs):
+    def __repr__(self):
+        return '<{0} {1} {2}>'.format(self.__class__.__name__, self.name, tuple(self.info()))
+
+    def clear(self):
         """
-        Wrapper method around the decorator-wrapped callable
-        (``method`` parameter) which returns cache value when available
-        or otherwise computes and stores the value in cache by evaluating
-        wrapped method
+        Reset all counters
         """
-        cache = self.get_cache(instance)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.pops = 0
+        self.compute_time = 0.
 
-        try:
-            return cache.get(*args, **kwargs)
-        except NotInCache:
-            return cache.set(self.method(instance, *args, **kwargs), *args, **kwargs)
+    def info(self):
+        """
+        Get snapshot of all counters
 
-    def pop(self, instance, *args, **kwargs):
+        Returns
+        -------
+        CacheInfo
         """
-        Method for popping cache value corresponding to the given
-        parameters from the instance as implemented by the
-        caching implementation
+        return CacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            pops=self.pops,
+            compute_time=self.compute_time,
+            nbytes=self.nbytes,
+        )
+
+    def timed(self, f):
         """
-        cache = self.get_cache(instance)
-        return cache.delete(*args, **kwargs)
+        Wrap given callable so that time spent in it
+        is added to :py:attr:`compute_time`
 
-    def push(self, instance, value, *args, **kwargs):
+        Coroutine functions are timed until their result is available.
         """
-        Method for setting custom cache value given function parameters
+        if is_coroutine_function(f):
+            from .cache_async import get_timed_coroutine_function
+            return get_timed_coroutine_function(self, f)
+
+        def wrapper(*args, **kwargs):
+            start = default_timer()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                self.compute_time += default_timer() - start
+
+        return wrapper
+
+
+class CacheStatsRegistry(object):
+    """
+    Registry of all :py:class:`CacheStats`
+
+    Stats are referenced weakly so they are removed from the
+    registry once their cached function is garbage collected.
+    Normally :py:data:`cache_stats_registry` should be used
+    rather than instantiating this class.
+
+    Examples
+    --------
+    ::
+
+        >>> registry = CacheStatsRegistry()
+        >>> stats = registry.register(CacheStats('foo'))
+        >>> stats.hits += 1
+        >>> registry.dump()
+        {'foo': CacheInfo(hits=1, misses=0, evictions=0, pops=0, compute_time=0.0, nbytes=0)}
+    """
+
+    def __init__(self):
+        self.stats = weakref.WeakSet()
+
+    def __iter__(self):
+        return iter(sorted(self.stats, key=lambda i: i.name))
+
+    def register(self, stats):
         """
-        cache = self.get_cache(instance)
-        cache.set(value, *args, **kwargs)
+        Add :py:class:`CacheStats` to the registry
 
-    def _wrap(self, wrapping, proxy, instance):
-        f = types.MethodType(proxy, instance)
-        return wraps(wrapping)(partial(f))
+        Returns
+        -------
+        CacheStats
+            Same stats as given
+        """
+        self.stats.add(stats)
+        return stats
 
-    def __get__(self, instance, owner):
-        if self.as_property:
-            if instance is None:
-                return self
-            else:
-                return self.getter(instance)
+    def dump(self):
+        """
+        Get snapshot of all registered stats
 
-        else:
-            if instance is None:
-                return self.method
-            else:
-                f = self._wrap(self.method, self.getter, instance)
-                f.pop = self._wrap(self.__class__.pop, self.pop, instance)
-                f.push = self._wrap(self.__class__.push, self.push, instance)
-                return f
+        Returns
+        -------
+        dict
+            Mapping of stats names to :py:class:`CacheInfo`
+        """
+        return {i.name: i.info() for i in self}
 
-    def __set__(self, instance, value):
-        if self.as_property:
-            cache = self.get_cache(instance)
-            # no args and kwargs since this is only for case when cache is used as property
-            return cache.set(value)
+    def clear(self):
+        """
+        Reset counters of all registered stats
+        """
+        for i in self:
+            i.clear()
 
-        # required to be overwritten for pypy
+
+cache_stats_registry = CacheStatsRegistry()
+"""
+Global :py:class:`CacheStatsRegistry` where all cache decorators
+with enabled statistics register their :py:class:`CacheStats`
+"""
+
+
+class InstrumentedCache(object):
+    """
+    Proxy of caching implementation which records
+    hits, misses and pops in :py:class:`CacheStats`
+
+    All other attributes are proxied to the caching implementation.
+
+    Parameters
+    ----------
+    cache : BaseCache
+        Caching implementation to proxy
+    stats : CacheStats
+        Statistics where to record events
+    """
+
+    def __init__(self, cache, stats):
+        self.cache = cache
+        self.stats = stats
+
+    def __getattr__(self, name):
+        return getattr(self.cache, name)
+
+    def get(self, *args, **kwargs):
+        """
+        Get the cache value recording either hit or a miss.
+        Stale values are recorded as hits since they are served from cache.
+        """
+        try:
+            value = self.cache.get(*args, **kwargs)
+        except StaleInCache:
+            self.stats.hits += 1
+            raise
+        except NotInCache:
+            self.stats.misses += 1
+            raise
+        self.stats.hits += 1
+        return value
+
+    def set(self, value, *args, **kwargs):
+        """
+        Set the cache value
+        """
+        return self.cache.set(value, *args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """
+        Delete the cache value recording a pop
+        """
+        value = self.cache.delete(*args, **kwargs)
+        self.stats.pops += 1
+        return value
+
+
+TagEntry = namedtuple('TagEntry', ['source', 'owner', 'args', 'kwargs'])
+"""
+Cached value registered in :py:class:`TagIndex` where ``owner``
+is a weak reference to the object which owns the cache
+"""
+
+
+class TagIndex(object):
+    """
+    Index of tagged cache values which allows to invalidate
+    all values with given tags without scanning caches
+
+    Each cached value is registered under all of its tags along
+    with its ``source`` (cache descriptor or decorator) and
+    the parameters it was computed with. Entries are keyed by
+    ``(source, owner, cache key)`` hence setting the same value
+    again replaces its entry. Invalidating a tag then pops all
+    values registered under the tag by calling
+    ``source.invalidate(owner, *args, **kwargs)``.
+
+    Entries are removed from the index once their values are
+    invalidated, deleted, evicted or found to be expired
+    (see :py:class:`TaggedCache`) so the index does not outgrow
+    the caches. Parameters are referenced strongly until then.
+
+    Owners are referenced weakly hence they must support
+    weak references. Their entries are removed from the index
+    when they are garbage collected.
+
+    .. note::
+        Index is kept in memory of the current process
+        hence it only knows about values set by this process.
+        For caches shared between processes (``backend``,
+        ``persist`` or ``tiered`` memoization) invalidating
+        tags only pops values set by the current process
+        and values set by other processes remain cached
+        until they expire. For the same reason pickled
+        or copied index is restored empty.
+
+    Normally :py:data:`cache_tag_index` should be used
+    rather than instantiating this class.
+    """
+
+    def __init__(self):
+        # reentrant since owners can be collected while index is being modified
+        self.lock = threading.RLock()
+        self.tags = {}
+        self.entries = {}
+        self.owners = {}
+        # single callback for weak references of all owners
+        self.collect = self._collect
+
+    def __reduce__(self):
+        # lock and weak references cannot be pickled and
+        # entries are only meaningful within the current process
+        return self.__class__, ()
+
+    def __len__(self):
+        return len(self.tags)
+
+    def _collect(self, ref):
+        with self.lock:
+            item = self.owners.get(ref.key)
+            if item is not None and item[0] is ref:
+                self._remove_owner(ref.key)
+
+    def _get_owner(self, owner):
+        key = id(owner)
+        item = self.owners.get(key)
+        if item is None or item[0]() is not owner:
+            if item is not None:
+                self._remove_owner(key)
+            item = self.owners[key] = (weakref.KeyedRef(owner, self.collect, key), set())
+        return item
+
+    def _remove_owner(self, key):
+        ref, entry_ids = self.owners.pop(key)
+        for entry_id in list(entry_ids):
+            self._remove(entry_id)
+
+    def _remove(self, entry_id):
+        tags = self.entries.pop(entry_id, None)
+        if tags is None:
+            return
+        for tag in tags:
+            entries = self.tags.get(tag)
+            if entries is None:
+                continue
+            entries.pop(entry_id, None)
+            if not entries:
+                del self.tags[tag]
+        item = self.owners.get(entry_id[1])
+        if item is not None:
+            item[1].discard(entry_id)
+            if not item[1]:
+                del self.owners[entry_id[1]]
+
+    def register(self, tags, source, owner, key, args, kwargs):
+        """
+        Register cached value under given tags
+
+        Parameters
+        ----------
+        tags : iterable
+            Hashable tags of the cached value
+        source : object
+            Cache descriptor or decorator which cached the value
+        owner : object
+            Object which owns the cache such as instance
+            for cache descriptors
+        key : object
+            Cache key of the value as computed by caching implementation
+            used to avoid duplicate entries for the same value
+        args : tuple
+            Parameters value was computed with
+        kwargs : dict
+            Keyword parameters value was computed with
+        """
+        tags = frozenset(tags)
+        entry_id = (id(source), id(owner), key)
+
+        with self.lock:
+            self._remove(entry_id)
+            if not tags:
+                return
+            ref, entry_ids = self._get_owner(owner)
+            entry = TagEntry(source=source, owner=ref, args=args, kwargs=kwargs)
+            for tag in tags:
+                self.tags.setdefault(tag, {})[entry_id] = entry
+            self.entries[entry_id] = tags
+            entry_ids.add(entry_id)
+
+    def discard(self, source_id, owner_id, key):
+        """
+        Remove entry of the value which is no longer cached
+
+        Entry is identified by ids of its ``source`` and ``owner``
+        so that callers do not need to keep references to them.
+        """
+        with self.lock:
+            self._remove((source_id, owner_id, key))
+
+    def invalidate(self, *tags):
+        """
+        Pop all cached values registered under any of the given tags
+
+        Returns
+        -------
+        int
+            Number of values which were popped
+        """
+        with self.lock:
+            entries = {}
+            for tag in tags:
+                entries.update(self.tags.get(tag, {}))
+            for entry_id in entries:
+                self._remove(entry_id)
+
+        popped = 0
+        for entry in entries.values():
+            owner = entry.owner()
+            if owner is None:
+                continue
+            try:
+                entry.source.invalidate(owner, *entry.args, **entry.kwargs)
+            except NotInCache:
+                continue
+            popped += 1
+
+        return popped
+
+
+cache_tag_index = TagIndex()
+"""
+Global :py:class:`TagIndex` where all cache decorators
+with ``tags`` register their cached values
+"""
+
+
+def invalidate_tags(*tags):
+    """
+    Pop all values cached by any cache decorator with any of the given tags
+
+    Examples
+    --------
+    ::
+
+        >>> @memoize(tags=lambda x: ['tenant:{0}'.format(x)])
+        ... def compute(x):
+        ...     print('computing for', x)
+        ...     return x
+
+        >>> print(compute('foo'))
+        computing for foo
+        foo
+        >>> invalidate_tags('tenant:foo')
+        1
+        >>> print(compute('foo'))
+        computing for foo
+        foo
+
+    Returns
+    -------
+    int
+        Number of values which were popped
+    """
+    return cache_tag_index.invalidate(*tags)
+
+
+class TaggedCache(object):
+    """
+    Proxy of caching implementation which registers
+    all set values in :py:class:`TagIndex`
+
+    Values are removed from the index when they are deleted,
+    when they are found missing (e.g. expired) and,
+    for :py:class:`Memoizing`, when they are evicted.
+    Therefore this proxy should directly wrap
+    the caching implementation.
+
+    All other attributes are proxied to the caching implementation.
+
+    Parameters
+    ----------
+    cache : BaseCache
+        Caching implementation to proxy
+    index : TagIndex
+        Index where to register set values
+    source : object
+        Cache descriptor or decorator which provides tags
+        via ``source.get_tags(owner, *args, **kwargs)``
+    owner : object
+        Object which owns the cache
+    """
+
+    def __init__(self, cache, index, source, owner):
+        self.cache = cache
+        self.index = index
+        self.source = source
+        self.owner = owner
+        if isinstance(cache, Memoizing):
+            # only ids so that stores do not keep owners alive
+            cache.on_evict = partial(index.discard, id(source), id(owner))
+
+    def __getattr__(self, name):
+        return getattr(self.cache, name)
+
+    def _discard(self, *args, **kwargs):
+        self.index.discard(id(self.source), id(self.owner), self.cache._get_key(*args, **kwargs))
+
+    def get(self, *args, **kwargs):
+        """
+        Get the cache value removing it from the index when it is missing
+        """
+        try:
+            return self.cache.get(*args, **kwargs)
+        except StaleInCache:
+            raise
+        except NotInCache:
+            self._discard(*args, **kwargs)
+            raise
+
+    def set(self, value, *args, **kwargs):
+        """
+        Set the cache value registering it under its tags
+        """
+        # registered first so that value evicted right away is not left in the index
+        self.index.register(
+            self.source.get_tags(self.owner, *args, **kwargs),
+            self.source,
+            self.owner,
+            self.cache._get_key(*args, **kwargs),
+            args,
+            kwargs,
+        )
+        return self.cache.set(value, *args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """
+        Delete the cache value removing it from the index
+        """
+        try:
+            return self.cache.delete(*args, **kwargs)
+        finally:
+            self._discard(*args, **kwargs)
+
+
+CachedException = namedtuple('CachedException', ['exception', 'expires'])
+"""
+Exception which is stored in cache in place of a value
+by :py:class:`NegativeCache`. ``expires`` is the clock time
+of the caching implementation after which exception is no longer valid.
+"""
+
+
+def catch_exceptions(f, exceptions):
+    """
+    Wrap given callable so that it returns given exceptions
+    as :py:class:`CachedException` instead of raising them
+
+    Used along with :py:class:`NegativeCache` which fills in
+    the expiry time when exception is stored in cache.
+    """
+    def wrapper(*args, **kwargs):
+        try:
+            return f(*args, **kwargs)
+        except exceptions as e:
+            return CachedException(e, None)
+
+    return wrapper
+
+
+def validate_cache_exceptions(f, exceptions, ttl):
+    """
+    Validate ``cache_exceptions`` and ``exception_ttl`` parameters
+    of cache decorators and descriptors for the given wrapped callable
+    """
+    if not exceptions:
+        return
+    if ttl is None:
+        raise ValueError('`cache_exceptions` can only be used along with `exception_ttl`')
+    if is_coroutine_function(f):
+        raise TypeError('`cache_exceptions` is not supported for coroutine functions')
+
+
+class NegativeCache(object):
+    """
+    Proxy of caching implementation which stores exceptions
+    raised while computing values and re-raises them from cache
+    until they expire
+
+    Computed values should be wrapped with :py:func:`catch_exceptions`
+    so that exceptions are passed to :py:meth:`set` as
+    :py:class:`CachedException`. Expiry time of exceptions
+    is tracked by the ``clock`` of the caching implementation
+    independently of its ``ttl``.
+
+    All other attributes are proxied to the caching implementation.
+
+    Parameters
+    ----------
+    cache : BaseCache
+        Caching implementation to proxy
+    ttl : int, float
+        Number of seconds exceptions are cached for
+    """
+
+    def __init__(self, cache, ttl):
+        self.cache = cache
+        self.ttl = ttl
+
+    def __getattr__(self, name):
+        return getattr(self.cache, name)
+
+    def _raise(self, exception, cached=True):
+        if not cached:
+            # first failure keeps traceback of the original computation
+            six.reraise(type(exception), exception, getattr(exception, '__traceback__', None))
+
+        # cached exception instance is shared by all callers so raise a copy
+        # which does not grow or overwrite its traceback
+        try:
+            exception = copy.copy(exception)
+        except Exception:
+            # exception which cannot be reconstructed from its args
+            exception = exception.with_traceback(None) if six.PY3 else exception
+        raise exception
+
+    def get(self, *args, **kwargs):
+        """
+        Get the cache value re-raising it when it is a cached exception
+
+        Raises
+        ------
+        NotInCache
+            When the cache is not set or cached exception expired
+        """
+        try:
+            value = self.cache.get(*args, **kwargs)
+        except StaleInCache as e:
+            # stale exceptions are never served
+            if isinstance(e.value, CachedException):
+                raise NotInCache
+            raise
+
+        if not isinstance(value, CachedException):
+            return value
+
+        if value.expires <= self.cache.clock():
+            try:
+                self.cache.delete(*args, **kwargs)
+            except NotInCache:
+                pass
+            raise NotInCache
+
+        self._raise(value.exception)
+
+    def set(self, value, *args, **kwargs):
+        """
+        Set the cache value.
+        When it is :py:class:`CachedException`, exception is stored
+        along with its expiry time and then raised.
+        """
+        if not isinstance(value, CachedException):
+            return self.cache.set(value, *args, **kwargs)
+
+        self.cache.set(
+            CachedException(value.exception, self.cache.clock() + self.ttl),
+            *args, **kwargs
+        )
+        self._raise(value.exception, cached=False)
+
+    def delete(self, *args, **kwargs):
+        """
+        Delete the cache value
+
+        When cached value is an exception, it is removed
+        and ``None`` is returned since there is no value.
+
+        Raises
+        ------
+        NotInCache
+            When the cache is not set
+        """
+        value = self.cache.delete(*args, **kwargs)
+        if isinstance(value, CachedException):
+            return None
+        return value
+
+
+class CallSignature(object):
+    """
+    Signature of a function which binds call parameters
+    to the function parameters
+
+    Binding gives canonical form of the call where all parameters
+    which can be given positionally are positional parameters
+    (including the ones given as keyword parameters and defaults)
+    and only keyword-only and extra keyword parameters remain keyword
+    parameters. Therefore equivalent calls in different styles
+    such as ``f(1, 2)``, ``f(1, b=2)`` and ``f(a=1)`` (when ``b``
+    defaults to ``2``) are bound to the same parameters.
+
+    Function parameters are inspected only once when the signature
+    is created and calls which already provide exactly all positional
+    parameters are returned as is so binding is very cheap.
+
+    Examples
+    --------
+    ::
+
+        >>> def f(a, b=2, *args, **kwargs):
+        ...     pass
+
+        >>> signature = CallSignature(f)
+        >>> signature.bind((1, 2), {})
+        ((1, 2), {})
+        >>> signature.bind((1,), {'b': 2})
+        ((1, 2), {})
+        >>> signature.bind((), {'a': 1})
+        ((1, 2), {})
+
+    Parameters
+    ----------
+    f : function
+        Function which parameters to bind to
+    skip : int, optional
+        Number of leading function parameters which are not given
+        when binding such as ``self`` of methods. By default is ``0``.
+    """
+
+    def __init__(self, f, skip=0):
+        if six.PY2:
+            spec = inspect.getargspec(f)
+            varkw, kwonly, kwonly_defaults = spec.keywords, [], {}
+        else:
+            spec = inspect.getfullargspec(f)
+            varkw, kwonly, kwonly_defaults = spec.varkw, spec.kwonlyargs, spec.kwonlydefaults
+        defaults = spec.defaults or ()
+
+        self.names = tuple(spec.args[skip:])
+        self.defaults = dict(zip(spec.args[len(spec.args) - len(defaults):], defaults))
+        # defaults of trailing parameters which can be appended to positional calls
+        self.tail_defaults = tuple(defaults[-len(self.names):]) if self.names else ()
+        self.has_varargs = spec.varargs is not None
+        self.has_varkw = varkw is not None
+        self.kwonly = tuple(kwonly)
+        self.kwonly_defaults = kwonly_defaults or {}
+
+    def bind(self, args, kwargs):
+        """
+        Bind call parameters to the function parameters
+
+        Calls which do not match the signature are returned unchanged
+        so that the function itself raises appropriate error when called.
+
+        Returns
+        -------
+        tuple
+            Bound ``(args, kwargs)``
+        """
+        size = len(self.names)
+        given = len(args)
+        if not kwargs and not self.kwonly:
+            missing = size - given
+            if missing <= 0:
+                return args, kwargs
+            if missing <= len(self.tail_defaults):
+                return args + self.tail_defaults[-missing:], kwargs
+        if given > size and not self.has_varargs:
+            return args, kwargs
+
+        bound_args = list(args)
+        bound_kwargs = dict(kwargs)
+        for name in self.names[given:]:
+            if name in bound_kwargs:
+                bound_args.append(bound_kwargs.pop(name))
+            elif name in self.defaults:
+                bound_args.append(self.defaults[name])
+            else:
+                return args, kwargs
+        if bound_kwargs and any(i in bound_kwargs for i in self.names[:given]):
+            return args, kwargs
+
+        for name in self.kwonly:
+            if name in bound_kwargs:
+                continue
+            if name not in self.kwonly_defaults:
+                return args, kwargs
+            bound_kwargs[name] = self.kwonly_defaults[name]
+        if not self.has_varkw and len(bound_kwargs) > len(self.kwonly):
+            return args, kwargs
+
+        return tuple(bound_args), bound_kwargs
+
+
+class NormalizedCache(object):
+    """
+    Proxy of caching implementation which binds parameters
+    to :py:class:`CallSignature` of the cached function before
+    they are used so that equivalent calls in different styles
+    share the same cached value
+
+    All other attributes are proxied to the caching implementation.
+
+    Parameters
+    ----------
+    cache : BaseCache
+        Caching implementation to proxy
+    signature : CallSignature
+        Signature to bind parameters to
+    """
+
+    def __init__(self, cache, signature):
+        self.cache = cache
+        self.signature = signature
+
+    def __getattr__(self, name):
+        return getattr(self.cache, name)
+
+    def _get_key(self, *args, **kwargs):
+        args, kwargs = self.signature.bind(args, kwargs)
+        return self.cache._get_key(*args, **kwargs)
+
+    def get(self, *args, **kwargs):
+        """
+        Get the cache value for the bound parameters
+        """
+        args, kwargs = self.signature.bind(args, kwargs)
+        return self.cache.get(*args, **kwargs)
+
+    def set(self, value, *args, **kwargs):
+        """
+        Set the cache value for the bound parameters
+        """
+        args, kwargs = self.signature.bind(args, kwargs)
+        return self.cache.set(value, *args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """
+        Delete the cache value for the bound parameters
+        """
+        args, kwargs = self.signature.bind(args, kwargs)
+        return self.cache.delete(*args, **kwargs)
+
+
+class InFlight(object):
+    """
+    Computation which is currently in progress in :py:class:`SingleFlight`
+
+    Other threads can :py:meth:`wait` for its result.
+    """
+
+    def __init__(self):
+        self.owner = threading.current_thread()
+        self.event = threading.Event()
+        self.value = None
+        self.exc_info = None
+
+    def wait(self):
+        """
+        Wait for the computation to finish
+
+        Returns
+        -------
+        object
+            Computed value
+
+        Raises
+        ------
+        Exception
+            Any exception raised by the computation is re-raised
+        """
+        self.event.wait()
+        if self.exc_info is not None:
+            six.reraise(*self.exc_info)
+        return self.value
+
+
+class SingleFlight(object):
+    """
+    Utility for making sure only a single thread computes
+    value for any given key at a time.
+
+    When multiple threads request computation of the same key
+    concurrently, first thread computes the value while all others
+    wait for it and then receive the same value. If the computation
+    raises an exception, it is re-raised in all waiting threads.
+
+    Locks are striped, meaning a fixed number of locks is shared
+    by all keys hence memory usage does not grow with number of keys.
+    Only in-progress computations are tracked.
+
+    Examples
+    --------
+    ::
+
+        >>> flight = SingleFlight()
+        >>> flight.run('foo', lambda: 'bar')
+        'bar'
+
+    Parameters
+    ----------
+    stripes : int, optional
+        Number of locks to use
+    """
+
+    def __init__(self, stripes=64):
+        self.stripes = [(threading.Lock(), {}) for _ in range(stripes)]
+
+    def run(self, key, f):
+        """
+        Compute value for the given key by calling ``f``
+        unless another thread is already computing it in which case
+        wait for that thread to finish and return its value
+
+        Parameters
+        ----------
+        key : object
+            Hashable key identifying the computation
+        f : callable
+            Callable without parameters which computes the value
+        """
+        lock, calls = self.stripes[hash(key) % len(self.stripes)]
+
+        with lock:
+            call = calls.get(key)
+            if call is None:
+                call = calls[key] = InFlight()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            # recursive computation of the same key within the same thread
+            # would otherwise wait for itself forever
+            if call.owner is threading.current_thread():
+                return f()
+            return call.wait()
+
+        try:
+            call.value = f()
+        except BaseException:
+            call.exc_info = sys.exc_info()
+            raise
+        finally:
+            with lock:
+                del calls[key]
+            call.event.set()
+
+        return call.value
+
+
+class AsyncFlight(object):
+    """
+    ``asyncio`` counterpart of :py:class:`SingleFlight`
+
+    Makes sure only a single task computes value for any given key
+    at a time. All concurrent awaiters of the same key await
+    the same task and so all of them receive either the same value
+    or the same exception. Each awaiter is shielded so that cancelling
+    one awaiter does not cancel the computation for others.
+    """
+
+    def __init__(self):
+        self.tasks = {}
+
+    def run(self, key, f, callback=None):
+        """
+        Schedule computation of the value for the given key
+        unless it is already in progress
+
+        Parameters
+        ----------
+        key : object
+            Hashable key identifying the computation
+        f : callable
+            Callable without parameters which returns
+            coroutine computing the value
+        callback : callable, optional
+            Called with computed value when computation
+            succeeds before any awaiter receives the value.
+            Useful for storing the value in cache.
+
+        Returns
+        -------
+        Future
+            Future which resolves to the computed value
+        """
+        task = self.tasks.get(key)
+
+        if task is None:
+            def done(task):
+                self.tasks.pop(key, None)
+                if callback is not None and not task.cancelled() and task.exception() is None:
+                    callback(task.result())
+
+            task = self.tasks[key] = asyncio.ensure_future(f())
+            task.add_done_callback(done)
+
+        return asyncio.shield(task)
+
+
+def retrieve_exception(future):
+    """
+    Future callback which retrieves exception of the future
+    so that ``asyncio`` does not complain it was never retrieved
+    """
+    if not future.cancelled():
+        future.exception()
+
+
+class Revalidator(object):
+    """
+    Bounded pool of background threads which refresh stale cache values
+
+    Refreshes are deduplicated by key so while a value is being
+    refreshed, any other refresh of the same key is ignored.
+    Worker threads are started lazily up to ``max_workers``.
+    When ``max_pending`` refreshes are already scheduled,
+    new ones are dropped since stale value can still be served
+    and its refresh is simply retried on a later access.
+
+    Exceptions raised by refreshes are logged and otherwise ignored
+    hence stale value keeps being served until it is refreshed
+    or until its ``stale_while_revalidate`` window passes.
+
+    Examples
+    --------
+    ::
+
+        >>> revalidator = Revalidator(max_workers=1)
+        >>> revalidator.submit('foo', lambda: None)
+        True
+        >>> revalidator.join()
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        Maximum number of worker threads
+    max_pending : int, optional
+        Maximum number of refreshes which can be
+        scheduled or in progress at a time
+    """
+
+    def __init__(self, max_workers=4, max_pending=256):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.lock = threading.Lock()
+        self.pending = set()
+        self.queue = queue.Queue()
+        self.workers = []
+
+    def __len__(self):
+        return len(self.pending)
+
+    def submit(self, key, f):
+        """
+        Schedule refresh unless refresh of the same key
+        is already pending or too many refreshes are pending
+
+        Parameters
+        ----------
+        key : object
+            Hashable key identifying the refresh
+        f : callable
+            Callable without parameters which refreshes the value
+
+        Returns
+        -------
+        bool
+            Whether refresh was scheduled
+        """
+        with self.lock:
+            if key in self.pending or len(self.pending) >= self.max_pending:
+                return False
+            self.pending.add(key)
+            if len(self.workers) < min(self.max_workers, len(self.pending)):
+                worker = threading.Thread(target=self._work, name='django_auxilium_revalidator')
+                worker.daemon = True
+                worker.start()
+                self.workers.append(worker)
+
+        self.queue.put((key, f))
+        return True
+
+    def _work(self):
+        while True:
+            key, f = self.queue.get()
+            try:
+                f()
+            except Exception:
+                log.exception('Could not refresh stale cache value {0!r}'.format(key))
+            finally:
+                try:
+                    # refreshes can query the database and each thread has its own connections
+                    connections.close_all()
+                except Exception:
+                    log.exception('Could not close database connections after refresh')
+                finally:
+                    with self.lock:
+                        self.pending.discard(key)
+                    self.queue.task_done()
+
+    def join(self):
+        """
+        Block until all scheduled refreshes are done.
+        Mostly useful in tests.
+        """
+        self.queue.join()
+
+
+cache_revalidator = Revalidator()
+"""
+Global :py:class:`Revalidator` used by cache descriptors and decorators
+to refresh stale values
+"""
+
+
+class WeakIdKeyDictionary(object):
+    """
+    Mapping which weakly references its keys by their identity
+
+    Similar to ``weakref.WeakKeyDictionary`` except keys are
+    compared by identity rather than by equality hence keys
+    do not have to be hashable (e.g. unsaved Django model instances)
+    and different but equal keys do not share values.
+    Entries are removed as soon as their keys are garbage collected.
+
+    Keys must support weak references. For ``__slots__`` classes
+    that means ``__weakref__`` must be one of the slots.
+
+    Examples
+    --------
+    ::
+
+        >>> class Foo(object):
+        ...     pass
+
+        >>> d = WeakIdKeyDictionary()
+        >>> f = Foo()
+        >>> d[f] = 'foo'
+        >>> print(d[f])
+        foo
+        >>> len(d)
+        1
+        >>> del f
+        >>> len(d)
+        0
+    """
+
+    def __init__(self):
+        self.data = {}
+
+    def _remove(self, key, ref):
+        entry = self.data.get(key)
+        if entry is not None and entry[0] is ref:
+            del self.data[key]
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, obj):
+        try:
+            self[obj]
+        except KeyError:
+            return False
+        return True
+
+    def __getitem__(self, obj):
+        ref, value = self.data[id(obj)]
+        if ref() is not obj:
+            raise KeyError(obj)
+        return value
+
+    def __setitem__(self, obj, value):
+        key = id(obj)
+        ref = weakref.ref(obj, lambda ref: self._remove(key, ref))
+        self.data[key] = (ref, value)
+
+    def __delitem__(self, obj):
+        # validate the key refers to the given object
+        self[obj]
+        del self.data[id(obj)]
+
+    def get(self, obj, default=None):
+        """
+        Get value for the given object or ``default`` when not present
+        """
+        try:
+            return self[obj]
+        except KeyError:
+            return default
+
+    def setdefault(self, obj, default=None):
+        """
+        Get value for the given object setting it to ``default`` when not present
+        """
+        try:
+            return self[obj]
+        except KeyError:
+            self[obj] = default
+            return default
+
+    def pop(self, obj, *default):
+        """
+        Remove and return value for the given object
+        """
+        try:
+            value = self[obj]
+        except KeyError:
+            if default:
+                return default[0]
+            raise
+        del self.data[id(obj)]
+        return value
+
+
+class CacheNamespace(object):
+    """
+    Container of cache values of a single object when cache
+    descriptor stores values outside of the object itself
+
+    See Also
+    --------
+    CacheDescriptor
+    """
+
+
+class WeakMemoizing(BaseCache):
+    """
+    Memoizing implementation which stores values per first parameter
+    and discards them as soon as that parameter is garbage collected
+
+    Values are stored in :py:class:`WeakIdKeyDictionary` on the ``parent``
+    object which maps first parameter (by identity) to its own
+    :py:class:`Memoizing` cache for the remaining parameters.
+    That means that cache memory is bounded by the live objects only
+    and that distinct objects never share cached values even when
+    their ``repr`` or equality collide.
+
+    First parameter must support weak references.
+    All other parameters are used the same as in :py:class:`Memoizing`.
+
+    Parameters
+    ----------
+    parent : object
+        Same as :py:class:`BaseCache` ``parent`` parameter
+    attr : str
+        Same as :py:class:`BaseCache` ``attr`` parameter
+    cache_options
+        Any additional keyword arguments are passed to
+        :py:attr:`object_cache_class` (e.g. ``maxsize`` which
+        limits number of values per first parameter)
+    """
+    object_cache_class = Memoizing
+    """
+    Caching implementation used to store values of a single first parameter.
+    This attribute is meant to be changed in subclasses
+    to customize the functionality.
+    """
+    object_cache_attribute = 'values'
+    """
+    Attribute name where values are stored in :py:class:`CacheNamespace`
+    of each first parameter
+    """
+
+    def __init__(self, parent, attr, **cache_options):
+        super(WeakMemoizing, self).__init__(parent, attr, stats=cache_options.get('stats'))
+        self.cache_options = cache_options
+
+    def _get_object_cache(self, obj, create=False):
+        table = getattr(self.parent, self.attr, None)
+        if table is None and create:
+            table = WeakIdKeyDictionary()
+            setattr(self.parent, self.attr, table)
+
+        namespace = table.get(obj) if table is not None else None
+        if namespace is None and create:
+            namespace = table.setdefault(obj, CacheNamespace())
+
+        return self.object_cache_class(
+            namespace, self.object_cache_attribute, **self.cache_options
+        )
+
+    def _get_key(self, obj, *args, **kwargs):
+        return (id(obj), self._get_object_cache(obj)._get_key(*args, **kwargs))
+
+    def get(self, obj, *args, **kwargs):
+        """
+        Get the cache value of the given object by computing
+        the key from the remaining parameters
+
+        Raises
+        ------
+        NotInCache
+            When the cache is not set
+        """
+        return self._get_object_cache(obj).get(*args, **kwargs)
+
+    def set(self, value, obj, *args, **kwargs):
+        """
+        Store the cache value for the given object
+        for the key as computed for the remaining parameters
+        """
+        return self._get_object_cache(obj, create=True).set(value, *args, **kwargs)
+
+    def delete(self, obj, *args, **kwargs):
+        """
+        Delete the cache value of the given object
+        for the key as computed for the remaining parameters
+
+        Raises
+        ------
+        NotInCache
+            When the cache is not set and so cannot be deleted
+        """
+        return self._get_object_cache(obj).delete(*args, **kwargs)
+
+
+class BoundCacheMethod(object):
+    """
+    Cached method bound to a specific instance
+
+    This is what :py:class:`CacheDescriptor` returns when cached method
+    is accessed on an instance. It is a lightweight callable which only
+    stores the descriptor and the instance hence accessing cached method
+    is cheap even in tight loops.
+
+    Each descriptor creates its own subclass of this class
+    (see :py:meth:`CacheDescriptor.get_bound_method_class`)
+    so that wrapped method attributes such as ``__doc__``
+    are available without copying them on each access.
+
+    Parameters
+    ----------
+    descriptor : CacheDescriptor
+        Descriptor which is being accessed
+    instance : object
+        Instance to which descriptor is bound
+    """
+    __slots__ = ('descriptor', 'instance')
+
+    def __init__(self, descriptor, instance):
+        self.descriptor = descriptor
+        self.instance = instance
+
+    def __repr__(self):
+        return '<bound cache method {0} of {1!r}>'.format(
+            self.descriptor.method.__name__, self.instance
+        )
+
+    def __call__(self, *args, **kwargs):
+        return self.descriptor.getter(self.instance, *args, **kwargs)
+
+    def pop(self, *args, **kwargs):
+        """
+        Pop cache value of the bound instance.
+        See :py:meth:`CacheDescriptor.pop`
+        """
+        return self.descriptor.pop(self.instance, *args, **kwargs)
+
+    def push(self, value, *args, **kwargs):
+        """
+        Push cache value to the bound instance.
+        See :py:meth:`CacheDescriptor.push`
+        """
+        return self.descriptor.push(self.instance, value, *args, **kwargs)
+
+    @property
+    def cache_info(self):
+        """
+        Same as :py:meth:`CacheDescriptor.cache_info`
+        which is only available when stats are enabled
+        """
+        if self.descriptor.stats is None:
+            raise AttributeError('cache_info')
+        return self.descriptor.cache_info
+
+
+class CacheDescriptor(object):
+    """
+    Cache descriptor to be used to add instance-level cache
+    to class methods.
+
+    .. note::
+        This descriptor could be used independently (and there are
+        even some examples below) however it is meant to be used
+        along with :py:class:`CacheDecorator` which provides much
+        cleaner API.
+
+    Examples
+    --------
+    ::
+
+        >>> def bar(self):
+        ...     print('computing')
+        ...     return 'bar'
+
+        >>> class Foo(object):
+        ...     foo = CacheDescriptor(bar)
+
+        >>> f = Foo()
+        >>> print(f.foo())
+        computing
+        bar
+        >>> print(f.foo())
+        bar
+        >>> print(f.foo.pop())
+        bar
+        >>> print(f.foo())
+        computing
+        bar
+        >>> f.foo.push('another value')
+        >>> print(f.foo())
+        another value
+
+    When used on classes with ``__slots__``, cache can either
+    be stored in an explicitly declared slot::
+
+        >>> class Foo(object):
+        ...     __slots__ = ('_foo',)
+        ...     foo = CacheDescriptor(bar, attribute='_foo')
+
+        >>> print(Foo().foo())
+        computing
+        bar
+
+    or outside of the object in a side table which is
+    cleared when the object is garbage collected::
+
+        >>> class Foo(object):
+        ...     __slots__ = ('__weakref__',)
+        ...     foo = CacheDescriptor(bar, storage='weak')
+
+        >>> f = Foo()
+        >>> print(f.foo())
+        computing
+        bar
+        >>> print(f.foo())
+        bar
+
+    Parameters
+    ----------
+    method : function
+        Callable which this descriptor is meant to wrap and cache
+    cache_class : type, optional
+        Caching implementation cache which should be used to
+        apply caching. By default :py:attr:`.default_cache_class` is used.
+    as_property : bool, optional
+        Whether to implement the descriptor as a property.
+        By default it is ``False``.
+
+        .. warning::
+            This option as ``True`` can only be used with some
+            caching implementations such as :py:class:`Caching`.
+            Other implementations do not suppose this.
+    lock : bool, optional
+        Whether to only allow single thread to compute missing
+        cache value at a time while other threads wait for it.
+        See :py:class:`SingleFlight`. By default is ``False``.
+    attribute : str, optional
+        Name of the attribute where to store the cache on the instance.
+        By default it is generated from :py:attr:`cache_attribute_pattern`.
+        Useful to reserve a slot for the cache in ``__slots__`` classes.
+    storage : str, optional
+        Where to store the cache. Can be one of:
+
+        :``'instance'``:
+            Cache is stored directly on the instance.
+            This is the default.
+        :``'weak'``:
+            Cache is stored in :py:class:`CacheNamespace` kept
+            in descriptor's :py:class:`WeakIdKeyDictionary`
+            hence the instance itself is not modified.
+            Useful for ``__slots__`` classes which only
+            need to have ``__weakref__`` slot.
+    stats : bool, optional
+        Whether to collect :py:class:`CacheStats` for all instances.
+        Stats are registered in :py:data:`cache_stats_registry`
+        and are available via :py:meth:`cache_info`.
+        By default is ``False`` in which case there is no overhead.
+    tags : iterable, callable, optional
+        Tags of cached values which allow to invalidate them
+        with :py:func:`invalidate_tags`. Can either be static
+        iterable of tags or a callable which is called with same
+        parameters as the wrapped method and returns tags.
+        Instances must support weak references.
+        See :py:class:`TagIndex`.
+    cache_exceptions : tuple, optional
+        Exception classes which are cached when raised by
+        wrapped method and then re-raised from cache
+        for ``exception_ttl`` seconds. See :py:class:`NegativeCache`.
+        Not supported for coroutine functions.
+    exception_ttl : int, float, optional
+        Number of seconds exceptions are cached for.
+        Required along with ``cache_exceptions``.
+    cache_options
+        Any additional keyword arguments are passed
+        to ``cache_class`` when it is instantiated.
+        When they include ``stale_while_revalidate``,
+        stale values are served right away while they are
+        refreshed in the background by :py:attr:`revalidator`.
+    """
+    cache_attribute_pattern = '{name}_cache_{hash}'
+    """
+    String pattern for constructing the cache attribute
+    name under which cache will be stored on the instance.
+    ``hash`` is CRC32 checksum of the wrapped method import path
+    so the name is the same in all processes regardless of
+    hash randomization.
+    This attribute is meant to be changed in subclasses
+    to customize the functionality.
+    """
+    default_cache_class = Caching
+    """
+    Cache implementation class which will be used
+    for the caching.
+    This attribute is meant to be changed in subclasses
+    to customize the functionality.
+    """
+    bound_method_base_class = BoundCacheMethod
+    """
+    Class of the callable returned when accessing cached
+    method on an instance.
+    This attribute is meant to be changed in subclasses
+    to customize the functionality.
+    """
+    storages = ('instance', 'weak')
+    """
+    Supported values of the ``storage`` parameter
+    """
+    tag_index = cache_tag_index
+    """
+    Index where tagged values are registered.
+    This attribute is meant to be changed in subclasses
+    to customize the functionality.
+    """
+    revalidator = cache_revalidator
+    """
+    Thread pool where stale values are refreshed.
+    This attribute is meant to be changed in subclasses
+    to customize the functionality.
+    """
+
+    def __init__(self, method, cache_class=None, as_property=False, lock=False,
+                 attribute=None, storage='instance', stats=False, tags=None,
+                 cache_exceptions=None, exception_ttl=None, **cache_options):
+        if storage not in self.storages:
+            raise ValueError(
+                'Unsupported storage {0!r}. Must be one of {1}'
+                ''.format(storage, ', '.join(self.storages))
+            )
+        validate_cache_exceptions(method, cache_exceptions, exception_ttl)
+        self.method = method
+        self.cache_attribute = attribute or self.cache_attribute_pattern.format(
+            name=method.__name__,
+            hash=zlib.crc32(get_qualified_name(method).encode('utf-8')) & 0xffffffff,
+        )
+        self.storage = storage
+        self.side_table = WeakIdKeyDictionary() if storage == 'weak' else None
+        self.cache_class = cache_class or self.default_cache_class
+        self.as_property = as_property
+        self.cache_options = cache_options
+        self.single_flight = SingleFlight() if lock else None
+        self.async_flight = AsyncFlight() if is_coroutine_function(method) else None
+        self.stats = None
+        self.evaluate = method
+        if stats:
+            self.stats = cache_stats_registry.register(CacheStats(get_qualified_name(method)))
+            self.cache_options['stats'] = self.stats
+            self.evaluate = self.stats.timed(method)
+        self.cache_exceptions = cache_exceptions
+        self.exception_ttl = exception_ttl
+        if cache_exceptions:
+            self.evaluate = catch_exceptions(self.evaluate, cache_exceptions)
+        self.tags = tags
+        self.bound_method_class = self.get_bound_method_class()
+
+    def get_bound_method_class(self):
+        """
+        Get subclass of :py:attr:`bound_method_base_class` for this descriptor
+
+        Subclass has wrapped method attributes such as ``__doc__``
+        so that they do not need to be copied on each bound access.
+        """
+        return type(
+            str(self.method.__name__),
+            (self.bound_method_base_class,),
+            {
+                '__slots__': (),
+                '__doc__': self.method.__doc__,
+                '__module__': self.method.__module__,
+                '__name__': self.method.__name__,
+                # staticmethod so that it is not bound to the bound method itself
+                '__wrapped__': staticmethod(self.method),
+            }
+        )
+
+    def get_cache_parent(self, instance):
+        """
+        Get object where cache of the given instance should be stored
+        according to the ``storage`` parameter
+        """
+        if self.side_table is None:
+            return instance
+        try:
+            return self.side_table[instance]
+        except KeyError:
+            return self.side_table.setdefault(instance, CacheNamespace())
+
+    def get_cache(self, instance):
+        """
+        Helper method which given returns cache implementation instance
+        for the given instance with given parameters
+        """
+        cache = self.cache_class(
+            self.get_cache_parent(instance), self.cache_attribute, **self.cache_options
+        )
+        if self.tags is not None:
+            cache = TaggedCache(cache, self.tag_index, self, instance)
+        if self.stats is not None:
+            cache = InstrumentedCache(cache, self.stats)
+        if self.cache_exceptions:
+            cache = NegativeCache(cache, self.exception_ttl)
+        return cache
+
+    def cache_info(self):
+        """
+        Get statistics of this descriptor when ``stats`` are enabled
+
+        Returns
+        -------
+        CacheInfo
+        """
+        return self.stats.info()
+
+    def get_tags(self, instance, *args, **kwargs):
+        """
+        Get tags of the value cached for the given instance and parameters
+        """
+        if callable(self.tags):
+            return self.tags(instance, *args, **kwargs)
+        return self.tags
+
+    def invalidate(self, instance, *args, **kwargs):
+        """
+        Pop tagged value from the given instance.
+        Used by :py:class:`TagIndex`.
+        """
+        return self.pop(instance, *args, **kwargs)
+
+    def getter(self, instance, *args, **kwargs):
+        """
+        Wrapper method around the decorator-wrapped callable
+        (``method`` parameter) which returns cache value when available
+        or otherwise computes and stores the value in cache by evaluating
+        wrapped method
+        """
+        cache = self.get_cache(instance)
+
+        if self.async_flight is not None:
+            return self.async_getter(cache, instance, *args, **kwargs)
+
+        try:
+            return cache.get(*args, **kwargs)
+        except StaleInCache as e:
+            self.revalidate(cache, instance, *args, **kwargs)
+            return e.value
+        except NotInCache:
+            if self.single_flight is None:
+                return cache.set(self.evaluate(instance, *args, **kwargs), *args, **kwargs)
+
+        def compute():
+            # another thread might have just finished computing the value
+            try:
+                return cache.get(*args, **kwargs)
+            except NotInCache:
+                return cache.set(self.evaluate(instance, *args, **kwargs), *args, **kwargs)
+
+        key = (id(instance), cache._get_key(*args, **kwargs))
+        return self.single_flight.run(key, compute)
+
+    def async_getter(self, cache, instance, *args, **kwargs):
+        """
+        Same as :py:meth:`getter` for when wrapped method is a coroutine function
+
+        Returns coroutine which resolves to either the cached value
+        or to the value computed by awaiting the wrapped method.
+        Concurrent calls with same parameters share the same computation.
+        See :py:class:`AsyncFlight`.
+        """
+        from .cache_async import get_or_compute
+
+        def get_key(*args, **kwargs):
+            return id(instance), cache._get_key(*args, **kwargs)
+
+        return get_or_compute(
+            cache, self.async_flight, get_key, partial(self.evaluate, instance), args, kwargs,
+        )
+
+    def revalidate(self, cache, instance, *args, **kwargs):
+        """
+        Schedule refresh of the stale value cached for the given
+        instance and parameters in :py:attr:`revalidator`
+        """
+        key = (id(self), id(instance), cache._get_key(*args, **kwargs))
+        return self.revalidator.submit(key, lambda: cache.set(
+            self.evaluate(instance, *args, **kwargs), *args, **kwargs
+        ))
+
+    def pop(self, instance, *args, **kwargs):
+        """
+        Method for popping cache value corresponding to the given
+        parameters from the instance as implemented by the
+        caching implementation
+        """
+        cache = self.get_cache(instance)
+        return cache.delete(*args, **kwargs)
+
+    def push(self, instance, value, *args, **kwargs):
+        """
+        Method for setting custom cache value given function parameters
+        """
+        cache = self.get_cache(instance)
+        cache.set(value, *args, **kwargs)
+
+    def has_cache(self, instance):
+        """
+        Check whether any value is cached for the given instance
+        """
+        if self.side_table is None:
+            parent = instance
+        else:
+            parent = self.side_table.get(instance)
+        try:
+            value = getattr(parent, self.cache_attribute)
+        except AttributeError:
+            return False
+        # memoizing caches keep dictionary of values even after all are popped
+        if issubclass(self.cache_class, Memoizing):
+            return bool(value)
+        return True
+
+    def clear(self, instance):
+        """
+        Method for clearing all values cached for the given
+        instance regardless of parameters they were computed with
+
+        Returns
+        -------
+        bool
+            Whether any value was cached and cleared
+        """
+        if self.side_table is None:
+            parent = instance
+        else:
+            parent = self.side_table.get(instance)
+        cached = self.has_cache(instance)
+        try:
+            delattr(parent, self.cache_attribute)
+        except AttributeError:
+            pass
+        return cached
+
+    def __set_name__(self, owner, name):
+        cache_descriptor_registry.register(owner, name, self)
+
+    def contribute_to_class(self, cls, name):
+        """
+        Add descriptor to the Django model class
+
+        Django models do not pass attributes to ``type()`` on all
+        supported versions hence ``__set_name__`` is called manually.
+        """
+        setattr(cls, name, self)
+        self.__set_name__(cls, name)
+
+    def __get__(self, instance, owner):
+        if self.as_property:
+            if instance is None:
+                return self
+            else:
+                return self.getter(instance)
+
+        else:
+            if instance is None:
+                return self.method
+            else:
+                return self.bound_method_class(self, instance)
+
+    def __set__(self, instance, value):
+        if self.as_property:
+            cache = self.get_cache(instance)
+            # no args and kwargs since this is only for case when cache is used as property
+            return cache.set(value)
+
+        # required to be overwritten for pypy
         # see https://bitbucket.org/pypy/pypy/issues/2033/attributeerror-object-attribute-is-read
         # even though ticket is resolved its still affecting pypy3
         raise AttributeError
 
-    def __delete__(self, instance):
-        if self.as_property:
-            self.pop(instance)
-        else:
-            raise AttributeError
+    def __delete__(self, instance):
+        if self.as_property:
+            self.pop(instance)
+        else:
+            raise AttributeError
+
+
+class MemoizeDescriptor(CacheDescriptor):
+    """
+    Cache descriptor to be used to add instance-level cache
+    to class methods which considers method parameters
+    when caching values.
+
+    In other words, this descriptor caches method results
+    per given parameters.
+
+    .. note::
+        This descriptor could be used independently (and there are
+        even some examples below) however it is meant to be used
+        along with :py:class:`MemoizeDecorator` which provides much
+        cleaner API.
+
+    Examples
+    --------
+    ::
+
+        >>> def bar(self, x):
+        ...     print('computing for', x)
+        ...     return x + 'bar'
+
+        >>> class Foo(object):
+        ...     foo = MemoizeDescriptor(bar)
+
+        >>> f = Foo()
+        >>> print(f.foo('foo'))
+        computing for foo
+        foobar
+        >>> print(f.foo('awesome'))
+        computing for awesome
+        awesomebar
+        >>> print(f.foo('foo'))
+        foobar
+        >>> print(f.foo.pop('foo'))
+        foobar
+        >>> print(f.foo('foo'))
+        computing for foo
+        foobar
+        >>> print(f.foo('awesome'))
+        awesomebar
+
+    Number of values cached per instance can be limited
+    in which case least recently used values are evicted::
+
+        >>> class Foo(object):
+        ...     foo = MemoizeDescriptor(bar, maxsize=1)
+
+        >>> f = Foo()
+        >>> print(f.foo('foo'))
+        computing for foo
+        foobar
+        >>> print(f.foo('awesome'))
+        computing for awesome
+        awesomebar
+        >>> print(f.foo('foo'))
+        computing for foo
+        foobar
+        >>> Foo.__dict__['foo'].get_cache(f).evictions
+        2
+
+    Parameters
+    ----------
+    method : function
+        Callable which this descriptor is meant to wrap and cache
+    cache_class : type, optional
+        Caching implementation cache which should be used to
+        apply caching. By default :py:attr:`.default_cache_class` is used.
+    maxsize : int, optional
+        Maximum number of values cached per instance.
+        See :py:class:`Memoizing`.
+    normalize : bool, optional
+        Whether to bind method parameters to its signature
+        before computing cache keys so that equivalent calls
+        in different styles share cached values.
+        See :py:class:`NormalizedCache`. By default is ``False``.
+    """
+    cache_attribute_pattern = '{name}_memoize_{hash}'
+    """
+    String pattern for constructing the cache attribute
+    name under which cache will be stored on the instance.
+    This attribute is meant to be changed in subclasses
+    to customize the functionality.
+    """
+    default_cache_class = Memoizing
+    """
+    Cache implementation class which will be used
+    for the caching.
+    This attribute is meant to be changed in subclasses
+    to customize the functionality.
+    """
+
+    def __init__(self, method, *args, **kwargs):
+        normalize = kwargs.pop('normalize', False)
+        super(MemoizeDescriptor, self).__init__(method, *args, **kwargs)
+        # skipping self
+        self.signature = CallSignature(method, skip=1) if normalize else None
+
+    def get_cache(self, instance):
+        """
+        Custom implementation for getting the cache implementation
+        which binds parameters when ``normalize`` is used
+        """
+        cache = super(MemoizeDescriptor, self).get_cache(instance)
+        if self.signature is not None:
+            cache = NormalizedCache(cache, self.signature)
+        return cache
+
+
+class DictCacheDescriptor(object):
+    """
+    Cache descriptor for properties which stores computed value
+    directly in instance ``__dict__`` under the property name
+
+    Unlike :py:class:`CacheDescriptor` this is a non-data descriptor
+    (it does not define ``__set__`` nor ``__delete__``) hence once
+    the value is computed, it shadows the descriptor and all subsequent
+    reads are plain attribute lookups without any overhead.
+    Setting or deleting the attribute directly manipulates the
+    instance ``__dict__`` which respectively sets or clears the cache.
+
+    .. note::
+        Since cached reads never reach this descriptor,
+        options which require inspecting cached value on each
+        access such as ``ttl`` or ``stats`` are not supported.
+        Instances of the class must also have ``__dict__``.
+
+    .. note::
+        On Python 3.6+ value is stored under the name
+        to which descriptor is assigned in the class.
+        On older versions wrapped method name is used
+        hence both names must match.
+
+    Examples
+    --------
+    ::
+
+        >>> def bar(self):
+        ...     print('computing')
+        ...     return 'bar'
+
+        >>> class Foo(object):
+        ...     bar = DictCacheDescriptor(bar)
+
+        >>> f = Foo()
+        >>> print(f.bar)
+        computing
+        bar
+        >>> print(f.bar)
+        bar
+        >>> print(f.__dict__['bar'])
+        bar
+        >>> print(Foo.bar.pop(f))
+        bar
+        >>> f.bar = 'another value'
+        >>> print(f.bar)
+        another value
+        >>> del f.bar
+        >>> print(f.bar)
+        computing
+        bar
+
+    Parameters
+    ----------
+    method : function
+        Callable which this descriptor is meant to wrap and cache
+    lock : bool, optional
+        Same as :py:class:`CacheDescriptor` ``lock`` parameter
+    cache_options
+        Not supported. Only present to provide
+        clear error message when any options are given.
+    """
+
+    def __init__(self, method, lock=False, **cache_options):
+        if cache_options:
+            raise TypeError(
+                '{0} does not support {1}'
+                ''.format(self.__class__.__name__, ', '.join(sorted(cache_options)))
+            )
+        if is_coroutine_function(method):
+            raise TypeError(
+                '{0} does not support coroutine functions'
+                ''.format(self.__class__.__name__)
+            )
+        self.method = method
+        self.name = method.__name__
+        self.__doc__ = method.__doc__
+        self.single_flight = SingleFlight() if lock else None
+
+    @property
+    def cache_attribute(self):
+        """
+        Name of the instance attribute where the value is cached
+        which is the same as the property name
+        """
+        return self.name
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        cache_descriptor_registry.register(owner, name, self)
+
+    def contribute_to_class(self, cls, name):
+        """
+        Same as :py:meth:`CacheDescriptor.contribute_to_class`
+        """
+        setattr(cls, name, self)
+        self.__set_name__(cls, name)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        if self.single_flight is None:
+            return self.push(instance, self.method(instance))
+
+        def compute():
+            # another thread might have just finished computing the value
+            try:
+                return instance.__dict__[self.name]
+            except KeyError:
+                return self.push(instance, self.method(instance))
+
+        return self.single_flight.run(id(instance), compute)
+
+    def pop(self, instance):
+        """
+        Method for popping cached value from the instance
+
+        Raises
+        ------
+        NotInCache
+            When the value is not cached
+        """
+        try:
+            return instance.__dict__.pop(self.name)
+        except KeyError:
+            raise NotInCache
+
+    def push(self, instance, value):
+        """
+        Method for setting custom cached value on the instance
+        """
+        instance.__dict__[self.name] = value
+        return value
+
+    def has_cache(self, instance):
+        """
+        Check whether value is cached on the instance
+        """
+        return self.name in instance.__dict__
+
+    def clear(self, instance):
+        """
+        Method for clearing cached value from the instance
+
+        Returns
+        -------
+        bool
+            Whether value was cached and cleared
+        """
+        try:
+            self.pop(instance)
+        except NotInCache:
+            return False
+        return True
+
+
+class CacheDescriptorRegistry(object):
+    """
+    Registry of cache descriptors declared on classes
+
+    Descriptors register themselves when their class is created
+    (via ``__set_name__``) hence descriptors of a class can be
+    looked up without inspecting all its attributes.
+    Resolved descriptors of each class, including inherited ones,
+    are remembered so subsequent lookups only check that each of
+    them is still set on the class where it was found.
+    Descriptors which were removed or replaced are therefore noticed
+    and descriptors of the class are resolved again.
+    Classes are referenced weakly.
+
+    Descriptors attached to classes after they are created
+    (e.g. with ``setattr``) do not register themselves since
+    ``__set_name__`` is not called. Such descriptors should be
+    attached with their ``contribute_to_class()`` method or added
+    via :py:meth:`register` explicitly::
+
+        Foo.bar = cache_method(bar)              # not registered
+        cache_method(bar).contribute_to_class(Foo, 'bar')  # registered
+
+    Normally :py:data:`cache_descriptor_registry` should be used
+    rather than instantiating this class.
+
+    .. note::
+        ``__set_name__`` is only called on Python 3.6+.
+        On older versions :py:func:`get_cache_descriptors`
+        inspects class attributes instead.
+    """
+
+    def __init__(self):
+        self.declared = weakref.WeakKeyDictionary()
+        self.resolved = weakref.WeakKeyDictionary()
+
+    def register(self, owner, name, descriptor):
+        """
+        Add cache descriptor declared on the class under the given name
+        """
+        self.declared.setdefault(owner, OrderedDict())[name] = descriptor
+        # new classes are rarely created so simply resolve everything again
+        self.resolved.clear()
+
+    def get(self, klass):
+        """
+        Get all cache descriptors of the given class
+        including the ones inherited from its bases
+
+        Returns
+        -------
+        OrderedDict
+            Mapping of attribute names to cache descriptors.
+            It is shared between calls hence must not be modified.
+        """
+        mro = inspect.getmro(klass)
+        try:
+            descriptors, owners = self.resolved[klass]
+        except KeyError:
+            pass
+        else:
+            # owners are kept as indexes in mro so that klass is not referenced
+            if all(vars(mro[i]).get(name) is descriptor
+                   for i, name, descriptor in owners):
+                return descriptors
+
+        descriptors = OrderedDict()
+        for base in reversed(mro):
+            descriptors.update(self.declared.get(base, {}))
+
+        owners = []
+        for name, descriptor in list(descriptors.items()):
+            index = next((i for i, base in enumerate(mro) if name in vars(base)), None)
+            # overwritten by subclass or removed
+            if index is None or vars(mro[index])[name] is not descriptor:
+                del descriptors[name]
+            else:
+                owners.append((index, name, descriptor))
+
+        self.resolved[klass] = descriptors, owners
+        return descriptors
+
+
+cache_descriptor_registry = CacheDescriptorRegistry()
+"""
+Global :py:class:`CacheDescriptorRegistry` where all cache
+descriptors register themselves
+"""
+
+
+def get_cache_descriptors(klass):
+    """
+    Get all cache descriptors of the given class
+    including the ones inherited from its bases
+
+    Examples
+    --------
+    ::
+
+        >>> class Foo(object):
+        ...     @cache_method
+        ...     def foo(self):
+        ...         return 'foo'
+        ...     @cache_property(in_dict=True)
+        ...     def bar(self):
+        ...         return 'bar'
 
+        >>> sorted(get_cache_descriptors(Foo))
+        ['bar', 'foo']
 
-class MemoizeDescriptor(CacheDescriptor):
+    Returns
+    -------
+    OrderedDict
+        Mapping of attribute names to cache descriptors
     """
-    Cache descriptor to be used to add instance-level cache
-    to class methods which considers method parameters
-    when caching values.
+    if sys.version_info >= (3, 6):
+        return OrderedDict(cache_descriptor_registry.get(klass))
+
+    descriptors = OrderedDict()
+    for base in reversed(inspect.getmro(klass)):
+        for name, value in vars(base).items():
+            if isinstance(value, (CacheDescriptor, DictCacheDescriptor)):
+                descriptors[name] = value
+            else:
+                # overwritten by subclass
+                descriptors.pop(name, None)
+    return descriptors
 
-    In other words, this descriptor caches method results
-    per given parameters.
 
-    .. note::
-        This descriptor could be used independently (and there are
-        even some examples below) however it is meant to be used
-        along with :py:class:`MemoizeDecorator` which provides much
-        cleaner API.
+def cached_attributes(obj):
+    """
+    Get names of all cache descriptors of the object
+    which currently have cached values for it
+
+    Only values stored on the object itself (or in the
+    ``storage='weak'`` side table) are considered.
+    Values stored elsewhere, for example by memoization in Django cache,
+    are not.
 
     Examples
     --------
     ::
 
-        >>> def bar(self, x):
-        ...     print('computing for', x)
-        ...     return x + 'bar'
-
         >>> class Foo(object):
-        ...     foo = MemoizeDescriptor(bar)
+        ...     @cache_method
+        ...     def foo(self):
+        ...         return 'foo'
+        ...     @cache_property(in_dict=True)
+        ...     def bar(self):
+        ...         return 'bar'
 
         >>> f = Foo()
-        >>> print(f.foo('foo'))
-        computing for foo
-        foobar
-        >>> print(f.foo('awesome'))
-        computing for awesome
-        awesomebar
-        >>> print(f.foo('foo'))
-        foobar
-        >>> print(f.foo.pop('foo'))
-        foobar
-        >>> print(f.foo('foo'))
-        computing for foo
-        foobar
-        >>> print(f.foo('awesome'))
-        awesomebar
+        >>> _ = f.bar
+        >>> cached_attributes(f)
+        ['bar']
+
+    Returns
+    -------
+    list
+        Names of cached attributes
     """
-    cache_attribute_pattern = '{name}_memoize_{hash}'
+    return [
+        name for name, descriptor in get_cache_descriptors(type(obj)).items()
+        if descriptor.has_cache(obj)
+    ]
+
+
+def clear_caches(obj, only=None):
     """
-    String pattern for constructing the cache attribute
-    name under which cache will be stored on the instance.
-    This attribute is meant to be changed in subclasses
-    to customize the functionality.
+    Clear values cached by all cache descriptors of the object
+
+    Examples
+    --------
+    ::
+
+        >>> class Foo(object):
+        ...     @cache_method
+        ...     def foo(self):
+        ...         return 'foo'
+        ...     @cache_property(in_dict=True)
+        ...     def bar(self):
+        ...         return 'bar'
+
+        >>> f = Foo()
+        >>> _ = f.foo(), f.bar
+        >>> clear_caches(f, only=['foo'])
+        ['foo']
+        >>> clear_caches(f)
+        ['bar']
+
+    Parameters
+    ----------
+    obj : object
+        Object of which cached values to clear
+    only : iterable, optional
+        Names of cached attributes to clear.
+        By default all are cleared.
+
+    Returns
+    -------
+    list
+        Names of cached attributes which had cached values and were cleared
+
+    Raises
+    ------
+    ValueError
+        When ``only`` includes names which are not cache descriptors
     """
-    default_cache_class = Memoizing
+    descriptors = get_cache_descriptors(type(obj))
+    if only is not None:
+        only = list(only)
+        unknown = [i for i in only if i not in descriptors]
+        if unknown:
+            raise ValueError(
+                '{0} are not cached attributes of {1}'
+                ''.format(', '.join(sorted(unknown)), type(obj).__name__)
+            )
+        descriptors = OrderedDict((i, descriptors[i]) for i in only)
+    return [name for name, descriptor in descriptors.items() if descriptor.clear(obj)]
+
+
+class ExcludeCacheStateMixin(object):
     """
-    Cache implementation class which will be used
-    for the caching.
-    This attribute is meant to be changed in subclasses
-    to customize the functionality.
+    Mixin which excludes values cached on the instance by
+    cache descriptors from its pickled and copied state
+
+    Cached values are recomputed on demand hence there is little
+    point serializing them. Excluding them makes pickled objects
+    smaller and quicker to transfer, for example to other processes
+    or to a cache backend. Since both ``copy.copy()`` and
+    ``copy.deepcopy()`` reduce objects the same way as pickle,
+    copies also start with empty caches.
+
+    Excluded attributes are removed in ``__getstate__``.
+    Some classes however reduce to their instance ``__dict__``
+    without calling ``__getstate__``, for example Django models
+    before Django 2.0, hence excluded attributes are also removed
+    from such reduced state in ``__reduce_ex__``.
+
+    Only caches stored directly on the instance are excluded.
+    Caches with ``storage='weak'`` are never part of instance state.
+    For Django models mixin should come before ``models.Model``
+    in the class bases.
+
+    Examples
+    --------
+    ::
+
+        >>> import copy
+        >>> class Foo(ExcludeCacheStateMixin):
+        ...     @cache_method
+        ...     def foo(self):
+        ...         return 'foo'
+        ...     @cache_property(in_dict=True)
+        ...     def bar(self):
+        ...         return 'bar'
+
+        >>> f = Foo()
+        >>> f.value = 5
+        >>> _ = f.foo(), f.bar
+        >>> sorted(vars(copy.deepcopy(f)))
+        ['value']
     """
 
+    def get_excluded_state_attributes(self):
+        """
+        Get names of the instance attributes excluded
+        from the instance state
+
+        By default these are all attributes where cache
+        descriptors of the class store cached values.
+        """
+        return [
+            descriptor.cache_attribute
+            for descriptor in get_cache_descriptors(type(self)).values()
+            if getattr(descriptor, 'storage', 'instance') == 'instance'
+        ]
+
+    def get_default_state(self):
+        """
+        Get instance state same as pickled by default when none
+        of the base classes define ``__getstate__``
+
+        That is either instance ``__dict__`` or when class
+        defines ``__slots__``, tuple of instance ``__dict__``
+        and dictionary of set slot values.
+        """
+        state = getattr(self, '__dict__', None)
+        slots = {}
+        for name in copyreg._slotnames(type(self)):
+            try:
+                slots[name] = getattr(self, name)
+            except AttributeError:
+                pass
+        if slots:
+            return state, slots
+        return state
+
+    def __getstate__(self):
+        getstate = getattr(super(ExcludeCacheStateMixin, self), '__getstate__', None)
+        state = getstate() if getstate is not None else self.get_default_state()
+        slots = None
+        if isinstance(state, tuple):
+            state, slots = state
+
+        excluded = set(self.get_excluded_state_attributes())
+        state = {k: v for k, v in (state or {}).items() if k not in excluded}
+        if slots is None:
+            return state
+
+        slots = {k: v for k, v in slots.items() if k not in excluded}
+        return state or None, slots or None
+
+    def __reduce_ex__(self, protocol):
+        reduced = super(ExcludeCacheStateMixin, self).__reduce_ex__(protocol)
+        # base reduced to the instance dict itself bypassing __getstate__
+        if (isinstance(reduced, tuple) and len(reduced) > 2 and
+                reduced[2] is getattr(self, '__dict__', None)):
+            excluded = set(self.get_excluded_state_attributes())
+            state = {k: v for k, v in reduced[2].items() if k not in excluded}
+            reduced = reduced[:2] + (state,) + reduced[3:]
+        return reduced
+
 
 class BaseCacheDecorator(HybridDecorator):
     """
@@ -402,6 +3153,55 @@ class BaseCacheDecorator(HybridDecorator):
     and all subsequent calls return cached value
 
     This is very useful for expensive functions
+
+    Coroutine functions (``async def``) are supported as well
+    in which case the awaited result is cached rather than the
+    coroutine itself. Concurrent awaiters of a missing value
+    share a single computation. See :py:class:`AsyncFlight`.
+
+    When ``stale_while_revalidate`` is given along with ``ttl``
+    (or ``timeout`` for Django cache backends), expired values are
+    served right away for that many seconds while they are refreshed
+    in the background. Each value is refreshed by a single thread
+    of a bounded thread pool (see :py:class:`Revalidator`)
+    or by a single task for coroutine functions. After that window
+    values are considered missing and callers compute them as usual.
+
+    Parameters
+    ----------
+    is_method : bool, optional
+        Same as :py:class:`HybridDecorator <django_auxilium.utils.functools.decorators.HybridDecorator>`
+        ``is_method`` parameter
+    lock : bool, optional
+        Whether concurrent threads missing the same cache value
+        should wait for a single thread to compute it instead
+        of all computing it. See :py:class:`SingleFlight`.
+    stats : bool, optional
+        Whether to collect :py:class:`CacheStats` which are then
+        available via ``cache_info()`` on the wrapped function
+        and in :py:data:`cache_stats_registry`.
+        By default is ``False`` in which case there is no overhead.
+    tags : iterable, callable, optional
+        Tags of cached values which allow to invalidate them
+        with :py:func:`invalidate_tags`. Can either be static
+        iterable of tags or a callable which is called with same
+        parameters as the wrapped function and returns tags.
+        See :py:class:`TagIndex`.
+    cache_exceptions : tuple, optional
+        Exception classes which are cached when raised by the
+        wrapped callable and then re-raised from cache instead
+        of computing the value again until ``exception_ttl`` passes.
+        Useful to avoid retrying expensive failing computations
+        such as lookups of missing remote resources.
+        See :py:class:`NegativeCache`.
+        Not supported for coroutine functions.
+    exception_ttl : int, float, optional
+        Number of seconds exceptions are cached for.
+        Required along with ``cache_exceptions``.
+    cache_options
+        Any additional keyword arguments are passed to the caching
+        implementation (e.g. ``maxsize`` for :py:class:`Memoizing`)
+        regardless whether wrapping class method or a standalone function
     """
     cache_descriptor_class = None
     """
@@ -414,11 +3214,63 @@ class BaseCacheDecorator(HybridDecorator):
     This attribute is meant to be changed in subclasses.
     """
 
+    tag_index = cache_tag_index
+    """
+    Index where tagged values of standalone functions are registered.
+    This attribute is meant to be changed in subclasses.
+    """
+    revalidator = cache_revalidator
+    """
+    Thread pool where stale values of standalone functions are refreshed.
+    This attribute is meant to be changed in subclasses.
+    """
+
+    def __init__(self, is_method=None, lock=False, stats=False, tags=None,
+                 cache_exceptions=None, exception_ttl=None, **cache_options):
+        super(BaseCacheDecorator, self).__init__(is_method=is_method)
+        self.lock = lock
+        self.collect_stats = stats
+        self.tags = tags
+        self.cache_exceptions = cache_exceptions
+        self.exception_ttl = exception_ttl
+        self.cache_options = cache_options
+
+    def get_cache_descriptor_options(self):
+        """
+        Hook for getting parameters the cache descriptor class
+        is instantiated with besides the wrapped method
+        """
+        options = {
+            'lock': self.lock,
+            'stats': self.collect_stats,
+            'tags': self.tags,
+            'cache_exceptions': self.cache_exceptions,
+            'exception_ttl': self.exception_ttl,
+        }
+        options.update(self.cache_options)
+        return options
+
     def get_cache_descriptor(self):
         """
         Hook for instantiating cache descriptor class
         """
-        return self.cache_descriptor_class(self.to_wrap)
+        return self.cache_descriptor_class(self.to_wrap, **self.get_cache_descriptor_options())
+
+    def get_cache(self):
+        """
+        Hook for instantiating caching implementation
+        when wrapping standalone functions
+        """
+        return self.cache_class(self, 'cached_value', **self.cache_options)
+
+    def get_cache_proxy(self, cache):
+        """
+        Hook for proxying caching implementation of standalone functions
+        after all other proxies are applied hence the returned proxy
+        receives parameters before any other proxy.
+        By default caching implementation is returned as is.
+        """
+        return cache
 
     def get_wrapped_object(self):
         """
@@ -444,24 +3296,185 @@ class BaseCacheDecorator(HybridDecorator):
             return self.get_cache_descriptor()
 
         else:
-            self.cache = self.cache_class(self, 'cached_value')
+            self.stats = None
+            if self.collect_stats:
+                self.stats = cache_stats_registry.register(
+                    CacheStats(get_qualified_name(to_wrap))
+                )
+                self.cache_options['stats'] = self.stats
+
+            self.cache = self.get_cache()
+            self.single_flight = SingleFlight() if self.lock else None
+
+            if self.tags is not None:
+                self.cache = TaggedCache(self.cache, self.tag_index, self, self)
+            if self.stats is not None:
+                self.cache = InstrumentedCache(self.cache, self.stats)
+                to_wrap = self.stats.timed(to_wrap)
+            if self.cache_exceptions:
+                validate_cache_exceptions(
+                    self.to_wrap, self.cache_exceptions, self.exception_ttl
+                )
+                self.cache = NegativeCache(self.cache, self.exception_ttl)
+                to_wrap = catch_exceptions(to_wrap, self.cache_exceptions)
+            self.cache = self.get_cache_proxy(self.cache)
+
+            if is_coroutine_function(self.to_wrap):
+                wrapper = self.get_async_wrapper(to_wrap)
+                wrapper.pop = self.pop
+                wrapper.warm = self.warm
+                wrapper.decorator = self
+                if self.stats is not None:
+                    wrapper.cache_info = self.cache_info
+                return wrapper
 
             def wrapper(*args, **kwargs):
                 try:
                     return self.cache.get(*args, **kwargs)
+                except StaleInCache as e:
+                    self.revalidate(to_wrap, *args, **kwargs)
+                    return e.value
                 except NotInCache:
-                    return self.cache.set(to_wrap(*args, **kwargs), *args, **kwargs)
+                    if self.single_flight is None:
+                        return self.cache.set(to_wrap(*args, **kwargs), *args, **kwargs)
+
+                def compute():
+                    try:
+                        return self.cache.get(*args, **kwargs)
+                    except NotInCache:
+                        return self.cache.set(to_wrap(*args, **kwargs), *args, **kwargs)
+
+                return self.single_flight.run(self.get_flight_key(*args, **kwargs), compute)
 
             wrapper.pop = self.pop
+            wrapper.warm = self.warm
             wrapper.decorator = self
+            if self.stats is not None:
+                wrapper.cache_info = self.cache_info
+            self.wrapper = wrapper
             return wrapper
 
+    def get_async_wrapper(self, to_wrap):
+        """
+        Get wrapping function for standalone coroutine functions
+
+        Wrapper is a coroutine function which resolves either to the cached value
+        or to the value computed by awaiting wrapped coroutine function.
+        Concurrent calls with same parameters share the same computation.
+        See :py:class:`AsyncFlight`.
+        """
+        from .cache_async import get_cached_coroutine_function
+
+        self.async_flight = AsyncFlight()
+        return get_cached_coroutine_function(self, to_wrap)
+
+    def get_flight_key(self, *args, **kwargs):
+        """
+        Hook for getting the key under which concurrent computations
+        of the wrapped standalone function are shared
+        when using ``lock``, coroutine functions or ``stale_while_revalidate``.
+        By default it is the cache key of the given parameters.
+        """
+        return self.cache._get_key(*args, **kwargs)
+
+    def revalidate(self, to_wrap, *args, **kwargs):
+        """
+        Schedule refresh of the stale value cached for the given
+        parameters in :py:attr:`revalidator`
+        """
+        key = (id(self), self.get_flight_key(*args, **kwargs))
+        return self.revalidator.submit(key, lambda: self.cache.set(
+            to_wrap(*args, **kwargs), *args, **kwargs
+        ))
+
     def pop(self, *args, **kwargs):
         """
         Method for popping cache value corresponding to the given parameters
         """
         return self.cache.delete(*args, **kwargs)
 
+    def is_cached(self, *args, **kwargs):
+        """
+        Check whether value of the wrapped standalone function
+        is cached for the given parameters
+        """
+        try:
+            self.cache.get(*args, **kwargs)
+        except NotInCache:
+            return False
+        except Exception:
+            # cached exception
+            return True
+        return True
+
+    def warm(self, calls, workers=1, executor='thread', progress=None):
+        """
+        Compute values of the wrapped standalone function
+        for all given calls which are not cached yet
+
+        Not supported for coroutine functions.
+
+        Parameters
+        ----------
+        calls : iterable
+            Parameters of calls to warm where tuples are positional
+            parameters, dictionaries are keyword parameters and all other
+            values are single positional parameter
+        workers : int, optional
+            Number of concurrent workers
+        executor : str, optional
+            Either ``'thread'`` or ``'process'``.
+            See :py:class:`CacheWarmer <django_auxilium.utils.functools.cache_warm.CacheWarmer>`.
+        progress : callable, optional
+            Called with number of finished calls and total number
+            of calls to compute after each computed value
+
+        Returns
+        -------
+        WarmReport
+
+        Raises
+        ------
+        TypeError
+            When wrapped function is a coroutine function
+        """
+        if is_coroutine_function(self.to_wrap):
+            raise TypeError('Cache warming is not supported for coroutine functions')
+        from .cache_warm import CacheWarmer
+        warmer = CacheWarmer(workers=workers, executor=executor, progress=progress)
+        if executor == 'process':
+            # wrapper can be pickled by its import path unlike the wrapped function
+            return warmer.warm(calls, self.wrapper, self.is_cached, self.cache.set)
+        return warmer.warm(calls, self.wrapper, self.is_cached)
+
+    def cache_info(self):
+        """
+        Get statistics of the wrapped standalone function
+        when ``stats`` are enabled
+
+        Returns
+        -------
+        CacheInfo
+        """
+        return self.stats.info()
+
+    def get_tags(self, owner, *args, **kwargs):
+        """
+        Get tags of the value cached for the given parameters
+        of the wrapped standalone function.
+        ``owner`` is always the decorator itself.
+        """
+        if callable(self.tags):
+            return self.tags(*args, **kwargs)
+        return self.tags
+
+    def invalidate(self, owner, *args, **kwargs):
+        """
+        Pop tagged value of the wrapped standalone function.
+        Used by :py:class:`TagIndex`.
+        """
+        return self.pop(*args, **kwargs)
+
 
 class CacheDecorator(BaseCacheDecorator):
     """
@@ -518,6 +3531,41 @@ class CacheDecorator(BaseCacheDecorator):
         computing here
         foo
 
+    When cached value should expire::
+
+        >>> now = [0]
+        >>> @CacheDecorator.as_decorator(ttl=60, clock=lambda: now[0])
+        ... def compute():
+        ...     print('computing here')
+        ...     return 'foo'
+
+        >>> print(compute())
+        computing here
+        foo
+        >>> now[0] = 59
+        >>> print(compute())
+        foo
+        >>> now[0] = 60
+        >>> print(compute())
+        computing here
+        foo
+
+    When cached property should be stored in instance ``__dict__``
+    so that subsequent reads do not have any overhead::
+
+        >>> class Foo(object):
+        ...     @CacheDecorator.as_decorator(as_property=True, in_dict=True)
+        ...     def foo(self):
+        ...         print('computing here')
+        ...         return 'foo'
+
+        >>> f = Foo()
+        >>> print(f.foo)
+        computing here
+        foo
+        >>> print(f.__dict__['foo'])
+        foo
+
     Parameters
     ----------
     as_property : bool
@@ -528,27 +3576,60 @@ class CacheDecorator(BaseCacheDecorator):
             This is only meant to be used when the wrapping
             method does not accept any parameters since there
             is no way in Python to pass parameters to properties
+    in_dict : bool
+        Whether property should store cached value directly
+        in instance ``__dict__`` under property name.
+        Can only be used along with ``as_property``.
+        See :py:class:`DictCacheDescriptor` for its limitations.
+    ttl : int, float, optional
+        Number of seconds after which cached value expires
+        and is recomputed on next access.
+        See :py:class:`BaseCache` for more information.
+    clock : callable, optional
+        Callable returning current time in seconds used
+        to determine when values expire.
+        See :py:class:`BaseCache` for more information.
     """
     cache_descriptor_class = CacheDescriptor
     """
     Descriptor class to be used when caching is applied to class methods
     """
+    dict_cache_descriptor_class = DictCacheDescriptor
+    """
+    Descriptor class to be used when caching is applied to class methods
+    with ``in_dict`` parameter
+    """
     cache_class = Caching
     """
     Caching implementation to use when wrapping standalone functions.
     """
 
-    def __init__(self, as_property=False, *args, **kwargs):
+    def __init__(self, as_property=False, in_dict=False, *args, **kwargs):
+        if in_dict and not as_property:
+            raise ValueError('`in_dict` can only be used along with `as_property`')
         self.as_property = as_property
+        self.in_dict = in_dict
         super(CacheDecorator, self).__init__(*args, **kwargs)
 
     def get_cache_descriptor(self):
         """
         Custom implementation for getting the cache descriptor
-        which allows to use ``as_property`` parameter
+        which allows to use ``as_property`` and ``in_dict`` parameters
         """
+        if self.in_dict:
+            options = dict(self.cache_options)
+            if self.collect_stats:
+                options['stats'] = self.collect_stats
+            if self.tags is not None:
+                options['tags'] = self.tags
+            if self.cache_exceptions:
+                options['cache_exceptions'] = self.cache_exceptions
+            return self.dict_cache_descriptor_class(
+                self.to_wrap, lock=self.lock, **options
+            )
+
         return self.cache_descriptor_class(
-            self.to_wrap, as_property=self.as_property,
+            self.to_wrap, as_property=self.as_property, **self.get_cache_descriptor_options()
         )
 
 
@@ -616,6 +3697,82 @@ class MemoizeDecorator(BaseCacheDecorator):
         barfoo
         >>> print(f.foo('awesome'))
         awesomefoo
+
+    When limiting number of cached values::
+
+        >>> @MemoizeDecorator.as_decorator(maxsize=1)
+        ... def compute(x):
+        ...     print('computing for', x)
+        ...     return x + 'foo'
+
+        >>> print(compute('bar'))
+        computing for bar
+        barfoo
+        >>> print(compute('awesome'))
+        computing for awesome
+        awesomefoo
+        >>> print(compute('bar'))
+        computing for bar
+        barfoo
+        >>> compute.decorator.cache.evictions
+        2
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of values to cache.
+        When caching class methods, the limit is per instance.
+        See :py:class:`Memoizing` for more information.
+    ttl : int, float, optional
+        Number of seconds after which cached values expire
+        and are recomputed on next call.
+        See :py:class:`BaseCache` for more information.
+    clock : callable, optional
+        Callable returning current time in seconds used
+        to determine when values expire.
+        See :py:class:`BaseCache` for more information.
+    typed : bool, optional
+        Whether to cache equal parameters of different types separately.
+        See :py:class:`Memoizing` for more information.
+    key : callable, optional
+        Custom callable for computing cache key from parameters.
+        See :py:class:`Memoizing` for more information.
+    backend : str, optional
+        Alias of Django cache as configured in ``settings.CACHES``
+        where to store cached values. That allows to share cached
+        values across processes. Keys are namespaced by function's
+        import path. See
+        :py:class:`DjangoMemoizing <django_auxilium.utils.functools.cache_django.DjangoMemoizing>`
+        for more information as well as for additional parameters
+        such as ``timeout`` and ``version``.
+
+        .. warning::
+            This can only be used on standalone functions
+            since cached values are not tied to any instance.
+    tiered : bool, optional
+        Whether to keep in-process cache in front of ``backend``
+        cache in which case ``maxsize`` and ``ttl`` apply to in-process
+        cache and ``timeout`` applies to ``backend`` cache.
+        See :py:class:`TieredMemoizing <django_auxilium.utils.functools.cache_django.TieredMemoizing>`.
+    persist : str, optional
+        Path to SQLite database file where to store cached values.
+        That allows values to survive process restarts and to be
+        shared by all processes on the host. Keys are namespaced
+        by function's import path. See
+        :py:class:`SQLiteMemoizing <django_auxilium.utils.functools.cache_sqlite.SQLiteMemoizing>`
+        for more information as well as for additional parameters
+        such as ``version``.
+
+        .. warning::
+            This can only be used on standalone functions
+            since cached values are not tied to any instance.
+    normalize : bool, optional
+        Whether to bind parameters to the signature of the wrapped
+        callable (computed once when decorating) before computing
+        cache keys. That applies defaults and makes positional
+        and keyword calls such as ``f(1, 2)``, ``f(1, b=2)``
+        and ``f(a=1, b=2)`` share the same cached value.
+        See :py:class:`NormalizedCache`. By default is ``False``.
     """
     cache_descriptor_class = MemoizeDescriptor
     """
@@ -626,6 +3783,178 @@ class MemoizeDecorator(BaseCacheDecorator):
     Caching implementation to use when wrapping standalone functions.
     """
 
+    @property
+    def backend_cache_class(self):
+        """
+        Caching implementation to use when wrapping standalone functions
+        with ``backend`` parameter.
+        This is meant to be changed in subclasses.
+        """
+        # imported lazily since it requires configured Django settings
+        from .cache_django import DjangoMemoizing
+        return DjangoMemoizing
+
+    @property
+    def tiered_cache_class(self):
+        """
+        Caching implementation to use when wrapping standalone functions
+        with ``backend`` and ``tiered`` parameters.
+        This is meant to be changed in subclasses.
+        """
+        from .cache_django import TieredMemoizing
+        return TieredMemoizing
+
+    @property
+    def persist_cache_class(self):
+        """
+        Caching implementation to use when wrapping standalone functions
+        with ``persist`` parameter.
+        This is meant to be changed in subclasses.
+        """
+        from .cache_sqlite import SQLiteMemoizing
+        return SQLiteMemoizing
+
+    def __init__(self, backend=None, tiered=False, persist=None, normalize=False,
+                 *args, **kwargs):
+        if tiered and backend is None:
+            raise ValueError('`tiered` can only be used along with `backend`')
+        if persist is not None and backend is not None:
+            raise ValueError('`persist` cannot be used along with `backend`')
+        self.backend = backend
+        self.tiered = tiered
+        self.persist = persist
+        self.normalize = normalize
+        super(MemoizeDecorator, self).__init__(*args, **kwargs)
+
+    def get_cache_proxy(self, cache):
+        """
+        Custom implementation for proxying the caching implementation
+        which binds parameters of standalone functions
+        when ``normalize`` is used
+        """
+        if self.normalize:
+            return NormalizedCache(cache, CallSignature(self.to_wrap))
+        return cache
+
+    def get_namespace(self):
+        """
+        Get namespace for the cache keys of the wrapped function
+        when using ``backend``
+        """
+        return get_qualified_name(self.to_wrap)
+
+    def get_cache(self):
+        """
+        Custom implementation for getting the caching implementation
+        which allows to use ``backend`` and ``persist`` parameters
+        """
+        if self.persist is not None:
+            options = {'namespace': self.get_namespace()}
+            options.update(self.cache_options)
+            return self.persist_cache_class(
+                self, 'cached_value', path=self.persist, **options
+            )
+
+        if self.backend is None:
+            return super(MemoizeDecorator, self).get_cache()
+
+        cache_class = self.tiered_cache_class if self.tiered else self.backend_cache_class
+        options = {'namespace': self.get_namespace()}
+        options.update(self.cache_options)
+        return cache_class(self, 'cached_value', alias=self.backend, **options)
+
+    def get_cache_descriptor(self):
+        """
+        Custom implementation for getting the cache descriptor
+        which makes sure ``backend`` and ``persist`` are not used for class methods
+        """
+        if self.backend is not None:
+            raise TypeError(
+                '`backend` can only be used to memoize standalone functions'
+            )
+        if self.persist is not None:
+            raise TypeError(
+                '`persist` can only be used to memoize standalone functions'
+            )
+        return super(MemoizeDecorator, self).get_cache_descriptor()
+
+    def get_cache_descriptor_options(self):
+        """
+        Custom implementation for getting parameters of the cache descriptor
+        which allows to use ``normalize`` parameter
+        """
+        options = super(MemoizeDecorator, self).get_cache_descriptor_options()
+        options['normalize'] = self.normalize
+        return options
+
+
+class WeakMemoizeDecorator(MemoizeDecorator):
+    """
+    Decorator for memoizing standalone functions per their first parameter
+    where cached values are discarded as soon as the first parameter
+    is garbage collected
+
+    This is useful for functions computing things about objects
+    such as model instances. Unlike regular memoization which
+    would keep values (and often the objects themselves) forever,
+    memory is bounded to live objects only.
+    Values are also never shared between distinct objects
+    even if they compare equal.
+    See :py:class:`WeakMemoizing` for more information.
+
+    Examples
+    --------
+    ::
+
+        >>> class Foo(object):
+        ...     pass
+
+        >>> @WeakMemoizeDecorator.as_decorator()
+        ... def compute(obj, x):
+        ...     print('computing for', x)
+        ...     return x + 'foo'
+
+        >>> f = Foo()
+        >>> print(compute(f, 'bar'))
+        computing for bar
+        barfoo
+        >>> print(compute(f, 'bar'))
+        barfoo
+        >>> print(compute(Foo(), 'bar'))
+        computing for bar
+        barfoo
+
+        >>> del f
+        >>> len(compute.decorator.cached_value)
+        0
+    """
+    cache_class = WeakMemoizing
+    """
+    Caching implementation to use when wrapping standalone functions.
+    """
+
+    def get_cache(self):
+        """
+        Custom implementation for getting the caching implementation
+        which makes sure neither ``backend`` nor ``persist`` are used
+        """
+        if self.backend is not None:
+            raise TypeError('`backend` cannot be used with weak memoization')
+        if self.persist is not None:
+            raise TypeError('`persist` cannot be used with weak memoization')
+        return super(WeakMemoizeDecorator, self).get_cache()
+
+    def get_cache_descriptor(self):
+        """
+        Custom implementation for getting the cache descriptor
+        which makes sure decorator is not used for class methods
+        """
+        raise TypeError(
+            'Weak memoization can only be used on standalone functions. '
+            'Use regular memoization for methods since it is already '
+            'tied to the instance lifetime.'
+        )
+
 
 cache = CacheDecorator.as_decorator()
 memoize = MemoizeDecorator.as_decorator()
@@ -641,6 +3970,13 @@ These are equivalent::
 
     @cache_property
     def bar(self): pass
+
+For hot properties, value can be stored directly in
+instance ``__dict__`` so that reads have no overhead.
+See :py:class:`DictCacheDescriptor`::
+
+    @cache_property(in_dict=True)
+    def bar(self): pass
 """
 cache_method = CacheDecorator.as_decorator(is_method=True)
 """
@@ -657,3 +3993,8 @@ These are equivalent::
         @cache_method
         def bar(self): pass
 """
+weak_memoize = WeakMemoizeDecorator.as_decorator()
+"""
+Shortcut for :py:class:`WeakMemoizeDecorator` which memoizes
+standalone functions per first parameter only while it is alive
+"""
@@ -0,0 +1,91 @@
+"""
+Coroutine wrappers used by cache decorators and descriptors
+when wrapped callables are coroutine functions
+
+This module uses ``async def`` syntax hence it is only imported
+by :py:mod:`django_auxilium.utils.functools.cache` when coroutine
+functions are actually cached which is not possible on Python 2.
+"""
+from __future__ import print_function, unicode_literals
+from functools import partial
+from timeit import default_timer
+
+from .cache import NotInCache, StaleInCache, retrieve_exception
+
+
+async def get_or_compute(cache, flight, get_key, compute, args, kwargs):
+    """
+    Get the cache value for the given parameters or compute it
+    by awaiting coroutine function ``compute``
+
+    Nothing is looked up or computed until the returned
+    coroutine is awaited or scheduled as a task.
+    Concurrent computations for the same key share
+    a single task. See :py:class:`AsyncFlight <django_auxilium.utils.functools.cache.AsyncFlight>`.
+
+    Parameters
+    ----------
+    cache : BaseCache
+        Caching implementation
+    flight : AsyncFlight
+        Where concurrent computations are shared
+    get_key : callable
+        Callable which returns key of the computation
+        for the given parameters
+    compute : callable
+        Coroutine function computing the value
+    args : tuple
+        Positional parameters of the call
+    kwargs : dict
+        Keyword parameters of the call
+    """
+    try:
+        return cache.get(*args, **kwargs)
+    except StaleInCache as e:
+        stale = e
+    except NotInCache:
+        stale = None
+
+    future = flight.run(
+        get_key(*args, **kwargs),
+        partial(compute, *args, **kwargs),
+        lambda value: cache.set(value, *args, **kwargs),
+    )
+    if stale is None:
+        return await future
+    # nobody awaits the refresh so its exception has to be retrieved here
+    future.add_done_callback(retrieve_exception)
+    return stale.value
+
+
+def get_cached_coroutine_function(decorator, to_wrap):
+    """
+    Get coroutine function which wraps given standalone
+    coroutine function with caching of the given decorator
+
+    See :py:meth:`BaseCacheDecorator.get_async_wrapper <django_auxilium.utils.functools.cache.BaseCacheDecorator.get_async_wrapper>`
+    """
+    async def wrapper(*args, **kwargs):
+        return await get_or_compute(
+            decorator.cache, decorator.async_flight, decorator.get_flight_key,
+            to_wrap, args, kwargs,
+        )
+
+    return wrapper
+
+
+def get_timed_coroutine_function(stats, f):
+    """
+    Get coroutine function which adds time until given
+    coroutine function completes to ``stats.compute_time``
+
+    See :py:meth:`CacheStats.timed <django_auxilium.utils.functools.cache.CacheStats.timed>`
+    """
+    async def wrapper(*args, **kwargs):
+        start = default_timer()
+        try:
+            return await f(*args, **kwargs)
+        finally:
+            stats.compute_time += default_timer() - start
+
+    return wrapper
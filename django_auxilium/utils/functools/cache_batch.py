@@ -0,0 +1,269 @@
+"""
+Cache descriptors which compute values for groups of instances at once
+"""
+from __future__ import print_function, unicode_literals
+import weakref
+
+from .cache import (
+    CacheDecorator,
+    CacheDescriptor,
+    NotInCache,
+    WeakIdKeyDictionary,
+    is_coroutine_function,
+)
+
+
+class BatchGroups(object):
+    """
+    Registry of groups of instances which should be
+    computed together by :py:class:`BatchCacheDescriptor`
+
+    Instances are referenced weakly hence registering
+    a group does not extend lifetime of its instances.
+    Normally :py:data:`batch_cache_groups` should be used
+    rather than instantiating this class.
+    """
+
+    def __init__(self):
+        self.groups = WeakIdKeyDictionary()
+
+    def register(self, instances):
+        """
+        Register given instances as a single group
+
+        Any instance can only be part of a single group
+        hence registering it again moves it to the new group.
+        """
+        instances = list(instances)
+        refs = [weakref.ref(i) for i in instances]
+        for instance in instances:
+            self.groups[instance] = refs
+
+    def get(self, instance):
+        """
+        Get all live instances of the group of the given instance
+
+        Returns
+        -------
+        list
+            Instances of the group or only the given instance
+            when it was not registered in any group
+        """
+        refs = self.groups.get(instance)
+        if refs is None:
+            return [instance]
+        return [i for i in (ref() for ref in refs) if i is not None]
+
+
+batch_cache_groups = BatchGroups()
+"""
+Global :py:class:`BatchGroups` where groups of instances
+are registered such as by
+:py:class:`BatchCacheQuerySet <django_auxilium.models.cache.BatchCacheQuerySet>`
+"""
+
+
+class BatchCacheDescriptor(CacheDescriptor):
+    """
+    Cache descriptor which computes values of a whole group
+    of instances at once when any of them is accessed
+
+    Wrapped ``method`` is a batch function which receives
+    a list of instances and must return a list of values
+    in the same order. When cached value of an instance is missing,
+    batch function is called once with all instances from its group
+    (see :py:class:`BatchGroups`) which are not cached yet
+    and all returned values are cached on their instances.
+    That allows to avoid N+1 queries when the computation
+    requires a query per instance.
+
+    Groups can either be registered explicitly via
+    :py:data:`batch_cache_groups` or values can be computed
+    upfront via :py:meth:`prime`.
+
+    Examples
+    --------
+    ::
+
+        >>> def get_lengths(instances):
+        ...     print('computing for', [i.name for i in instances])
+        ...     return [len(i.name) for i in instances]
+
+        >>> class Foo(object):
+        ...     def __init__(self, name):
+        ...         self.name = name
+        ...     length = BatchCacheDescriptor(get_lengths)
+
+        >>> foos = [Foo('a'), Foo('bb'), Foo('ccc')]
+        >>> batch_cache_groups.register(foos)
+        >>> foos[1].length()
+        computing for ['a', 'bb', 'ccc']
+        2
+        >>> foos[2].length()
+        3
+
+        >>> Foo.length.prime([Foo('dddd')])
+        computing for ['dddd']
+        [4]
+
+    Parameters
+    ----------
+    method : function
+        Batch function which computes values for a list of instances
+    cache_options
+        Any additional keyword arguments are passed
+        to :py:class:`CacheDescriptor <django_auxilium.utils.functools.cache.CacheDescriptor>`
+    """
+    cache_attribute_pattern = '{name}_batch_{hash}'
+    """
+    String pattern for constructing the cache attribute
+    name under which cache will be stored on the instance.
+    """
+    groups = batch_cache_groups
+    """
+    Registry of instance groups.
+    This attribute is meant to be changed in subclasses
+    to customize the functionality.
+    """
+
+    def __init__(self, method, *args, **kwargs):
+        if is_coroutine_function(method):
+            raise TypeError('Batch caching does not support coroutine functions')
+        super(BatchCacheDescriptor, self).__init__(method, *args, **kwargs)
+
+    def is_cached(self, instance):
+        """
+        Check whether value of the given instance is cached
+        """
+        try:
+            self.get_cache(instance).get()
+        except NotInCache:
+            return False
+        return True
+
+    def batch(self, instances):
+        """
+        Compute and cache values of the given instances
+        by calling the batch function once
+
+        Returns
+        -------
+        list
+            Computed values in the same order as instances
+        """
+        values = list(self.evaluate(instances))
+        if len(values) != len(instances):
+            raise ValueError(
+                'Batch function {0} returned {1} values for {2} instances'
+                ''.format(self.method.__name__, len(values), len(instances))
+            )
+        for instance, value in zip(instances, values):
+            self.get_cache(instance).set(value)
+        return values
+
+    def prime(self, instances):
+        """
+        Compute and cache values of all given instances
+        which are not cached yet by calling the batch function once
+
+        Returns
+        -------
+        list
+            Computed values of instances which were not cached
+        """
+        missing = [i for i in instances if not self.is_cached(i)]
+        if not missing:
+            return []
+        return self.batch(missing)
+
+    def getter(self, instance):
+        """
+        Return cached value of the instance or compute values
+        of all missing instances in its group
+        """
+        cache = self.get_cache(instance)
+        try:
+            return cache.get()
+        except NotInCache:
+            pass
+
+        def compute():
+            # another thread might have just finished computing the value
+            try:
+                return cache.get()
+            except NotInCache:
+                pass
+            missing = [
+                i for i in self.groups.get(instance)
+                if i is instance or not self.is_cached(i)
+            ]
+            values = self.batch(missing)
+            return next(v for i, v in zip(missing, values) if i is instance)
+
+        if self.single_flight is None:
+            return compute()
+        return self.single_flight.run(id(instance), compute)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return super(BatchCacheDescriptor, self).__get__(instance, owner)
+
+
+class BatchCacheDecorator(CacheDecorator):
+    """
+    Decorator for creating :py:class:`BatchCacheDescriptor`
+    from a batch function
+
+    Decorated function is always used as a class method
+    regardless of its parameter names since it receives
+    list of instances rather than a single instance.
+
+    Examples
+    --------
+    ::
+
+        >>> def get_lengths(instances):
+        ...     return [len(i.name) for i in instances]
+
+        >>> class Foo(object):
+        ...     def __init__(self, name):
+        ...         self.name = name
+        ...     length = BatchCacheDecorator.as_decorator()(get_lengths)
+        ...     @BatchCacheDecorator.as_decorator(as_property=True)
+        ...     def size(instances):
+        ...         return [len(i.name) for i in instances]
+
+        >>> Foo('foo').length()
+        3
+        >>> Foo('foo').size
+        3
+    """
+    cache_descriptor_class = BatchCacheDescriptor
+    """
+    Descriptor class to be used when caching is applied to class methods
+    """
+
+    def __init__(self, *args, **kwargs):
+        if kwargs.get('in_dict'):
+            raise ValueError('`in_dict` is not supported for batch caching')
+        super(BatchCacheDecorator, self).__init__(*args, **kwargs)
+
+    def pre_wrap(self):
+        """
+        Batch functions are always class methods
+        """
+        self.in_class = True
+
+
+batch_cache_method = BatchCacheDecorator.as_decorator()
+"""
+Shortcut for :py:class:`BatchCacheDecorator` which creates
+cached methods computed in batches for groups of instances::
+
+    def get_scores(products):
+        ...
+
+    class Product(models.Model):
+        score = batch_cache_method(get_scores)
+"""
@@ -0,0 +1,369 @@
+"""
+Caching implementations which store values in Django cache framework
+
+Unlike other cache modules, importing this module
+requires configured Django settings hence it is not
+imported by :py:mod:`django_auxilium.utils.functools`.
+"""
+from __future__ import print_function, unicode_literals
+import hashlib
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+from .cache import BaseCache, CacheEntry, Memoizing, NotInCache, ReprParamsMixin, StaleInCache
+
+
+class DjangoMemoizing(ReprParamsMixin, BaseCache):
+    """
+    Caching implementation which stores cache values
+    for a set of given parameters in Django cache framework
+
+    Unlike :py:class:`Memoizing <django_auxilium.utils.functools.cache.Memoizing>`
+    which stores values in the ``parent`` object itself
+    and hence in the memory of a single process,
+    this implementation stores values in one of the configured
+    ``settings.CACHES`` which allows to share cached values
+    between processes or even servers.
+
+    Cache keys are namespaced by ``namespace`` and ``version``
+    and parameters are hashed to make sure keys are valid
+    for all cache backends. Since keys are computed from
+    ``repr()`` of the parameters, parameters should have
+    stable ``repr()`` across processes. Cached values
+    are pickled by Django hence they must be picklable.
+
+    Parameters
+    ----------
+    parent : object
+        A parent object this cache is for.
+        Not used to store values.
+    attr : str
+        Name of the attribute this cache is for.
+        Used as ``namespace`` when it is not provided.
+    alias : str, optional
+        Name of the cache as configured in ``settings.CACHES``.
+        By default ``'default'`` is used.
+    timeout : int, optional
+        Number of seconds after which values expire.
+        By default the ``timeout`` as configured for the cache
+        backend is used. ``None`` caches values forever.
+    version : int, str, optional
+        Version of cached values. Useful to invalidate all
+        cached values when computation logic changes.
+    namespace : str, optional
+        Namespace of the cache keys. Usually it should be
+        full import path of the cached function.
+    ttl : int, float, optional
+        Alias for ``timeout`` to be consistent with other
+        caching implementations. Used only when ``timeout``
+        is not provided.
+    clock : callable, optional
+        Used only with ``stale_while_revalidate`` to determine
+        when values expire since otherwise Django cache backends
+        track expiry times themselves. By default is wall clock
+        since values are shared between processes.
+    stats : CacheStats, optional
+        Same as :py:class:`BaseCache <django_auxilium.utils.functools.cache.BaseCache>`
+        ``stats`` parameter
+    stale_while_revalidate : int, float, optional
+        Same as :py:class:`BaseCache <django_auxilium.utils.functools.cache.BaseCache>`
+        ``stale_while_revalidate`` parameter.
+        Values are kept in Django cache for that much longer than
+        ``timeout`` along with their expiry time.
+        Can only be used along with ``timeout``.
+    typed : bool, optional
+        Same as :py:class:`Memoizing <django_auxilium.utils.functools.cache.Memoizing>`
+        ``typed`` parameter.
+        Types are included in keys by their ``repr()``.
+    key : callable, optional
+        Same as :py:class:`Memoizing <django_auxilium.utils.functools.cache.Memoizing>`
+        ``key`` parameter.
+        ``repr()`` of the returned key is hashed
+        hence it should be stable across processes.
+    """
+    key_prefix = 'django_auxilium.memoize'
+    """
+    Prefix of all keys used in Django cache.
+    This attribute is meant to be changed in subclasses
+    to customize the functionality.
+    """
+    default_clock = staticmethod(time.time)
+    """
+    Callable used to determine current time when
+    ``clock`` is not explicitly provided.
+    Wall clock since values are shared between processes.
+    """
+
+    def __init__(self, parent, attr, alias='default', timeout=DEFAULT_TIMEOUT,
+                 version=1, namespace=None, ttl=None, clock=None, stats=None,
+                 stale_while_revalidate=None, typed=False, key=None):
+        super(DjangoMemoizing, self).__init__(parent, attr, ttl=ttl, clock=clock, stats=stats)
+        self.alias = alias
+        self.typed = typed
+        self.key = key
+        if timeout is DEFAULT_TIMEOUT and ttl is not None:
+            timeout = ttl
+        if stale_while_revalidate is not None and (timeout is DEFAULT_TIMEOUT or timeout is None):
+            raise ValueError('`stale_while_revalidate` can only be used along with `timeout`')
+        self.timeout = timeout
+        self.version = version
+        self.namespace = namespace or attr
+        self.stale_while_revalidate = stale_while_revalidate
+
+    @property
+    def backend(self):
+        """
+        Django cache backend where values are stored
+        """
+        return caches[self.alias]
+
+    def _get_key(self, *args, **kwargs):
+        params = self._get_params(*args, **kwargs)
+        return '{prefix}:{namespace}:{version}:{digest}'.format(
+            prefix=self.key_prefix,
+            namespace=self.namespace,
+            version=self.version,
+            digest=hashlib.md5(params.encode('utf-8')).hexdigest(),
+        )
+
+    def get(self, *args, **kwargs):
+        """
+        Get the cache value from Django cache
+        by computing the key from the given parameters
+
+        Raises
+        ------
+        NotInCache
+            When the cache is not set
+        """
+        missing = object()
+        value = self.backend.get(self._get_key(*args, **kwargs), missing)
+        if value is missing:
+            raise NotInCache
+        if self.stale_while_revalidate is None:
+            return value
+        return self._unpack_entry(value)
+
+    def set(self, value, *args, **kwargs):
+        """
+        Store the cache value in Django cache
+        for the key as computed for the given parameters
+        """
+        key = self._get_key(*args, **kwargs)
+        if self.stale_while_revalidate is None:
+            self.backend.set(key, value, self.timeout)
+        else:
+            self.backend.set(
+                key,
+                CacheEntry(value, self.clock() + self.timeout),
+                self.timeout + self.stale_while_revalidate,
+            )
+        return value
+
+    def delete(self, *args, **kwargs):
+        """
+        Delete the cache value from Django cache
+        for the key as computed by the given parameters
+
+        Raises
+        ------
+        NotInCache
+            When the cache is not set and so cannot be deleted
+        """
+        key = self._get_key(*args, **kwargs)
+        missing = object()
+        value = self.backend.get(key, missing)
+        if value is missing:
+            raise NotInCache
+        self.backend.delete(key)
+        if self.stale_while_revalidate is None:
+            return value
+        return self._unpack_entry(value)
+
+
+class TieredMemoizing(BaseCache):
+    """
+    Caching implementation which stores cache values in two tiers:
+    small in-process
+    :py:class:`Memoizing <django_auxilium.utils.functools.cache.Memoizing>`
+    cache (L1) in front of shared :py:class:`DjangoMemoizing` cache (L2)
+
+    Values are looked up in L1 first, then in L2 and only then
+    they are considered missing. When value is found in L2,
+    it is promoted into L1 so subsequent lookups do not need
+    a round trip to the shared cache.
+
+    .. note::
+        Deleting a value only removes it from L1 of the current process.
+        Other processes can still serve stale value from their L1
+        hence ``ttl`` should be used to bound for how long that can happen.
+
+    Parameters
+    ----------
+    parent : object
+        A parent object where L1 cache is stored
+    attr : str
+        Name of the attribute under which L1 cache will be stored
+        in the ``parent`` object
+    alias : str, optional
+        Name of the cache as configured in ``settings.CACHES`` used for L2
+    maxsize : int, optional
+        Maximum number of values in L1.
+        See :py:class:`Memoizing <django_auxilium.utils.functools.cache.Memoizing>`.
+    max_bytes : int, optional
+        Maximum total size of values in L1 in bytes.
+        See :py:class:`Memoizing <django_auxilium.utils.functools.cache.Memoizing>`.
+    sizer : callable, optional
+        See :py:class:`Memoizing <django_auxilium.utils.functools.cache.Memoizing>`
+    ttl : int, float, optional
+        Number of seconds values are valid for in L1.
+        See :py:class:`Memoizing <django_auxilium.utils.functools.cache.Memoizing>`.
+    timeout : int, optional
+        Number of seconds values are valid for in L2.
+        See :py:class:`DjangoMemoizing`.
+    version : int, str, optional
+        Version of values in L2.
+        See :py:class:`DjangoMemoizing`.
+    namespace : str, optional
+        Namespace of L2 keys.
+        See :py:class:`DjangoMemoizing`.
+    clock : callable, optional
+        Clock for L1 ``ttl``.
+        See :py:class:`BaseCache <django_auxilium.utils.functools.cache.BaseCache>`.
+        Also used by
+        :py:class:`NegativeCache <django_auxilium.utils.functools.cache.NegativeCache>`
+        for expiry times of cached exceptions which are stored in L2 as well
+        hence by default is wall clock.
+    typed : bool, optional
+        Used by both tiers so that they key values the same way.
+        See :py:class:`Memoizing <django_auxilium.utils.functools.cache.Memoizing>`
+        and :py:class:`DjangoMemoizing`.
+    key : callable, optional
+        Used by both tiers so that they key values the same way.
+        See :py:class:`Memoizing <django_auxilium.utils.functools.cache.Memoizing>`
+        and :py:class:`DjangoMemoizing`.
+    stats : CacheStats, optional
+        Statistics where L1 reports evictions
+    stale_while_revalidate : int, float, optional
+        Number of seconds expired values are still served
+        while they are being refreshed in both tiers.
+        Requires both ``ttl`` and ``timeout``.
+        See :py:class:`BaseCache <django_auxilium.utils.functools.cache.BaseCache>`.
+
+    Attributes
+    ----------
+    l1 : Memoizing
+        In-process cache tier
+    l2 : DjangoMemoizing
+        Shared cache tier
+    l1_hits : int
+        Number of lookups served from L1
+    l2_hits : int
+        Number of lookups served from L2
+    misses : int
+        Number of lookups not found in either tier
+    """
+    l1_cache_class = Memoizing
+    """
+    Caching implementation used for L1.
+    This attribute is meant to be changed in subclasses
+    to customize the functionality.
+    """
+    l2_cache_class = DjangoMemoizing
+    """
+    Caching implementation used for L2.
+    This attribute is meant to be changed in subclasses
+    to customize the functionality.
+    """
+    default_clock = staticmethod(time.time)
+    """
+    Callable used to determine current time when
+    ``clock`` is not explicitly provided.
+    Wall clock since values are shared between processes.
+    """
+
+    def __init__(self, parent, attr, alias='default', maxsize=None, ttl=None,
+                 timeout=DEFAULT_TIMEOUT, version=1, namespace=None, clock=None,
+                 typed=False, key=None, stats=None, stale_while_revalidate=None,
+                 max_bytes=None, sizer=None):
+        super(TieredMemoizing, self).__init__(
+            parent, attr, ttl=ttl, clock=clock, stats=stats,
+            stale_while_revalidate=stale_while_revalidate,
+        )
+        self.l1 = self.l1_cache_class(
+            parent, attr, maxsize=maxsize, ttl=ttl, clock=clock, typed=typed, key=key,
+            stats=stats, stale_while_revalidate=stale_while_revalidate,
+            max_bytes=max_bytes, sizer=sizer,
+        )
+        self.l2 = self.l2_cache_class(
+            parent, attr, alias=alias, timeout=timeout, version=version, namespace=namespace,
+            stale_while_revalidate=stale_while_revalidate, typed=typed, key=key,
+        )
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+
+    def _get_key(self, *args, **kwargs):
+        return self.l1._get_key(*args, **kwargs)
+
+    def get(self, *args, **kwargs):
+        """
+        Get the cache value from L1 or L2 promoting
+        values found in L2 into L1
+
+        Raises
+        ------
+        NotInCache
+            When the cache is not set in either tier
+        StaleInCache
+            When the cache is stale in L1 and L2 does not have fresh value
+        """
+        stale = None
+        try:
+            value = self.l1.get(*args, **kwargs)
+        except StaleInCache as e:
+            stale = e
+        except NotInCache:
+            pass
+        else:
+            self.l1_hits += 1
+            return value
+
+        try:
+            value = self.l2.get(*args, **kwargs)
+        except NotInCache:
+            self.misses += 1
+            if stale is not None:
+                raise stale
+            raise
+
+        self.l2_hits += 1
+        return self.l1.set(value, *args, **kwargs)
+
+    def set(self, value, *args, **kwargs):
+        """
+        Store the cache value in both tiers
+        """
+        self.l2.set(value, *args, **kwargs)
+        return self.l1.set(value, *args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """
+        Delete the cache value from both tiers
+
+        Raises
+        ------
+        NotInCache
+            When the cache is not set in either tier
+        """
+        values = []
+        for tier in (self.l1, self.l2):
+            try:
+                values.append(tier.delete(*args, **kwargs))
+            except NotInCache:
+                pass
+        if not values:
+            raise NotInCache
+        return values[0]
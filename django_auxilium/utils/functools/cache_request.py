@@ -0,0 +1,223 @@
+"""
+Memoization of values for the duration of a request
+"""
+from __future__ import print_function, unicode_literals
+import threading
+from contextlib import contextmanager
+
+from .cache import MemoizeDecorator, Memoizing
+
+
+try:
+    from contextvars import ContextVar
+except ImportError:  # pragma: no cover
+    ContextVar = None
+
+
+class ThreadLocalVar(object):
+    """
+    Minimal thread-local substitute for ``contextvars.ContextVar``
+    which is used when ``contextvars`` are not available
+    (Python < 3.7)
+
+    Parameters
+    ----------
+    name : str
+        Name of the variable
+    default : object, optional
+        Value returned by :py:meth:`get` when value is not set
+    """
+
+    def __init__(self, name, default=None):
+        self.name = name
+        self.default = default
+        self.local = threading.local()
+
+    def get(self):
+        """
+        Get current value of the variable
+        """
+        return getattr(self.local, 'value', self.default)
+
+    def set(self, value):
+        """
+        Set new value of the variable
+
+        Returns
+        -------
+        object
+            Token to be used with :py:meth:`reset`
+            to restore previous value
+        """
+        token = self.get()
+        self.local.value = value
+        return token
+
+    def reset(self, token):
+        """
+        Restore the value of the variable as it was
+        before :py:meth:`set` which returned ``token``
+        """
+        self.local.value = token
+
+
+class RequestCache(object):
+    """
+    Container of all :py:class:`RequestMemoizing` values
+    for a single request scope
+
+    See Also
+    --------
+    request_cache_scope
+    """
+
+
+request_cache_context = (ContextVar or ThreadLocalVar)('django_auxilium_request_cache', default=None)
+"""
+Context variable which holds current :py:class:`RequestCache`
+or ``None`` when not in request scope.
+Since it is a ``contextvars.ContextVar`` (when available),
+it works with both threads and ``asyncio``.
+"""
+
+
+@contextmanager
+def request_cache_scope():
+    """
+    Context manager which opens new request cache scope
+
+    All values cached by :py:data:`request_memoize` while within
+    the scope are discarded when the scope is exited.
+    Usually this is done for each request by
+    :py:class:`RequestCacheMiddleware <django_auxilium.middleware.cache.RequestCacheMiddleware>`
+    however it can also be used directly in places where there is no request
+    such as background tasks::
+
+        >>> with request_cache_scope() as cache:
+        ...     isinstance(cache, RequestCache)
+        True
+    """
+    store = RequestCache()
+    token = request_cache_context.set(store)
+    try:
+        yield store
+    finally:
+        request_cache_context.reset(token)
+
+
+class RequestMemoizing(Memoizing):
+    """
+    Caching implementation which stores values for a set of given
+    parameters only for the duration of the current request scope
+
+    Values are stored in :py:class:`RequestCache` of the current
+    scope as opened by :py:func:`request_cache_scope` instead of the
+    ``parent`` object. Once the scope is exited, all values are discarded.
+    When there is no open scope, values are not cached at all
+    which guarantees values can never be shared between requests.
+
+    Parameters are the same as
+    :py:class:`Memoizing <django_auxilium.utils.functools.cache.Memoizing>`.
+    ``parent`` is only the owner of the cache
+    (usually the decorator) and values are never stored on it.
+    ``attr`` must be unique for each cached function since
+    all of them share the same :py:class:`RequestCache`.
+    """
+
+    @property
+    def container(self):
+        """
+        :py:class:`RequestCache` of the current scope or ``None``
+        when not in request scope
+        """
+        return request_cache_context.get()
+
+    def set(self, value, *args, **kwargs):
+        """
+        Store the cache value in the current request scope.
+        When not in request scope, value is not stored.
+        """
+        if self.container is None:
+            return value
+        return super(RequestMemoizing, self).set(value, *args, **kwargs)
+
+
+class RequestMemoizeDecorator(MemoizeDecorator):
+    """
+    Decorator for memoizing standalone functions only for
+    the duration of a request
+
+    This is useful for things which are expensive to compute
+    and which are needed multiple times during a request
+    but which can change between requests such as user permissions.
+    Cache is only used within :py:func:`request_cache_scope` which
+    is usually opened for each request by
+    :py:class:`RequestCacheMiddleware <django_auxilium.middleware.cache.RequestCacheMiddleware>`.
+    See :py:class:`RequestMemoizing` for more information.
+
+    Examples
+    --------
+    ::
+
+        >>> @RequestMemoizeDecorator.as_decorator()
+        ... def compute(x):
+        ...     print('computing for', x)
+        ...     return x + 'foo'
+
+        >>> with request_cache_scope():
+        ...     print(compute('bar'))
+        ...     print(compute('bar'))
+        computing for bar
+        barfoo
+        barfoo
+
+        >>> with request_cache_scope():
+        ...     print(compute('bar'))
+        computing for bar
+        barfoo
+
+        >>> print(compute('bar'))
+        computing for bar
+        barfoo
+    """
+    cache_class = RequestMemoizing
+    """
+    Caching implementation to use when wrapping standalone functions.
+    """
+
+    def get_cache(self):
+        """
+        Custom implementation for getting the caching implementation
+        which makes sure each function stores its values
+        under unique attribute in the request scope
+        """
+        attr = '{0}_{1}'.format(self.get_namespace(), id(self))
+        return self.cache_class(self, attr, **self.cache_options)
+
+    def get_flight_key(self, *args, **kwargs):
+        """
+        Custom implementation for getting the key of shared computations
+        which includes current request scope so that concurrent requests
+        never share computed values. Outside of request scope
+        computations are never shared.
+        """
+        scope = request_cache_context.get()
+        if scope is None:
+            return object()
+        return id(scope), super(RequestMemoizeDecorator, self).get_flight_key(*args, **kwargs)
+
+    def get_cache_descriptor(self):
+        """
+        Custom implementation for getting the cache descriptor
+        which makes sure decorator is not used for class methods
+        """
+        raise TypeError(
+            'Request memoization can only be used on standalone functions'
+        )
+
+
+request_memoize = RequestMemoizeDecorator.as_decorator()
+"""
+Shortcut for :py:class:`RequestMemoizeDecorator` which memoizes
+standalone functions only for the duration of the current request
+"""
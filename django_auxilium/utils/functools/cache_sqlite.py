@@ -0,0 +1,217 @@
+"""
+Caching implementation which stores values in a local SQLite database
+"""
+from __future__ import print_function, unicode_literals
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from six.moves import cPickle as pickle
+
+from .cache import BaseCache, CacheEntry, NotInCache, ReprParamsMixin, StaleInCache
+
+
+class SQLiteMemoizing(ReprParamsMixin, BaseCache):
+    """
+    Caching implementation which stores cache values
+    for a set of given parameters in a local SQLite database file
+
+    Values survive process restarts and are shared by all
+    processes on the same host which use the same file.
+    That makes it useful for expensive pure computations
+    such as parsing schemas which otherwise need to be
+    recomputed every time a process starts.
+
+    Writes are atomic since each of them is a separate transaction.
+    Database is used in WAL mode so that readers do not block writers
+    and the other way around. Each thread and each forked process
+    uses its own connection.
+
+    Keys are namespaced by ``namespace`` and ``version`` the same way
+    as in
+    :py:class:`DjangoMemoizing <django_auxilium.utils.functools.cache_django.DjangoMemoizing>`
+    hence parameters should have stable ``repr()`` across processes.
+    Values are pickled.
+    Values which cannot be unpickled anymore (e.g. when their class
+    was removed) are considered missing.
+
+    Parameters
+    ----------
+    parent : object
+        A parent object this cache is for.
+        Not used to store values.
+    attr : str
+        Name of the attribute this cache is for.
+        Used as ``namespace`` when it is not provided.
+    path : str
+        Path to the SQLite database file.
+        It is created when it does not exist.
+    version : int, str, optional
+        Version of cached values. Useful to invalidate all
+        cached values when computation logic changes.
+    namespace : str, optional
+        Namespace of the keys. Usually it should be
+        full import path of the cached function.
+    ttl : int, float, optional
+        Same as :py:class:`BaseCache <django_auxilium.utils.functools.cache.BaseCache>`
+        ``ttl`` parameter
+    clock : callable, optional
+        Same as :py:class:`BaseCache <django_auxilium.utils.functools.cache.BaseCache>`
+        ``clock`` parameter.
+        By default is wall clock since values are shared
+        between processes.
+    stats : CacheStats, optional
+        Same as :py:class:`BaseCache <django_auxilium.utils.functools.cache.BaseCache>`
+        ``stats`` parameter
+    stale_while_revalidate : int, float, optional
+        Same as :py:class:`BaseCache <django_auxilium.utils.functools.cache.BaseCache>`
+        ``stale_while_revalidate`` parameter
+    timeout : int, float, optional
+        Number of seconds to wait for other processes to finish
+        writing before giving up with ``sqlite3.OperationalError``
+    typed : bool, optional
+        Same as :py:class:`DjangoMemoizing <django_auxilium.utils.functools.cache_django.DjangoMemoizing>`
+        ``typed`` parameter
+    key : callable, optional
+        Same as :py:class:`DjangoMemoizing <django_auxilium.utils.functools.cache_django.DjangoMemoizing>`
+        ``key`` parameter
+    """
+    table = 'django_auxilium_memoize'
+    """
+    Name of the table where values are stored.
+    This attribute is meant to be changed in subclasses
+    to customize the functionality.
+    """
+    pragmas = (
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+    )
+    """
+    Statements executed on each new connection.
+    This attribute is meant to be changed in subclasses
+    to customize the functionality.
+    """
+    default_clock = staticmethod(time.time)
+    """
+    Callable used to determine current time when
+    ``clock`` is not explicitly provided.
+    Wall clock since values are shared between processes.
+    """
+
+    def __init__(self, parent, attr, path, version=1, namespace=None, ttl=None,
+                 clock=None, stats=None, stale_while_revalidate=None, timeout=5,
+                 typed=False, key=None):
+        super(SQLiteMemoizing, self).__init__(
+            parent, attr, ttl=ttl, clock=clock, stats=stats,
+            stale_while_revalidate=stale_while_revalidate,
+        )
+        self.path = path
+        self.version = version
+        self.namespace = namespace or attr
+        self.timeout = timeout
+        self.typed = typed
+        self.key = key
+        self.local = threading.local()
+
+    @property
+    def connection(self):
+        """
+        Connection to the database of the current thread and process
+        """
+        pid = os.getpid()
+        if getattr(self.local, 'pid', None) != pid:
+            # connections must not be shared with forked processes
+            self.local.connection = self._connect()
+            self.local.pid = pid
+        return self.local.connection
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=self.timeout)
+        for pragma in self.pragmas:
+            connection.execute(pragma)
+        with connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS {0} '
+                '(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)'
+                ''.format(self.table)
+            )
+        return connection
+
+    def _get_key(self, *args, **kwargs):
+        params = self._get_params(*args, **kwargs)
+        return '{namespace}:{version}:{digest}'.format(
+            namespace=self.namespace,
+            version=self.version,
+            digest=hashlib.md5(params.encode('utf-8')).hexdigest(),
+        )
+
+    def _select(self, key):
+        row = self.connection.execute(
+            'SELECT value, expires FROM {0} WHERE key = ?'.format(self.table), (key,)
+        ).fetchone()
+        if row is None:
+            raise NotInCache
+        try:
+            value = pickle.loads(bytes(row[0]))
+        except (pickle.UnpicklingError, AttributeError, ImportError, EOFError):
+            # no longer loadable value, e.g. its class was removed
+            self._delete(key)
+            raise NotInCache
+        if self.ttl is not None:
+            try:
+                value = self._unpack_entry(CacheEntry(value, row[1]))
+            except StaleInCache:
+                raise
+            except NotInCache:
+                self._delete(key)
+                raise
+        return value
+
+    def _delete(self, key):
+        with self.connection as connection:
+            connection.execute('DELETE FROM {0} WHERE key = ?'.format(self.table), (key,))
+
+    def get(self, *args, **kwargs):
+        """
+        Get the cache value from the database
+        by computing the key from the given parameters
+
+        Raises
+        ------
+        NotInCache
+            When the cache is not set
+        """
+        return self._select(self._get_key(*args, **kwargs))
+
+    def set(self, value, *args, **kwargs):
+        """
+        Store the cache value in the database
+        for the key as computed for the given parameters
+        """
+        data = sqlite3.Binary(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        expires = None if self.ttl is None else self.clock() + self.ttl
+        with self.connection as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO {0} (key, value, expires) VALUES (?, ?, ?)'
+                ''.format(self.table),
+                (self._get_key(*args, **kwargs), data, expires),
+            )
+        return value
+
+    def delete(self, *args, **kwargs):
+        """
+        Delete the cache value from the database
+        for the key as computed by the given parameters
+
+        Raises
+        ------
+        NotInCache
+            When the cache is not set and so cannot be deleted
+        """
+        key = self._get_key(*args, **kwargs)
+        try:
+            return self._select(key)
+        finally:
+            self._delete(key)
@@ -0,0 +1,336 @@
+"""
+Utilities for computing missing cache values ahead of time
+"""
+from __future__ import print_function, unicode_literals
+import logging
+import multiprocessing
+import os
+from collections import namedtuple
+from functools import partial
+from multiprocessing.pool import ThreadPool
+from timeit import default_timer
+
+from django.db import connections
+
+from .cache import DictCacheDescriptor, NotInCache, get_cache_descriptors
+
+
+log = logging.getLogger(__name__)
+
+
+WarmReport = namedtuple('WarmReport', ['total', 'computed', 'cached', 'failed', 'elapsed'])
+"""
+Summary of :py:meth:`CacheWarmer.warm` where ``total`` is number
+of given calls, ``cached`` is number of calls which were already cached,
+``failed`` is number of calls which raised an exception
+and ``elapsed`` is number of seconds warming took
+"""
+
+
+def get_call_arguments(call):
+    """
+    Normalize call specification of :py:class:`CacheWarmer`
+    into ``args`` and ``kwargs``
+
+    Tuples are positional arguments, dictionaries are keyword
+    arguments and all other values are single positional argument.
+
+    Examples
+    --------
+    ::
+
+        >>> get_call_arguments((1, 2))
+        ((1, 2), {})
+        >>> get_call_arguments({'a': 1})
+        ((), {'a': 1})
+        >>> get_call_arguments(1)
+        ((1,), {})
+    """
+    if isinstance(call, tuple):
+        return call, {}
+    if isinstance(call, dict):
+        return (), call
+    return (call,), {}
+
+
+def warm_call(f, call):
+    """
+    Call ``f`` with given ``(args, kwargs)`` capturing its result or exception
+
+    Used by :py:class:`CacheWarmer` workers hence it is
+    a module-level function so that it can be pickled.
+
+    Returns
+    -------
+    tuple
+        ``(args, kwargs, succeeded, value or exception)``
+    """
+    args, kwargs = call
+    try:
+        return args, kwargs, True, f(*args, **kwargs)
+    except Exception as e:
+        return args, kwargs, False, e
+
+
+def warm_thread_call(f, call):
+    """
+    Same as :py:func:`warm_call` for :py:class:`CacheWarmer` thread workers
+    which closes database connections opened by the worker thread
+    """
+    try:
+        return warm_call(f, call)
+    finally:
+        # each thread has its own connections which are otherwise never closed
+        connections.close_all()
+
+
+inherited_connections = []
+"""
+Database connections which forked :py:class:`CacheWarmer` worker
+processes inherited from their parent process.
+See :py:func:`discard_inherited_connections`.
+"""
+
+
+def discard_inherited_connections():
+    """
+    Initializer of forked :py:class:`CacheWarmer` worker processes
+    which makes them open their own database connections
+
+    Inherited connections are shared with the parent process hence
+    they cannot be closed (or used) in worker processes without breaking
+    them, including any transaction in progress, for the parent.
+    Instead they are only detached from Django and kept referenced
+    so that they are not closed when garbage collected either.
+    """
+    for connection in connections.all():
+        if connection.connection is not None:
+            inherited_connections.append(connection.connection)
+            connection.connection = None
+
+
+def get_fork_context():
+    """
+    Get ``multiprocessing`` context which starts processes with ``fork``
+
+    Raises
+    ------
+    ValueError
+        When ``fork`` start method is not available on the current platform
+    """
+    if not hasattr(multiprocessing, 'get_context'):
+        if not hasattr(os, 'fork'):
+            raise ValueError('`fork` start method is not available')
+        # python 2 always forks on platforms supporting it
+        return multiprocessing
+    return multiprocessing.get_context('fork')
+
+
+class CacheWarmer(object):
+    """
+    Utility for computing missing cache values concurrently
+    so that caches are warm before they are used,
+    for example as a post-deploy step
+
+    Examples
+    --------
+    ::
+
+        >>> from django_auxilium.utils.functools import memoize
+
+        >>> @memoize
+        ... def square(x):
+        ...     return x * x
+
+        >>> square.warm(range(5), workers=2)
+        WarmReport(total=5, computed=5, cached=0, failed=0, elapsed=...)
+        >>> square.warm(range(10), workers=2).cached
+        5
+
+    Parameters
+    ----------
+    workers : int, optional
+        Number of concurrent workers
+    executor : str, optional
+        How values are computed. Can be one of:
+
+        :``'thread'``:
+            Values are computed in a pool of threads.
+            This is the default and is best for computations
+            which mostly wait for I/O such as database queries.
+        :``'process'``:
+            Values are computed in a pool of processes
+            and then stored in cache of the current process.
+            Best for CPU-bound computations however computed function
+            must be importable and all parameters and values
+            must be picklable. Worker processes are always started
+            with ``fork`` regardless of the default start method of
+            ``multiprocessing`` hence this executor is not available
+            on platforms without ``fork`` such as Windows.
+            Worker processes open their own database connections.
+            See :py:func:`discard_inherited_connections`.
+    progress : callable, optional
+        Called with number of finished calls and total number
+        of calls to compute after each computed value
+    """
+    executors = ('thread', 'process')
+    """
+    Supported values of the ``executor`` parameter
+    """
+
+    def __init__(self, workers=1, executor='thread', progress=None):
+        if executor not in self.executors:
+            raise ValueError(
+                'Unsupported executor {0!r}. Must be one of {1}'
+                ''.format(executor, ', '.join(self.executors))
+            )
+        if executor == 'process':
+            try:
+                get_fork_context()
+            except ValueError:
+                raise ValueError(
+                    '`process` executor requires `fork` start method '
+                    'which is not available on this platform'
+                )
+        self.workers = workers
+        self.executor = executor
+        self.progress = progress
+
+    def get_pool(self):
+        """
+        Get pool of workers as per ``executor``
+        """
+        if self.executor == 'thread':
+            return ThreadPool(self.workers)
+        # forked processes must not share database connections
+        return get_fork_context().Pool(self.workers, initializer=discard_inherited_connections)
+
+    def warm(self, calls, compute, is_cached, store=None):
+        """
+        Compute all missing values
+
+        Exceptions raised while computing values are logged
+        and counted as failed calls instead of being raised.
+
+        Parameters
+        ----------
+        calls : iterable
+            Parameters of calls to warm.
+            See :py:func:`get_call_arguments`.
+        compute : callable
+            Computes value of a call. When computed value is
+            not stored by ``compute`` itself, ``store`` should be given.
+        is_cached : callable
+            Returns whether value of a call is already cached
+            in which case it is not computed again
+        store : callable, optional
+            Stores computed value of a call in cache.
+            Called in the current process with the value
+            followed by the call parameters.
+
+        Returns
+        -------
+        WarmReport
+        """
+        start = default_timer()
+        calls = [get_call_arguments(i) for i in calls]
+        missing = [(a, k) for a, k in calls if not is_cached(*a, **k)]
+        computed = failed = 0
+
+        if missing:
+            pool = self.get_pool()
+            try:
+                call = warm_thread_call if self.executor == 'thread' else warm_call
+                results = pool.imap_unordered(partial(call, compute), missing)
+                for args, kwargs, succeeded, value in results:
+                    if succeeded:
+                        if store is not None:
+                            store(value, *args, **kwargs)
+                        computed += 1
+                    else:
+                        log.warning('Could not warm cache for {0!r} {1!r}: {2!r}'
+                                    ''.format(args, kwargs, value))
+                        failed += 1
+                    if self.progress is not None:
+                        self.progress(computed + failed, len(missing))
+            finally:
+                pool.terminate()
+                pool.join()
+
+        return WarmReport(
+            total=len(calls),
+            computed=computed,
+            cached=len(calls) - len(missing),
+            failed=failed,
+            elapsed=default_timer() - start,
+        )
+
+
+def warm_cached_property(instances, name, workers=1, progress=None):
+    """
+    Warm cache of cached property or cached method without parameters
+    of all given instances such as instances of a queryset
+
+    That is mostly useful when values are shared between instances
+    (e.g. :py:data:`model_memoize <django_auxilium.models.cache.model_memoize>`)
+    or when the same instances are used later on.
+    Values are computed in threads. See :py:class:`CacheWarmer`.
+
+    Examples
+    --------
+    ::
+
+        >>> from django_auxilium.utils.functools import cache_property
+
+        >>> class Foo(object):
+        ...     @cache_property
+        ...     def foo(self):
+        ...         return 'foo'
+
+        >>> foos = [Foo(), Foo()]
+        >>> warm_cached_property(foos, 'foo').computed
+        2
+
+    Parameters
+    ----------
+    instances : iterable
+        Instances which cache to warm
+    name : str
+        Name of the cached attribute
+    workers : int, optional
+        Number of threads
+    progress : callable, optional
+        See :py:class:`CacheWarmer`
+
+    Returns
+    -------
+    WarmReport
+    """
+    def get_descriptor(instance):
+        try:
+            return get_cache_descriptors(type(instance))[name]
+        except KeyError:
+            raise AttributeError(
+                '{0} does not have cached attribute {1!r}'
+                ''.format(type(instance).__name__, name)
+            )
+
+    def is_cached(instance):
+        descriptor = get_descriptor(instance)
+        if isinstance(descriptor, DictCacheDescriptor):
+            return name in instance.__dict__
+        try:
+            descriptor.get_cache(instance).get()
+        except NotInCache:
+            return False
+        return True
+
+    def compute(instance):
+        value = getattr(instance, name)
+        if not isinstance(get_descriptor(instance), DictCacheDescriptor):
+            if not get_descriptor(instance).as_property:
+                value = value()
+        return value
+
+    warmer = CacheWarmer(workers=workers, progress=progress)
+    return warmer.warm([(i,) for i in instances], compute, is_cached)
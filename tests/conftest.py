@@ -0,0 +1,9 @@
+from __future__ import print_function, unicode_literals
+
+import six
+
+
+collect_ignore = []
+if six.PY2:
+    # tests use async def syntax
+    collect_ignore.append('utils/functools/test_cache_async.py')
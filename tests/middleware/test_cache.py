@@ -0,0 +1,47 @@
+from __future__ import absolute_import, print_function, unicode_literals
+
+import mock
+from django.http.response import HttpResponse
+
+from django_auxilium.middleware.cache import RequestCacheMiddleware
+from django_auxilium.utils.functools.cache_request import (
+    RequestCache,
+    request_cache_context,
+)
+
+
+class TestRequestCacheMiddleware(object):
+    def test_call(self):
+        scopes = []
+
+        def get_response(request):
+            scopes.append(request_cache_context.get())
+            return HttpResponse()
+
+        middleware = RequestCacheMiddleware(get_response)
+
+        assert isinstance(middleware(mock.sentinel.request), HttpResponse)
+        assert isinstance(middleware(mock.sentinel.request), HttpResponse)
+
+        assert len(scopes) == 2
+        assert all(isinstance(i, RequestCache) for i in scopes)
+        assert scopes[0] is not scopes[1]
+        assert request_cache_context.get() is None
+
+    def test_process_request_response(self):
+        request = mock.Mock(spec=[])
+        response = HttpResponse()
+        middleware = RequestCacheMiddleware()
+
+        middleware.process_request(request)
+        assert isinstance(request_cache_context.get(), RequestCache)
+
+        assert middleware.process_response(request, response) is response
+        assert request_cache_context.get() is None
+        assert not hasattr(request, '_request_cache_scope')
+
+    def test_process_response_without_scope(self):
+        response = HttpResponse()
+        middleware = RequestCacheMiddleware()
+
+        assert middleware.process_response(mock.Mock(spec=[]), response) is response
@@ -0,0 +1,193 @@
+from __future__ import print_function, unicode_literals
+import random
+from datetime import datetime, timedelta
+
+import mock
+import pytest
+from django.core.cache import caches
+from django.db import models
+
+from django_auxilium.models import (
+    BatchCacheManager,
+    ModelMemoizeDecorator,
+    ModelMemoizing,
+    ModifiedModel,
+)
+from django_auxilium.utils.functools import BatchGroups, MemoizeDescriptor, NotInCache
+
+
+def get_model():
+    class MemoizedModel(ModifiedModel):
+        class Meta(object):
+            app_label = str(random.randrange(1000, 2000))
+
+        @ModelMemoizeDecorator(timeout=60)
+        def foo(self, a):
+            self.counter = getattr(self, 'counter', 0) + 1
+            return '{0}{1}'.format(a, self.counter)
+
+    return MemoizedModel
+
+
+class TestModelMemoizing(object):
+    def setup_method(self, method):
+        caches['default'].clear()
+        self.model = get_model()
+        self.now = datetime(2018, 1, 1)
+        self.instance = self.model(pk=5, modified=self.now)
+        self.cache = ModelMemoizing(self.instance, 'foo', timeout=60)
+
+    def test_init(self):
+        assert self.cache.modified_field == 'modified'
+        assert self.cache.timeout == 60
+
+    def test_get_row(self):
+        assert self.cache._get_row() == '{0.app_label}.{0.model_name}:5:2018-01-01T00:00:00'.format(
+            self.model._meta
+        )
+
+    def test_get_row_unsaved(self):
+        assert ModelMemoizing(self.model(), 'foo')._get_row() is None
+        assert ModelMemoizing(self.model(pk=5), 'foo')._get_row() is None
+
+    def test_shared_between_instances(self):
+        self.cache.set('value', 'a')
+        other = ModelMemoizing(self.model(pk=5, modified=self.now), 'foo')
+
+        assert other.get('a') == 'value'
+        assert other.delete('a') == 'value'
+        with pytest.raises(NotInCache):
+            self.cache.get('a')
+
+    def test_modified_invalidates(self):
+        self.cache.set('value', 'a')
+        self.instance.modified = self.now + timedelta(seconds=1)
+
+        with pytest.raises(NotInCache):
+            self.cache.get('a')
+
+    def test_different_rows(self):
+        self.cache.set('value', 'a')
+
+        with pytest.raises(NotInCache):
+            ModelMemoizing(self.model(pk=6, modified=self.now), 'foo').get('a')
+
+    def test_unsaved(self):
+        cache = ModelMemoizing(self.model(), 'foo')
+
+        assert cache.set('value', 'a') == 'value'
+        with pytest.raises(NotInCache):
+            cache.get('a')
+        with pytest.raises(NotInCache):
+            cache.delete('a')
+
+
+class TestModelMemoizeDecorator(object):
+    def setup_method(self, method):
+        caches['default'].clear()
+
+    def test_method(self):
+        model = get_model()
+        descriptor = model.__dict__['foo']
+        now = datetime(2018, 1, 1)
+
+        assert isinstance(descriptor, MemoizeDescriptor)
+        assert descriptor.cache_class is ModelMemoizing
+        assert descriptor.cache_options == {
+            'alias': 'default',
+            'namespace': (
+                'tests.models.test_cache.get_model.<locals>.MemoizedModel.foo'
+                if hasattr(get_model, '__qualname__') else
+                'tests.models.test_cache.foo'
+            ),
+            'timeout': 60,
+        }
+
+        assert model(pk=1, modified=now).foo('a') == 'a1'
+        assert model(pk=1, modified=now).foo('a') == 'a1'
+        assert model(pk=2, modified=now).foo('a') == 'a1'
+
+        instance = model(pk=1, modified=now + timedelta(seconds=1))
+        assert instance.foo('a') == 'a1'
+        assert instance.foo('a') == 'a1'
+        assert instance.foo('b') == 'b2'
+
+    def test_normalize(self):
+        class NormalizedModel(ModifiedModel):
+            class Meta(object):
+                app_label = str(random.randrange(1000, 2000))
+
+            @ModelMemoizeDecorator(normalize=True)
+            def foo(self, a, b=2):
+                self.counter = getattr(self, 'counter', 0) + 1
+                return self.counter
+
+        instance = NormalizedModel(pk=1, modified=datetime(2018, 1, 1))
+
+        assert instance.foo(1) == 1
+        assert instance.foo(1, b=2) == 1
+        assert instance.foo(a=1, b=2) == 1
+        assert instance.foo(1, 3) == 2
+
+    def test_unsaved(self):
+        instance = get_model()()
+
+        assert instance.foo('a') == 'a1'
+        assert instance.foo('a') == 'a2'
+
+    def test_function(self):
+        with pytest.raises(TypeError):
+            @ModelMemoizeDecorator()
+            def foo(a):
+                return a
+
+    def test_tiered(self):
+        with pytest.raises(ValueError):
+            ModelMemoizeDecorator(tiered=True)
+
+
+class TestBatchCacheQuerySet(object):
+    def get_model(self):
+        class BatchModel(models.Model):
+            class Meta(object):
+                app_label = str(random.randrange(1000, 2000))
+
+            objects = BatchCacheManager()
+
+        return BatchModel
+
+    def test_fetch_all(self):
+        model = self.get_model()
+        instances = [model(pk=1), model(pk=2)]
+        queryset = model.objects.all()
+        queryset.groups = BatchGroups()
+
+        def fetch_all(qs):
+            qs._result_cache = list(instances)
+
+        with mock.patch.object(models.QuerySet, '_fetch_all', autospec=True,
+                               side_effect=fetch_all):
+            assert list(queryset) == instances
+
+        assert queryset.groups.get(instances[1]) == instances
+
+    def test_fetch_all_not_models(self):
+        queryset = self.get_model().objects.all()
+        queryset.groups = mock.MagicMock()
+
+        def fetch_all(qs):
+            qs._result_cache = [{'pk': 1}]
+
+        with mock.patch.object(models.QuerySet, '_fetch_all', autospec=True,
+                               side_effect=fetch_all):
+            assert list(queryset) == [{'pk': 1}]
+
+        assert not queryset.groups.register.called
+
+    def test_fetch_all_already_fetched(self):
+        queryset = self.get_model().objects.all()
+        queryset.groups = mock.MagicMock()
+        queryset._result_cache = []
+
+        assert list(queryset) == []
+        assert not queryset.groups.register.called
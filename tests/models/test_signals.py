@@ -5,10 +5,13 @@ import mock
 import pytest
 from dirtyfields import DirtyFieldsMixin
 from django.core.files.base import ContentFile
-from django.db import models
+from django.db import connection, models
 from django.test import TestCase
 
+from django_auxilium.utils.functools import cache_method, cache_property, memoize
+
 from django_auxilium.models import (
+    AutoCacheInvalidation,
     AutoSignals,
     FieldSpec,
     FileFieldAutoChangeDelete,
@@ -464,3 +467,199 @@ class TestAutoSignals(object):
             receiver=foo_pre_save,
             weak=False,
         )
+
+
+class EmptyMixin(object):
+    pass
+
+
+class TestAutoCacheInvalidation(object):
+    def get_model(self, mixin=EmptyMixin):
+        class Model(mixin, models.Model):
+            price = models.IntegerField(default=2)
+            quantity = models.IntegerField(default=3)
+            name = models.CharField(max_length=32, default='foo')
+
+            class Meta(object):
+                app_label = str(random.randrange(1000, 2000))
+
+            @cache_property
+            def total(self):
+                return self.price * self.quantity
+
+            @cache_property(in_dict=True)
+            def total_dict(self):
+                return self.price * self.quantity
+
+            @cache_method
+            def label(self):
+                return self.name
+
+            @memoize
+            def multiply(self, x):
+                return self.price * x
+
+        return Model
+
+    def decorate(self, model, **kwargs):
+        decorator = AutoCacheInvalidation(**kwargs)
+        with mock.patch.object(AutoSignals, 'connect_signal'):
+            decorator(model)
+        return decorator
+
+    def prime(self, instance):
+        return [instance.total, instance.total_dict, instance.label(), instance.multiply(2)]
+
+    def test_validate_model_not_class(self):
+        decorator = AutoCacheInvalidation()
+        decorator.to_wrap = None
+
+        with pytest.raises(TypeError):
+            decorator.validate_model()
+
+    def test_validate_model_not_django_model(self):
+        decorator = AutoCacheInvalidation()
+        decorator.to_wrap = int
+
+        with pytest.raises(TypeError):
+            decorator.validate_model()
+
+    def test_validate_model_invalid_fields(self):
+        decorator = AutoCacheInvalidation(fields={'price': ['price']})
+        decorator.to_wrap = self.get_model()
+
+        with pytest.raises(AttributeError):
+            decorator.validate_model()
+
+    def test_get_signals(self):
+        decorator = AutoCacheInvalidation()
+        decorator.to_wrap = self.get_model()
+
+        signals = decorator.get_signals()
+
+        assert [i['receiver'].__name__ for i in signals] == ['post_save', 'post_delete']
+        assert signals[0]['dispatch_uid'] == (
+            'post_save_{0.app_label}.{0.model_name}_clear_caches'.format(decorator.to_wrap._meta)
+        )
+        assert all(not i['weak'] for i in signals)
+
+    def test_get_signals_tracks_changes(self):
+        decorator = AutoCacheInvalidation()
+        decorator.to_wrap = self.get_model(DirtyFieldsMixin)
+
+        signals = decorator.get_signals()
+
+        assert [i['receiver'].__name__ for i in signals] == ['pre_save', 'post_save', 'post_delete']
+
+    def test_connect_signals(self):
+        model = self.get_model()
+        decorator = AutoCacheInvalidation()
+
+        with mock.patch.object(AutoSignals, 'connect_signal') as mock_connect_signal:
+            assert decorator(model) is model
+
+        assert mock_connect_signal.call_count == 2
+
+    def test_clear_caches(self):
+        model = self.get_model()
+        decorator = self.decorate(model)
+        instance = model()
+
+        assert decorator.clear_caches(instance) == []
+
+        self.prime(instance)
+
+        assert decorator.clear_caches(instance) == ['total', 'total_dict', 'label', 'multiply']
+        assert 'total_dict' not in instance.__dict__
+
+    def test_clear_caches_changed_fields(self):
+        model = self.get_model()
+        decorator = self.decorate(model, fields={
+            'total': ['price', 'quantity'],
+            'label': ['name'],
+        })
+        instance = model()
+        self.prime(instance)
+
+        assert decorator.clear_caches(instance, {'price'}) == ['total', 'total_dict', 'multiply']
+        assert instance.label() == 'foo'
+
+    def test_post_save(self):
+        model = self.get_model()
+        decorator = self.decorate(model, fields={'label': ['name']})
+        post_save = decorator.get_signals()[0]['receiver']
+        instance = model()
+        self.prime(instance)
+        instance.price = 5
+
+        post_save(model, instance, update_fields=['price'])
+
+        assert instance.total == 15
+        assert decorator.clear_caches(instance) == ['total', 'label']
+
+    def test_pre_post_save_dirty_fields(self):
+        model = self.get_model(DirtyFieldsMixin)
+        decorator = self.decorate(model, fields={'total': ['price', 'quantity']})
+        pre_save, post_save, post_delete = [i['receiver'] for i in decorator.get_signals()]
+        instance = model()
+        self.prime(instance)
+
+        with mock.patch.object(model, 'get_dirty_fields', return_value={'name': 'bar'}):
+            pre_save(model, instance)
+        post_save(model, instance)
+
+        assert len(decorator.changed_fields) == 0
+        assert decorator.clear_caches(instance) == ['total']
+
+    def test_post_delete(self):
+        model = self.get_model()
+        decorator = self.decorate(model, fields={'total': ['price']})
+        post_delete = decorator.get_signals()[1]['receiver']
+        instance = model()
+        self.prime(instance)
+
+        post_delete(model, instance)
+
+        assert decorator.clear_caches(instance) == []
+
+    def test_refresh_from_db(self):
+        model = self.get_model()
+        with mock.patch.object(model, 'refresh_from_db') as mock_refresh_from_db:
+            decorator = self.decorate(model, fields={'label': ['name']})
+            instance = model()
+            self.prime(instance)
+
+            instance.refresh_from_db(fields=['price'])
+
+            mock_refresh_from_db.assert_called_once_with(instance, None, ['price'])
+            assert decorator.clear_caches(instance) == ['label']
+
+            self.prime(instance)
+            instance.refresh_from_db()
+
+            assert decorator.clear_caches(instance) == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_refresh_from_db_deferred(self):
+        model = self.get_model()
+        decorator = self.decorate(model, fields={'total': ['price', 'quantity']})
+        with connection.schema_editor() as editor:
+            editor.create_model(model)
+
+        try:
+            model.objects.create()
+
+            instance = model.objects.defer('price').get()
+            instance.label()
+            # loading deferred field does not change anything
+            assert instance.price == 2
+            assert decorator.clear_caches(instance) == ['label']
+
+            instance = model.objects.only('name').get()
+            instance.label()
+            assert instance.quantity == 3
+            instance.refresh_from_db(fields=['price', 'name'])
+            assert decorator.clear_caches(instance) == []
+        finally:
+            with connection.schema_editor() as editor:
+                editor.delete_model(model)
@@ -1,24 +1,99 @@
 from __future__ import absolute_import, print_function
-import types
+import copy
+import logging
+import pickle
+import random
+import sys
+import threading
+import time
+import zlib
 from functools import partial
 
+import mock
 import pytest
+from django.core.cache import caches
+from django.db import connections, models
 
 from django_auxilium.utils.functools.cache import (
+    BoundCacheMethod,
     CacheDecorator,
     CacheDescriptor,
+    CacheDescriptorRegistry,
+    CacheEntry,
+    CachedException,
+    CallSignature,
+    CacheInfo,
+    CacheStats,
+    CacheStatsRegistry,
+    CacheNamespace,
     Caching,
+    DictCacheDescriptor,
+    ExcludeCacheStateMixin,
+    InstrumentedCache,
+    LRUStore,
     MemoizeDecorator,
     MemoizeDescriptor,
+    MemoizeKey,
     Memoizing,
+    NegativeCache,
+    NormalizedCache,
     NotInCache,
+    Revalidator,
+    SingleFlight,
+    StaleInCache,
+    TagIndex,
+    TaggedCache,
+    WeakIdKeyDictionary,
+    WeakMemoizeDecorator,
+    WeakMemoizing,
+    cache_property,
+    cache_method,
+    cache_descriptor_registry,
+    cached_attributes,
+    cache_revalidator,
+    cache_stats_registry,
+    cache_tag_index,
+    catch_exceptions,
+    clear_caches,
+    deep_getsizeof,
+    get_cache_descriptors,
+    get_qualified_name,
+    invalidate_tags,
+    memoize,
 )
+from django_auxilium.utils.functools.cache_django import DjangoMemoizing, TieredMemoizing
+from django_auxilium.utils.functools.cache_sqlite import SQLiteMemoizing
 
 
 class Bunch(object):
     pass
 
 
+class Slotted(object):
+    __slots__ = ('cache', '__weakref__')
+
+
+@memoize
+def square(x):
+    if x < 0:
+        raise ValueError(x)
+    return x * x
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class Tagged(object):
+    @MemoizeDecorator(maxsize=2, stats=True, tags=['pickled'])
+    def foo(self, a):
+        return a
+
+
 class TestCaching(object):
     def setup_method(self, method):
         self.object = Bunch()
@@ -47,19 +122,344 @@ class TestCaching(object):
         assert self.cache.set('foo') == 'foo'
         assert self.object.cache == 'foo'
 
+    def test_ttl(self):
+        clock = Clock()
+        cache = Caching(self.object, 'cache', ttl=10, clock=clock)
+
+        assert cache.set('foo') == 'foo'
+        assert self.object.cache == CacheEntry('foo', 10)
+        clock.now = 9
+        assert cache.get() == 'foo'
+
+        clock.now = 10
+        with pytest.raises(NotInCache):
+            cache.get()
+        assert not hasattr(self.object, 'cache')
+
+    def test_ttl_delete_expired(self):
+        clock = Clock()
+        cache = Caching(self.object, 'cache', ttl=10, clock=clock)
+        cache.set('foo')
+        clock.now = 10
+
+        with pytest.raises(NotInCache):
+            cache.delete()
+        assert not hasattr(self.object, 'cache')
+
+    def test_stale_while_revalidate(self):
+        clock = Clock()
+        cache = Caching(self.object, 'cache', ttl=10, clock=clock, stale_while_revalidate=5)
+        cache.set('foo')
+
+        clock.now = 10
+        with pytest.raises(StaleInCache) as e:
+            cache.get()
+        assert e.value.value == 'foo'
+        assert hasattr(self.object, 'cache')
+
+        clock.now = 15
+        with pytest.raises(NotInCache) as e:
+            cache.get()
+        assert not isinstance(e.value, StaleInCache)
+        assert not hasattr(self.object, 'cache')
+
+    def test_stale_while_revalidate_without_ttl(self):
+        with pytest.raises(ValueError):
+            Caching(self.object, 'cache', stale_while_revalidate=5)
+
+    def test_slots(self):
+        obj = Slotted()
+        cache = Caching(obj, 'cache')
+
+        with pytest.raises(NotInCache):
+            cache.get()
+        cache.set('foo')
+
+        assert obj.cache == 'foo'
+        assert cache.get() == 'foo'
+        assert cache.delete() == 'foo'
+        assert not hasattr(obj, 'cache')
+        with pytest.raises(NotInCache):
+            cache.delete()
+
+
+class TestLRUStore(object):
+    def test_unbounded(self):
+        store = LRUStore()
+        for i in range(100):
+            store[i] = i
+
+        assert len(store) == 100
+        assert store.evictions == 0
+
+    def test_evicts_least_recently_used(self):
+        store = LRUStore(2)
+        store['a'] = 1
+        store['b'] = 2
+        assert store['a'] == 1
+        store['c'] = 3
+
+        assert list(store.keys()) == ['a', 'c']
+        assert store.evictions == 1
+
+    def test_set_existing_marks_recently_used(self):
+        store = LRUStore(2)
+        store['a'] = 1
+        store['b'] = 2
+        store['a'] = 3
+        store['c'] = 4
+
+        assert dict(store) == {'a': 3, 'c': 4}
+        assert store.evictions == 1
+
+    def test_pop(self):
+        store = LRUStore(2)
+        store['a'] = 1
+
+        assert store.pop('a') == 1
+        assert store == {}
+
+    def test_stats(self):
+        stats = CacheStats('foo')
+        store = LRUStore(1, stats)
+        store['a'] = 1
+        store['b'] = 2
+
+        assert stats.evictions == 1
+
+    def test_max_bytes(self):
+        store = LRUStore(max_bytes=10, sizer=len)
+        store['a'] = 'aaaa'
+        store['b'] = 'bbbb'
+        assert store['a'] == 'aaaa'
+        store['c'] = 'cccc'
+
+        assert list(store.keys()) == ['a', 'c']
+        assert store.nbytes == 8
+        assert store.evictions == 1
+
+        store['a'] = 'a'
+        assert store.nbytes == 5
+
+    def test_max_bytes_too_large(self):
+        evicted = []
+        store = LRUStore(max_bytes=10, sizer=len, on_evict=evicted.append)
+        store['a'] = 'aaaa'
+        store['b'] = 'bbbb'
+        store['c'] = 'c' * 20
+
+        assert store == {'a': 'aaaa', 'b': 'bbbb'}
+        assert store.nbytes == 8
+        assert store.evictions == 1
+        assert evicted == ['c']
+
+        store['a'] = 'a' * 20
+        assert store == {'b': 'bbbb'}
+        assert store.nbytes == 4
+        assert store.evictions == 2
+        assert evicted == ['c', 'a']
+
+    def test_max_bytes_remove(self):
+        store = LRUStore(max_bytes=10, sizer=len)
+        for key in 'abcd':
+            store[key] = key * 2
+
+        assert store.pop('a') == 'aa'
+        assert store.pop('a', None) is None
+        del store['b']
+        with pytest.raises(KeyError):
+            del store['b']
+        assert store.nbytes == 4
+
+        assert store.popitem() == ('d', 'dd')
+        assert store.popitem(last=False) == ('c', 'cc')
+        with pytest.raises(KeyError):
+            store.popitem()
+        assert store.nbytes == 0
+
+        store['a'] = 'aa'
+        store.clear()
+        assert store.nbytes == 0
+        assert store.sizes == {}
+
+    def test_max_bytes_and_maxsize(self):
+        store = LRUStore(2, max_bytes=10, sizer=len)
+        for key in 'abc':
+            store[key] = key
+
+        assert list(store.keys()) == ['b', 'c']
+        assert store.nbytes == 2
+
+    def test_max_bytes_default_sizer(self):
+        store = LRUStore(max_bytes=10 ** 6)
+        store['a'] = [b'a' * 1000]
+
+        assert store.sizer is deep_getsizeof
+        assert store.nbytes > 1000
+
+    def test_copy(self):
+        store = LRUStore(2, max_bytes=10, sizer=len)
+        store['a'] = 'aa'
+        store['b'] = 'bb'
+        store['c'] = 'cc'
+
+        for other in (copy.copy(store), copy.deepcopy(store),
+                      pickle.loads(pickle.dumps(store))):
+            assert list(other.items()) == [('b', 'bb'), ('c', 'cc')]
+            assert other.nbytes == 4
+            assert other.evictions == 1
+            assert other.lock is not store.lock
+
+    def test_pickle_detached(self):
+        stats = CacheStats('foo')
+        evicted = []
+        store = LRUStore(
+            2, stats=stats, max_bytes=10, sizer=len,
+            on_evict=partial(TagIndex().discard, 1, 2),
+        )
+        store['a'] = 'aa'
+
+        other = pickle.loads(pickle.dumps(store))
+
+        assert list(other.items()) == [('a', 'aa')]
+        assert other.stats is None
+        assert other.on_evict is None
+
+        other.attach(stats, evicted.append)
+        for key in 'bc':
+            other[key] = key * 2
+
+        assert evicted == ['a']
+        assert stats.evictions == 1
+        assert stats.nbytes == 6
+
+    def test_threads(self):
+        @memoize(maxsize=8)
+        def foo(x):
+            return x
+
+        errors = []
+
+        def target():
+            try:
+                for _ in range(200):
+                    for i in range(32):
+                        assert foo(i) == i
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=target) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+
+
+class TestDeepGetsizeof(object):
+    def test_containers(self):
+        value = b'a' * 1000
+        size = sys.getsizeof(value)
+
+        assert deep_getsizeof([value]) > size
+        assert deep_getsizeof({'a': value}) > size
+        assert deep_getsizeof((value,)) > size
+        assert deep_getsizeof({value}) > size
+
+    def test_shared_counted_once(self):
+        value = b'a' * 1000
+
+        assert deep_getsizeof([value, value]) < 2 * sys.getsizeof(value)
+
+    def test_attributes(self):
+        obj = Bunch()
+        obj.value = b'a' * 1000
+
+        assert deep_getsizeof(obj) > sys.getsizeof(obj.value)
+
+    def test_cycles(self):
+        value = []
+        value.append(value)
+
+        assert deep_getsizeof(value) == sys.getsizeof(value)
+
+    def test_not_followed(self):
+        assert deep_getsizeof([Bunch]) == sys.getsizeof([Bunch]) + sys.getsizeof(Bunch)
+
+    def test_deeply_nested(self):
+        value = []
+        for _ in range(10000):
+            value = [value]
+
+        assert deep_getsizeof(value) > 10000
+
+
+class TestMemoizeKey(object):
+    def test_hash(self):
+        key = MemoizeKey(('foo', 5))
+
+        assert key == ['foo', 5]
+        assert hash(key) == hash(('foo', 5))
+        assert {key: 'foo'}[MemoizeKey(('foo', 5))] == 'foo'
+
+    def test_unhashable(self):
+        with pytest.raises(TypeError):
+            MemoizeKey(('foo', []))
+
 
 class TestMemoizing(object):
     def setup_method(self, method):
         self.object = Bunch()
         self.cache = Memoizing(self.object, 'cache')
-        self.key = "('foo',)[]"
+        self.key = 'foo'
 
     def test_get_key(self):
-        assert self.cache._get_key('foo') == "('foo',)[]"
-        assert self.cache._get_key('foo', 'bar') == "('foo', 'bar')[]"
-        assert self.cache._get_key(foo='bar') == "()[('foo', 'bar')]"
-        assert self.cache._get_key(foo='bar', hello='there') == "()[('foo', 'bar'), ('hello', 'there')]"
-        assert self.cache._get_key('foo', foo='bar') == "('foo',)[('foo', 'bar')]"
+        mark = Memoizing.kwargs_mark
+
+        assert self.cache._get_key('foo') == 'foo'
+        assert self.cache._get_key(5) == 5
+        assert self.cache._get_key(5.0) == MemoizeKey((5.0,))
+        assert self.cache._get_key('foo', 'bar') == MemoizeKey(('foo', 'bar'))
+        assert self.cache._get_key(foo='bar') == MemoizeKey(mark + (('foo', 'bar'),))
+        assert self.cache._get_key(foo='bar', hello='there') == self.cache._get_key(hello='there', foo='bar')
+        assert self.cache._get_key('foo', foo='bar') == MemoizeKey(('foo',) + mark + (('foo', 'bar'),))
+        assert self.cache._get_key('foo') != self.cache._get_key(foo='foo')
+
+    def test_get_key_unhashable(self):
+        key = self.cache._get_key(['foo'], foo={'bar': 5})
+
+        assert key == Memoizing.unhashable_mark + ("(['foo'],)", "[('foo', {'bar': 5})]")
+        assert key == self.cache._get_key(['foo'], foo={'bar': 5})
+        assert key != self.cache._get_key(repr(key))
+
+    def test_get_key_typed(self):
+        cache = Memoizing(self.object, 'cache', typed=True)
+
+        assert cache._get_key(1) != cache._get_key(1.0)
+        assert cache._get_key(a=1) != cache._get_key(a=1.0)
+        assert cache._get_key(1) == cache._get_key(1)
+        assert self.cache._get_key('a', 1) == self.cache._get_key('a', 1.0)
+        assert cache._get_key('a', 1) != cache._get_key('a', 1.0)
+
+    def test_get_key_typed_unhashable(self):
+        class List(list):
+            pass
+
+        cache = Memoizing(self.object, 'cache', typed=True)
+
+        assert self.cache._get_key([1], a=[2]) == self.cache._get_key(List([1]), a=List([2]))
+        assert cache._get_key([1]) != cache._get_key(List([1]))
+        assert cache._get_key(a=[1]) != cache._get_key(a=List([1]))
+        assert cache._get_key([1], a=[2]) == cache._get_key([1], a=[2])
+
+    def test_get_key_custom(self):
+        cache = Memoizing(self.object, 'cache', key=lambda a, b=None: a)
+
+        assert cache._get_key('foo', b=5) == 'foo'
+
+        cache.set('foo', 'a', b=1)
+        assert cache.get('a', b=2) == 'foo'
 
     def test_get_not_present(self):
         with pytest.raises(NotInCache):
@@ -83,6 +483,844 @@ class TestMemoizing(object):
     def test_set(self):
         assert self.cache.set('foo', 'foo') == 'foo'
         assert self.object.cache == {self.key: 'foo'}
+        assert type(self.object.cache) is dict
+
+    def test_set_maxsize(self):
+        cache = Memoizing(self.object, 'cache', maxsize=2)
+
+        cache.set('foo', 'foo')
+        cache.set('bar', 'bar')
+        cache.set('haha', 'haha')
+
+        assert isinstance(self.object.cache, LRUStore)
+        assert len(self.object.cache) == 2
+        assert cache.evictions == 1
+        with pytest.raises(NotInCache):
+            cache.get('foo')
+        assert cache.get('haha') == 'haha'
+
+    def test_set_max_bytes(self):
+        cache = Memoizing(self.object, 'cache', max_bytes=10, sizer=len)
+
+        assert cache.nbytes == 0
+        cache.set('foo', 'foo')
+        cache.set('bar', 'bar')
+        cache.set('hahaha', 'haha')
+
+        assert isinstance(self.object.cache, LRUStore)
+        assert self.object.cache.maxsize is None
+        assert cache.nbytes == 9
+        assert cache.evictions == 1
+        with pytest.raises(NotInCache):
+            cache.get('foo')
+
+        assert cache.delete('haha') == 'hahaha'
+        assert cache.nbytes == 3
+
+    def test_evictions_no_store(self):
+        assert self.cache.evictions == 0
+
+    def test_ttl(self):
+        clock = Clock()
+        cache = Memoizing(self.object, 'cache', ttl=10, clock=clock)
+
+        cache.set('foo', 'foo')
+        clock.now = 5
+        cache.set('bar', 'bar')
+
+        assert self.object.cache[self.key] == CacheEntry('foo', 10)
+        clock.now = 10
+        with pytest.raises(NotInCache):
+            cache.get('foo')
+        assert cache.get('bar') == 'bar'
+        assert self.key not in self.object.cache
+
+        clock.now = 15
+        with pytest.raises(NotInCache):
+            cache.delete('bar')
+        assert self.object.cache == {}
+
+    def test_stale_while_revalidate(self):
+        clock = Clock()
+        cache = Memoizing(self.object, 'cache', ttl=10, clock=clock, stale_while_revalidate=5)
+        cache.set('foo', 'foo')
+
+        clock.now = 14
+        with pytest.raises(StaleInCache) as e:
+            cache.get('foo')
+        assert e.value.value == 'foo'
+        assert self.key in self.object.cache
+
+        clock.now = 15
+        with pytest.raises(NotInCache):
+            cache.get('foo')
+        assert self.key not in self.object.cache
+
+
+class TestWeakIdKeyDictionary(object):
+    def test_identity(self):
+        d = WeakIdKeyDictionary()
+        a, b = Bunch(), Bunch()
+        d[a] = 'a'
+
+        assert d[a] == 'a'
+        assert a in d
+        assert b not in d
+        assert d.get(b, 'default') == 'default'
+        with pytest.raises(KeyError):
+            d[b]
+
+    def test_unhashable(self):
+        class Unhashable(object):
+            __hash__ = None
+
+        d = WeakIdKeyDictionary()
+        obj = Unhashable()
+        d[obj] = 'foo'
+
+        assert d[obj] == 'foo'
+
+    def test_weak(self):
+        d = WeakIdKeyDictionary()
+        obj = Bunch()
+        d[obj] = 'foo'
+
+        assert len(d) == 1
+        del obj
+        assert len(d) == 0
+
+    def test_replaced_key_does_not_remove_new_entry(self):
+        d = WeakIdKeyDictionary()
+        obj = Bunch()
+        d[obj] = 'foo'
+        d[obj] = 'bar'
+
+        assert len(d) == 1
+        assert d[obj] == 'bar'
+
+    def test_delete(self):
+        d = WeakIdKeyDictionary()
+        obj = Bunch()
+
+        assert d.setdefault(obj, 'foo') == 'foo'
+        assert d.setdefault(obj, 'bar') == 'foo'
+        assert d.pop(obj) == 'foo'
+        assert d.pop(obj, None) is None
+        with pytest.raises(KeyError):
+            d.pop(obj)
+
+        d[obj] = 'foo'
+        del d[obj]
+
+        assert obj not in d
+        with pytest.raises(KeyError):
+            del d[obj]
+
+
+class TestWeakMemoizing(object):
+    def setup_method(self, method):
+        self.parent = Bunch()
+        self.cache = WeakMemoizing(self.parent, 'cache', maxsize=2)
+
+    def test_get_not_present(self):
+        with pytest.raises(NotInCache):
+            self.cache.get(Bunch(), 'a')
+
+    def test_set_get(self):
+        a, b = Bunch(), Bunch()
+
+        assert self.cache.set('foo', a, 'x') == 'foo'
+        assert self.cache.get(a, 'x') == 'foo'
+        with pytest.raises(NotInCache):
+            self.cache.get(a, 'y')
+        with pytest.raises(NotInCache):
+            self.cache.get(b, 'x')
+
+    def test_object_cache_options(self):
+        obj = Bunch()
+        cache = self.cache._get_object_cache(obj, create=True)
+
+        assert isinstance(cache, Memoizing)
+        assert isinstance(cache.parent, CacheNamespace)
+        assert cache.maxsize == 2
+
+    def test_delete(self):
+        obj = Bunch()
+        self.cache.set('foo', obj, 'x')
+
+        assert self.cache.delete(obj, 'x') == 'foo'
+        with pytest.raises(NotInCache):
+            self.cache.delete(obj, 'x')
+        with pytest.raises(NotInCache):
+            self.cache.delete(Bunch(), 'x')
+
+    def test_key(self):
+        a, b = Bunch(), Bunch()
+
+        assert self.cache._get_key(a, 'x') == (id(a), 'x')
+        assert self.cache._get_key(a, 'x') != self.cache._get_key(b, 'x')
+
+    def test_weak(self):
+        obj = Bunch()
+        self.cache.set('foo', obj, 'x')
+
+        assert len(self.parent.cache) == 1
+        del obj
+        assert len(self.parent.cache) == 0
+
+    def test_not_weakrefable(self):
+        with pytest.raises(TypeError):
+            self.cache.set('foo', 5)
+
+
+class TestCacheStats(object):
+    def test_info(self):
+        stats = CacheStats('foo')
+        stats.hits += 2
+        stats.misses += 1
+
+        assert stats.info() == CacheInfo(
+            hits=2, misses=1, evictions=0, pops=0, compute_time=0., nbytes=0,
+        )
+
+    def test_clear(self):
+        stats = CacheStats('foo')
+        stats.hits += 2
+        stats.compute_time += 1.
+        stats.clear()
+
+        assert stats.info() == (0, 0, 0, 0, 0., 0)
+
+    def test_nbytes(self):
+        stats = CacheStats('foo')
+        store = LRUStore(stats=stats, max_bytes=100, sizer=len)
+        other = LRUStore(stats=stats, max_bytes=100, sizer=len)
+        store['a'] = 'a' * 10
+        other['a'] = 'a' * 20
+
+        assert stats.nbytes == 30
+        assert stats.info().nbytes == 30
+
+        stats.clear()
+        assert stats.nbytes == 30
+
+        del other
+        assert stats.nbytes == 10
+
+    def test_timed(self):
+        stats = CacheStats('foo')
+
+        def foo(a):
+            time.sleep(0.01)
+            return a
+
+        assert stats.timed(foo)('a') == 'a'
+        assert stats.compute_time > 0
+
+    def test_timed_exception(self):
+        stats = CacheStats('foo')
+
+        def foo():
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            stats.timed(foo)()
+        assert stats.compute_time > 0
+
+
+class TestCacheStatsRegistry(object):
+    def test_register(self):
+        registry = CacheStatsRegistry()
+        foo = registry.register(CacheStats('foo'))
+        bar = registry.register(CacheStats('bar'))
+        foo.hits += 1
+
+        assert list(registry) == [bar, foo]
+        assert registry.dump() == {
+            'foo': CacheInfo(1, 0, 0, 0, 0., 0),
+            'bar': CacheInfo(0, 0, 0, 0, 0., 0),
+        }
+
+        registry.clear()
+
+        assert foo.hits == 0
+
+    def test_weak(self):
+        registry = CacheStatsRegistry()
+        registry.register(CacheStats('foo'))
+
+        assert list(registry) == []
+
+
+class TestInstrumentedCache(object):
+    def setup_method(self, method):
+        self.stats = CacheStats('foo')
+        self.cache = InstrumentedCache(Memoizing(Bunch(), 'foo'), self.stats)
+
+    def test_get(self):
+        with pytest.raises(NotInCache):
+            self.cache.get('a')
+        self.cache.set('value', 'a')
+
+        assert self.cache.get('a') == 'value'
+        assert (self.stats.hits, self.stats.misses) == (1, 1)
+
+    def test_delete(self):
+        self.cache.set('value', 'a')
+
+        assert self.cache.delete('a') == 'value'
+        assert self.stats.pops == 1
+
+        with pytest.raises(NotInCache):
+            self.cache.delete('a')
+        assert self.stats.pops == 1
+
+    def test_get_stale(self):
+        clock = Clock()
+        cache = InstrumentedCache(
+            Memoizing(Bunch(), 'foo', ttl=5, clock=clock, stale_while_revalidate=5), self.stats,
+        )
+        cache.set('value', 'a')
+        clock.now = 5
+
+        with pytest.raises(StaleInCache):
+            cache.get('a')
+        assert (self.stats.hits, self.stats.misses) == (1, 0)
+
+    def test_proxy(self):
+        assert self.cache.attr == 'foo'
+        assert self.cache.evictions == 0
+
+
+class TagSource(object):
+    def __init__(self):
+        self.invalidated = []
+
+    def get_tags(self, owner, *args, **kwargs):
+        return ['foo']
+
+    def invalidate(self, owner, *args, **kwargs):
+        self.invalidated.append((owner, args, kwargs))
+        if args == ('missing',):
+            raise NotInCache
+
+
+class TestTagIndex(object):
+    def setup_method(self, method):
+        self.index = TagIndex()
+        self.source = TagSource()
+        self.owner = Bunch()
+
+    def test_register_no_tags(self):
+        self.index.register([], self.source, self.owner, None, (), {})
+
+        assert len(self.index) == 0
+
+    def test_invalidate(self):
+        self.index.register(['a', 'b'], self.source, self.owner, 1, (1,), {})
+        self.index.register(['b'], self.source, self.owner, 2, (2,), {'x': 1})
+        self.index.register(['c'], self.source, self.owner, 3, (3,), {})
+
+        assert self.index.invalidate('b') == 2
+        assert sorted(self.source.invalidated, key=lambda i: i[1]) == [
+            (self.owner, (1,), {}),
+            (self.owner, (2,), {'x': 1}),
+        ]
+        # popped values are removed from all their tags
+        assert set(self.index.tags) == {'c'}
+        assert list(self.index.entries) == [(id(self.source), id(self.owner), 3)]
+
+    def test_invalidate_deduplicates(self):
+        self.index.register(['a'], self.source, self.owner, 1, (1,), {})
+        self.index.register(['a'], self.source, self.owner, 1, (1,), {})
+        self.index.register(['b'], self.source, self.owner, 1, (1,), {})
+
+        assert self.index.invalidate('a', 'b') == 1
+
+    def test_invalidate_not_in_cache(self):
+        self.index.register(['a'], self.source, self.owner, 1, ('missing',), {})
+
+        assert self.index.invalidate('a') == 0
+        assert len(self.source.invalidated) == 1
+
+    def test_register_replaces(self):
+        self.index.register(['a', 'b'], self.source, self.owner, 1, (1,), {})
+        self.index.register(['b', 'c'], self.source, self.owner, 1, (1,), {})
+
+        assert set(self.index.tags) == {'b', 'c'}
+
+        self.index.register([], self.source, self.owner, 1, (1,), {})
+
+        assert len(self.index) == 0
+        assert self.index.owners == {}
+
+    def test_discard(self):
+        self.index.register(['a'], self.source, self.owner, 1, (1,), {})
+        self.index.register(['a'], self.source, self.owner, 2, (2,), {})
+        self.index.discard(id(self.source), id(self.owner), 1)
+        self.index.discard(id(self.source), id(self.owner), 'missing')
+
+        assert list(self.index.tags['a']) == [(id(self.source), id(self.owner), 2)]
+
+        self.index.discard(id(self.source), id(self.owner), 2)
+
+        assert len(self.index) == 0
+        assert self.index.entries == {}
+        assert self.index.owners == {}
+
+    def test_owner_single_reference(self):
+        self.index.register(['a'], self.source, self.owner, 1, (1,), {})
+        ref = self.index.owners[id(self.owner)][0]
+        self.index.register(['a'], self.source, self.owner, 2, (2,), {})
+
+        assert self.index.owners[id(self.owner)][0] is ref
+        assert ref.__callback__ is self.index.collect
+
+    def test_owner_collected(self):
+        self.index.register(['a'], self.source, self.owner, 1, (1,), {})
+        self.index.register(['a'], self.source, Bunch(), 1, (1,), {})
+
+        assert len(self.index.tags['a']) == 1
+
+        self.owner = None
+
+        assert len(self.index) == 0
+        assert self.index.entries == {}
+        assert self.index.owners == {}
+
+    def test_pickle(self):
+        self.index.register(['a'], self.source, self.owner, 1, (1,), {})
+        discard = pickle.loads(pickle.dumps(partial(self.index.discard, 1, 2)))
+
+        for index in (discard.func.__self__, copy.copy(self.index),
+                      copy.deepcopy(self.index), pickle.loads(pickle.dumps(self.index))):
+            assert len(index) == 0
+            assert index.lock is not self.index.lock
+
+            index.register(['a'], self.source, self.owner, 1, (1,), {})
+            assert index.invalidate('a') == 1
+
+        assert len(self.index) == 1
+
+
+class TestTaggedCache(object):
+    def test_set(self):
+        index = TagIndex()
+        source = TagSource()
+        owner = Bunch()
+        cache = TaggedCache(Memoizing(owner, 'cache'), index, source, owner)
+
+        assert cache.set('value', 'a') == 'value'
+        assert cache.get('a') == 'value'
+        assert cache.attr == 'cache'
+        assert list(index.tags['foo'].values())[0].args == ('a',)
+
+        assert cache.delete('a') == 'value'
+        assert len(index) == 0
+        with pytest.raises(NotInCache):
+            cache.get('a')
+        with pytest.raises(NotInCache):
+            cache.delete('a')
+
+    def test_expired(self):
+        index = TagIndex()
+        owner = Bunch()
+        clock = Clock()
+        cache = TaggedCache(
+            Memoizing(owner, 'cache', ttl=5, clock=clock), index, TagSource(), owner,
+        )
+        cache.set('value', 'a')
+        clock.now = 5
+
+        with pytest.raises(NotInCache):
+            cache.get('a')
+        assert len(index) == 0
+
+    def test_evicted(self):
+        index = TagIndex()
+        owner = Bunch()
+        cache = TaggedCache(Memoizing(owner, 'cache', maxsize=2), index, TagSource(), owner)
+
+        for i in range(5):
+            cache.set(i, i)
+
+        assert sorted(i[2] for i in index.tags['foo']) == [3, 4]
+
+    def test_pickle(self):
+        foo = Tagged()
+        for i in range(2):
+            foo.foo(i)
+
+        other = pickle.loads(pickle.dumps(foo))
+        for i in range(2, 5):
+            assert other.foo(i) == i
+
+        assert list(getattr(other, Tagged.__dict__['foo'].cache_attribute)) == [3, 4]
+        assert Tagged.__dict__['foo'].cache_info().evictions == 3
+        assert sorted(i[2] for i in cache_tag_index.tags['pickled']) == [0, 1, 3, 4]
+        assert invalidate_tags('pickled') == 4
+
+    def test_bounded(self):
+        @MemoizeDecorator(maxsize=10, tags=['bounded'])
+        def foo(a):
+            return a
+
+        for i in range(1000):
+            foo(i)
+
+        assert len(foo.decorator.cached_value) == 10
+        assert len(cache_tag_index.tags['bounded']) == 10
+        assert invalidate_tags('bounded') == 10
+        assert 'bounded' not in cache_tag_index.tags
+
+
+class TestCatchExceptions(object):
+    def test_catch(self):
+        error = ValueError('foo')
+
+        def f(a):
+            if a:
+                raise error
+            raise TypeError
+
+        wrapped = catch_exceptions(f, (ValueError,))
+
+        assert wrapped(True) == CachedException(error, None)
+        with pytest.raises(TypeError):
+            wrapped(False)
+
+
+class TestNegativeCache(object):
+    def setup_method(self, method):
+        self.clock = Clock()
+        self.object = Bunch()
+        self.cache = NegativeCache(Memoizing(self.object, 'cache', clock=self.clock), 5)
+        self.error = ValueError('foo')
+
+    def test_value(self):
+        assert self.cache.set('value', 'a') == 'value'
+        assert self.cache.get('a') == 'value'
+        assert self.cache.delete('a') == 'value'
+        assert self.cache.attr == 'cache'
+
+    def test_exception(self):
+        with pytest.raises(ValueError) as e:
+            self.cache.set(CachedException(self.error, None), 'a')
+        assert e.value is self.error
+        assert self.object.cache['a'] == CachedException(self.error, 5)
+
+        self.clock.now = 4
+        with pytest.raises(ValueError) as e:
+            self.cache.get('a')
+        assert e.value is not self.error
+        assert e.value.args == ('foo',)
+
+        self.clock.now = 5
+        with pytest.raises(NotInCache):
+            self.cache.get('a')
+        assert self.object.cache == {}
+
+    def get_traceback_depth(self, exception):
+        tb = getattr(exception, '__traceback__', None)
+        depth = 0
+        while tb is not None:
+            depth += 1
+            tb = tb.tb_next
+        return depth
+
+    def test_exception_traceback(self):
+        with pytest.raises(ValueError):
+            self.cache.set(CachedException(self.error, None), 'a')
+        depth = self.get_traceback_depth(self.error)
+
+        depths = []
+        for _ in range(3):
+            with pytest.raises(ValueError) as e:
+                self.cache.get('a')
+            depths.append(self.get_traceback_depth(e.value))
+
+        assert len(set(depths)) == 1
+        assert self.get_traceback_depth(self.error) == depth
+
+    @pytest.mark.skipif(sys.version_info < (3,), reason='exceptions have no __traceback__')
+    def test_exception_original_traceback(self):
+        def compute():
+            raise self.error
+
+        with pytest.raises(ValueError) as e:
+            self.cache.set(catch_exceptions(compute, (ValueError,))(), 'a')
+
+        assert e.value is self.error
+        assert 'compute' in [i.name for i in e.traceback]
+
+    def test_exception_delete(self):
+        with pytest.raises(ValueError):
+            self.cache.set(CachedException(self.error, None), 'a')
+
+        assert self.cache.delete('a') is None
+        assert self.object.cache == {}
+        with pytest.raises(NotInCache):
+            self.cache.delete('a')
+
+    def test_exception_stale(self):
+        cache = NegativeCache(
+            Memoizing(self.object, 'cache', ttl=5, clock=self.clock, stale_while_revalidate=5),
+            10,
+        )
+        with pytest.raises(ValueError):
+            cache.set(CachedException(self.error, None), 'a')
+        cache.set('value', 'b')
+        self.clock.now = 5
+
+        with pytest.raises(NotInCache) as e:
+            cache.get('a')
+        assert not isinstance(e.value, StaleInCache)
+        with pytest.raises(StaleInCache):
+            cache.get('b')
+
+    def test_exception_tiered_wall_clock(self):
+        caches['default'].clear()
+        cache = NegativeCache(TieredMemoizing(self.object, 'cache', namespace='foo'), 5)
+
+        now = time.time()
+        with pytest.raises(ValueError):
+            cache.set(CachedException(self.error, None), 'a')
+
+        assert cache.clock is time.time
+        assert cache.l2.get('a').expires >= now + 5
+
+
+class TestCallSignature(object):
+    def setup_method(self, method):
+        def foo(a, b=2, *args, **kwargs):
+            pass
+
+        def bar(self, a, b=2):
+            pass
+
+        self.foo = CallSignature(foo)
+        self.bar = CallSignature(bar, skip=1)
+
+    def test_init(self):
+        assert self.foo.names == ('a', 'b')
+        assert self.foo.defaults == {'b': 2}
+        assert self.foo.has_varargs
+        assert self.foo.has_varkw
+        assert self.bar.names == ('a', 'b')
+        assert not self.bar.has_varargs
+        assert not self.bar.has_varkw
+
+    def test_bind(self):
+        expected = ((1, 2), {})
+
+        assert self.bar.bind((1, 2), {}) == expected
+        assert self.bar.bind((1,), {}) == expected
+        assert self.bar.bind((1,), {'b': 2}) == expected
+        assert self.bar.bind((), {'a': 1, 'b': 2}) == expected
+        assert self.bar.bind((), {'b': 2, 'a': 1}) == expected
+        assert self.bar.bind((), {'a': 1}) == expected
+
+    def test_bind_extra(self):
+        assert self.foo.bind((1, 2, 3), {'c': 4}) == ((1, 2, 3), {'c': 4})
+        assert self.foo.bind((1,), {'c': 4}) == ((1, 2), {'c': 4})
+
+    def test_bind_kwonly(self):
+        self.bar.kwonly = ('c',)
+        self.bar.kwonly_defaults = {'c': 3}
+
+        assert self.bar.bind((1, 2), {}) == ((1, 2), {'c': 3})
+        assert self.bar.bind((), {'a': 1, 'c': 4}) == ((1, 2), {'c': 4})
+
+        self.bar.kwonly_defaults = {}
+        assert self.bar.bind((1, 2), {}) == ((1, 2), {})
+
+    def test_bind_invalid(self):
+        assert self.bar.bind((), {}) == ((), {})
+        assert self.bar.bind((1, 2, 3), {}) == ((1, 2, 3), {})
+        assert self.bar.bind((1,), {'a': 1}) == ((1,), {'a': 1})
+        assert self.bar.bind((1,), {'c': 3}) == ((1,), {'c': 3})
+
+
+class TestNormalizedCache(object):
+    def setup_method(self, method):
+        def foo(a, b=2):
+            pass
+
+        self.object = Bunch()
+        self.cache = NormalizedCache(Memoizing(self.object, 'cache'), CallSignature(foo))
+
+    def test_cache(self):
+        assert self.cache.set('value', 1) == 'value'
+        assert self.cache.get(1, 2) == 'value'
+        assert self.cache.get(a=1, b=2) == 'value'
+        assert self.cache._get_key(1, b=2) == self.cache.cache._get_key(1, 2)
+        assert self.cache.attr == 'cache'
+        assert self.cache.delete(b=2, a=1) == 'value'
+        with pytest.raises(NotInCache):
+            self.cache.get(1)
+
+
+class TestInvalidateTags(object):
+    def test_across_functions(self):
+        @MemoizeDecorator(tags=lambda x: ['x:{0}'.format(x), 'all'])
+        def foo(x):
+            return object()
+
+        @CacheDecorator(tags=['all'])
+        def bar():
+            return object()
+
+        class Foo(object):
+            @MemoizeDecorator(tags=lambda self, x: ['x:{0}'.format(x)])
+            def foo(self, x):
+                return object()
+
+            @CacheDecorator(as_property=True, tags=['all'])
+            def bar(self):
+                return object()
+
+        f = Foo()
+        values = [foo(1), foo(2), bar(), f.foo(1), f.foo(2), f.bar]
+
+        assert invalidate_tags('x:1') == 2
+        assert foo(1) is not values[0]
+        assert f.foo(1) is not values[3]
+        assert foo(2) is values[1]
+        assert f.foo(2) is values[4]
+
+        assert invalidate_tags('all') == 4
+        assert foo(2) is not values[1]
+        assert bar() is not values[2]
+        assert f.bar is not values[5]
+
+        cache_tag_index.invalidate('x:1', 'x:2', 'all')
+
+    def test_in_dict_not_supported(self):
+        with pytest.raises(TypeError):
+            class Foo(object):
+                @CacheDecorator(as_property=True, in_dict=True, tags=['foo'])
+                def foo(self):
+                    return 'foo'
+
+
+class TestSingleFlight(object):
+    def setup_method(self, method):
+        self.flight = SingleFlight(stripes=4)
+        self.calls = []
+        self.release = threading.Event()
+
+    def run_concurrently(self, f, n=5):
+        results = []
+
+        def target():
+            try:
+                results.append(self.flight.run('key', f))
+            except ValueError as e:
+                results.append(e)
+
+        threads = [threading.Thread(target=target) for _ in range(n)]
+        for t in threads:
+            t.start()
+        # give all threads a chance to start waiting for the computation
+        time.sleep(0.1)
+        self.release.set()
+        for t in threads:
+            t.join()
+
+        return results
+
+    def test_run(self):
+        assert self.flight.run('key', lambda: 'foo') == 'foo'
+        assert all(not calls for _, calls in self.flight.stripes)
+
+    def test_run_concurrent(self):
+        def f():
+            self.calls.append(1)
+            self.release.wait()
+            return 'foo'
+
+        assert self.run_concurrently(f) == ['foo'] * 5
+        assert len(self.calls) == 1
+
+    def test_run_concurrent_exception(self):
+        error = ValueError('foo')
+
+        def f():
+            self.calls.append(1)
+            self.release.wait()
+            raise error
+
+        assert self.run_concurrently(f) == [error] * 5
+        assert len(self.calls) == 1
+        assert all(not calls for _, calls in self.flight.stripes)
+
+    def test_run_recursive(self):
+        def f():
+            self.calls.append(1)
+            if len(self.calls) < 3:
+                return self.flight.run('key', f)
+            return 'foo'
+
+        assert self.flight.run('key', f) == 'foo'
+        assert len(self.calls) == 3
+
+
+class TestRevalidator(object):
+    def setup_method(self, method):
+        self.revalidator = Revalidator(max_workers=2, max_pending=3)
+        self.release = threading.Event()
+        self.calls = []
+
+    def refresh(self, value):
+        def f():
+            self.release.wait()
+            self.calls.append(value)
+        return f
+
+    def test_submit(self):
+        assert self.revalidator.submit('a', self.refresh('a'))
+        assert not self.revalidator.submit('a', self.refresh('a'))
+        assert self.revalidator.submit('b', self.refresh('b'))
+        assert self.revalidator.submit('c', self.refresh('c'))
+        assert not self.revalidator.submit('d', self.refresh('d'))
+        assert len(self.revalidator) == 3
+        assert len(self.revalidator.workers) == 2
+
+        self.release.set()
+        self.revalidator.join()
+
+        assert sorted(self.calls) == ['a', 'b', 'c']
+        assert len(self.revalidator) == 0
+        assert self.revalidator.submit('a', self.refresh('a'))
+        self.revalidator.join()
+        assert len(self.revalidator.workers) == 2
+
+    def test_submit_exception(self):
+        def f():
+            raise ValueError
+
+        log = logging.getLogger(Revalidator.__module__)
+        with mock.patch.object(log, 'exception') as exception:
+            assert self.revalidator.submit('a', f)
+            self.revalidator.join()
+
+        assert exception.called
+        assert len(self.revalidator) == 0
+
+    def test_submit_close_connections_exception(self):
+        self.release.set()
+        log = logging.getLogger(Revalidator.__module__)
+
+        with mock.patch.object(connections, 'close_all', side_effect=ValueError):
+            with mock.patch.object(log, 'exception') as exception:
+                for _ in range(2):
+                    assert self.revalidator.submit('a', self.refresh('a'))
+                    self.revalidator.join()
+
+        assert exception.call_count == 2
+        assert self.calls == ['a', 'a']
+        assert len(self.revalidator) == 0
+        assert all(i.is_alive() for i in self.revalidator.workers)
 
 
 class TestCacheDescriptor(object):
@@ -105,7 +1343,9 @@ class TestCacheDescriptor(object):
         assert self.descriptor.method is self.bar
         assert self.descriptor.cache_class is Caching
         assert not self.descriptor.as_property
-        assert self.descriptor.cache_attribute.startswith('bar_cache_')
+        assert self.descriptor.cache_attribute == 'bar_cache_{0}'.format(
+            zlib.crc32(get_qualified_name(self.bar).encode('utf-8')) & 0xffffffff
+        )
 
     def test_get_cache(self):
         actual = self.descriptor.get_cache(self.instance)
@@ -154,22 +1394,122 @@ class TestCacheDescriptor(object):
     def test_get_class(self):
         assert self.klass.foo is self.bar
 
-    def test_get_instance(self):
-        assert isinstance(self.instance.foo, partial)
-        assert isinstance(self.instance.foo.func, types.MethodType)
-        assert self.instance.foo.func.__self__ is self.instance
+    def test_getter_lock(self):
+        release = threading.Event()
+        calls = []
 
-        assert isinstance(self.instance.foo.pop, partial)
-        assert isinstance(self.instance.foo.pop.func, types.MethodType)
-        assert self.instance.foo.pop.func.__self__ is self.instance
+        def bar(self):
+            calls.append(self)
+            release.wait()
+            return 'bar'
 
-        assert isinstance(self.instance.foo.push, partial)
-        assert isinstance(self.instance.foo.push.func, types.MethodType)
-        assert self.instance.foo.push.func.__self__ is self.instance
+        class Foo(object):
+            foo = CacheDescriptor(bar, lock=True)
+
+        instances = [Foo(), Foo()]
+        results = []
+        threads = [
+            threading.Thread(target=lambda i=i: results.append(i.foo()))
+            for i in instances * 3
+        ]
+        for t in threads:
+            t.start()
+        time.sleep(0.1)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert results == ['bar'] * 6
+        assert sorted(map(id, calls)) == sorted(map(id, instances))
+
+    def test_attribute(self):
+        descriptor = CacheDescriptor(self.bar, attribute='cache')
+
+        assert descriptor.cache_attribute == 'cache'
+
+    def test_slots(self):
+        class Foo(Slotted):
+            __slots__ = ()
+            foo = CacheDescriptor(self.bar, attribute='cache')
+
+        f = Foo()
+
+        assert f.foo() == 'bar'
+        assert f.cache == 'bar'
+        assert f.foo.pop() == 'bar'
+        assert not hasattr(f, 'cache')
+
+    def test_storage_weak(self):
+        class Foo(object):
+            __slots__ = ('__weakref__',)
+            foo = CacheDescriptor(self.bar, storage='weak')
 
-        assert self.instance.foo.__doc__ == self.bar.__doc__
+        descriptor = Foo.__dict__['foo']
+        f = Foo()
 
-        assert self.instance.foo() == 'bar'
+        assert f.foo() == 'bar'
+        parent = descriptor.get_cache_parent(f)
+        assert isinstance(parent, CacheNamespace)
+        assert getattr(parent, descriptor.cache_attribute) == 'bar'
+        assert descriptor.get_cache_parent(f) is parent
+
+        del f
+        assert len(descriptor.side_table) == 0
+
+    def test_clear(self):
+        descriptor = MemoizeDescriptor(self.bar)
+
+        assert not descriptor.clear(self.instance)
+
+        descriptor.push(self.instance, 'foo', 1)
+        descriptor.push(self.instance, 'bar', 2)
+
+        assert descriptor.clear(self.instance)
+        assert not hasattr(self.instance, descriptor.cache_attribute)
+
+    def test_clear_storage_weak(self):
+        descriptor = CacheDescriptor(self.bar, storage='weak')
+
+        assert not descriptor.clear(self.instance)
+        assert len(descriptor.side_table) == 0
+
+        descriptor.push(self.instance, 'foo')
+
+        assert descriptor.clear(self.instance)
+        with pytest.raises(NotInCache):
+            descriptor.pop(self.instance)
+
+    def test_storage_invalid(self):
+        with pytest.raises(ValueError):
+            CacheDescriptor(self.bar, storage='foo')
+
+    def test_get_instance(self):
+        f = self.instance.foo
+
+        assert isinstance(f, BoundCacheMethod)
+        assert isinstance(f, self.descriptor.bound_method_class)
+        assert f.descriptor is self.descriptor
+        assert f.instance is self.instance
+
+        assert f.__doc__ == self.bar.__doc__
+        assert f.__name__ == 'bar'
+        assert f.__wrapped__ is self.bar
+        assert f.__wrapped__(self.instance) == 'bar'
+        assert not hasattr(f, '__dict__')
+
+        assert f() == 'bar'
+        assert f.pop() == 'bar'
+        f.push('foo')
+        assert f() == 'foo'
+
+        assert not hasattr(f, 'cache_info')
+
+    def test_bound_method_class(self):
+        klass = self.descriptor.bound_method_class
+
+        assert issubclass(klass, BoundCacheMethod)
+        assert klass.__name__ == 'bar'
+        assert klass.__doc__ == self.bar.__doc__
 
     def test_delete(self):
         with pytest.raises(AttributeError):
@@ -213,6 +1553,371 @@ class TestCacheDescriptor(object):
         assert not hasattr(self.instance, self.descriptor.cache_attribute)
 
 
+class TestDictCacheDescriptor(object):
+    def setup_method(self, method):
+        self.counter = 0
+
+        def foo(instance):
+            """
+            hello world
+            """
+            self.counter += 1
+            return self.counter
+
+        self.method = foo
+
+        class Foo(object):
+            foo = DictCacheDescriptor(self.method)
+
+        self.klass = Foo
+        self.instance = Foo()
+        self.descriptor = Foo.__dict__['foo']
+
+    def test_init(self):
+        assert self.descriptor.method is self.method
+        assert self.descriptor.__doc__ == self.method.__doc__
+        assert self.descriptor.name == 'foo'
+        assert self.descriptor.single_flight is None
+
+    def test_set_name(self):
+        self.descriptor.__set_name__(self.klass, 'bar')
+
+        assert self.descriptor.name == 'bar'
+
+    def test_init_unsupported(self):
+        with pytest.raises(TypeError):
+            DictCacheDescriptor(self.method, ttl=5)
+        with pytest.raises(TypeError):
+            DictCacheDescriptor(self.method, stats=True)
+
+    def test_non_data_descriptor(self):
+        assert not hasattr(self.descriptor, '__set__')
+        assert not hasattr(self.descriptor, '__delete__')
+
+    def test_get_class(self):
+        assert self.klass.foo is self.descriptor
+
+    def test_get_instance(self):
+        assert self.instance.foo == 1
+        assert self.instance.foo == 1
+        assert self.instance.__dict__ == {'foo': 1}
+
+    def test_set(self):
+        self.instance.foo = 5
+
+        assert self.instance.foo == 5
+        assert self.counter == 0
+
+    def test_delete(self):
+        assert self.instance.foo == 1
+
+        del self.instance.foo
+
+        assert self.instance.foo == 2
+
+    def test_pop(self):
+        with pytest.raises(NotInCache):
+            self.descriptor.pop(self.instance)
+
+        assert self.instance.foo == 1
+        assert self.descriptor.pop(self.instance) == 1
+        assert self.instance.foo == 2
+
+    def test_push(self):
+        assert self.descriptor.push(self.instance, 5) == 5
+        assert self.instance.foo == 5
+
+    def test_clear(self):
+        assert not self.descriptor.clear(self.instance)
+
+        self.instance.foo
+
+        assert self.descriptor.clear(self.instance)
+        assert self.instance.__dict__ == {}
+
+    def test_lock(self):
+        descriptor = DictCacheDescriptor(self.method, lock=True)
+
+        class Foo(object):
+            foo = descriptor
+
+        instance = Foo()
+
+        assert instance.foo == 1
+        assert instance.foo == 1
+        assert descriptor.pop(instance) == 1
+        assert instance.foo == 2
+
+
+class TestGetCacheDescriptors(object):
+    def test_inherited(self):
+        class Foo(object):
+            foo = CacheDescriptor(lambda self: 'foo')
+            bar = MemoizeDescriptor(lambda self: 'bar')
+            baz = DictCacheDescriptor(lambda self: 'baz')
+
+        class Bar(Foo):
+            bar = None
+            other = CacheDescriptor(lambda self: 'other')
+
+        assert sorted(get_cache_descriptors(Foo)) == ['bar', 'baz', 'foo']
+        assert sorted(get_cache_descriptors(Bar)) == ['baz', 'foo', 'other']
+        assert get_cache_descriptors(Bar)['foo'] is Foo.__dict__['foo']
+
+
+class TestCacheDescriptorRegistry(object):
+    def test_register(self):
+        class Foo(object):
+            foo = CacheDescriptor(lambda self: 'foo')
+            baz = DictCacheDescriptor(lambda self: 'baz')
+
+        registry = CacheDescriptorRegistry()
+        registry.register(Foo, 'foo', Foo.__dict__['foo'])
+
+        assert list(registry.declared[Foo]) == ['foo']
+        # not registered descriptors are not found
+        assert list(registry.get(Foo)) == ['foo']
+        assert registry.get(Foo) is registry.get(Foo)
+
+    def test_get_attached(self):
+        class Foo(object):
+            foo = CacheDescriptor(lambda self: 'foo')
+
+            def bar(self):
+                return 'bar'
+
+        class Bar(Foo):
+            pass
+
+        registry = CacheDescriptorRegistry()
+        registry.register(Foo, 'foo', Foo.__dict__['foo'])
+
+        assert list(registry.get(Bar)) == ['foo']
+
+        # replaces plain method hence number of attributes does not change
+        Foo.bar = CacheDescriptor(lambda self: 'bar')
+        registry.register(Foo, 'bar', Foo.__dict__['bar'])
+
+        assert list(registry.get(Bar)) == ['foo', 'bar']
+
+        Bar.baz = DictCacheDescriptor(lambda self: 'baz')
+        registry.register(Bar, 'baz', Bar.__dict__['baz'])
+
+        assert list(registry.get(Bar)) == ['foo', 'bar', 'baz']
+
+        del Foo.bar
+
+        assert list(registry.get(Bar)) == ['foo', 'baz']
+        assert list(registry.get(Foo)) == ['foo']
+
+        Foo.foo = lambda self: 'foo'
+
+        assert list(registry.get(Bar)) == ['baz']
+        assert list(registry.get(Foo)) == []
+
+    @pytest.mark.skipif(sys.version_info < (3, 6), reason='requires __set_name__')
+    def test_get(self):
+        class Foo(object):
+            foo = CacheDescriptor(lambda self: 'foo')
+            bar = CacheDescriptor(lambda self: 'bar')
+
+        class Bar(Foo):
+            bar = None
+            baz = DictCacheDescriptor(lambda self: 'baz')
+
+        assert list(cache_descriptor_registry.get(Foo)) == ['foo', 'bar']
+        assert list(cache_descriptor_registry.get(Bar)) == ['foo', 'baz']
+
+        del Foo.foo
+
+        assert list(cache_descriptor_registry.get(Foo)) == ['bar']
+
+    @pytest.mark.skipif(sys.version_info < (3, 6), reason='requires __set_name__')
+    def test_django_model(self):
+        class CachedModel(models.Model):
+            class Meta(object):
+                app_label = str(random.randrange(1000, 2000))
+
+            @cache_method
+            def foo(self):
+                return 'foo'
+
+            @cache_property(in_dict=True)
+            def bar(self):
+                return 'bar'
+
+        assert sorted(cache_descriptor_registry.get(CachedModel)) == ['bar', 'foo']
+
+
+class TestCachedAttributes(object):
+    def setup_method(self, method):
+        class Foo(object):
+            @cache_method
+            def foo(self, a):
+                return a
+
+            @cache_property
+            def bar(self):
+                return 'bar'
+
+            @cache_property(in_dict=True)
+            def baz(self):
+                return 'baz'
+
+            @cache_method(storage='weak')
+            def other(self):
+                return 'other'
+
+        self.instance = Foo()
+
+    def test_has_cache(self):
+        descriptor = type(self.instance).__dict__['other']
+
+        assert not descriptor.has_cache(self.instance)
+        self.instance.other()
+        assert descriptor.has_cache(self.instance)
+
+    def test_has_cache_popped(self):
+        descriptor = type(self.instance).__dict__['foo']
+
+        self.instance.foo(1)
+        assert descriptor.has_cache(self.instance)
+
+        self.instance.foo.pop(1)
+        assert not descriptor.has_cache(self.instance)
+        assert cached_attributes(self.instance) == []
+        assert clear_caches(self.instance) == []
+
+    def test_cached_attributes_attached(self):
+        CacheDescriptor(lambda self: 'qux', as_property=True).contribute_to_class(
+            type(self.instance), 'qux',
+        )
+        self.instance.qux
+
+        assert cached_attributes(self.instance) == ['qux']
+        assert clear_caches(self.instance, only=['qux']) == ['qux']
+
+    def test_cached_attributes(self):
+        assert cached_attributes(self.instance) == []
+
+        self.instance.foo(1)
+        self.instance.baz
+        self.instance.other()
+
+        assert cached_attributes(self.instance) == ['foo', 'baz', 'other']
+
+    def test_clear_caches(self):
+        self.instance.foo(1)
+        self.instance.bar
+        self.instance.baz
+
+        assert clear_caches(self.instance) == ['foo', 'bar', 'baz']
+        assert cached_attributes(self.instance) == []
+        assert clear_caches(self.instance) == []
+
+    def test_clear_caches_only(self):
+        self.instance.foo(1)
+        self.instance.bar
+        self.instance.other()
+
+        assert clear_caches(self.instance, only=iter(['other', 'baz'])) == ['other']
+        assert cached_attributes(self.instance) == ['foo', 'bar']
+
+    def test_clear_caches_unknown(self):
+        with pytest.raises(ValueError):
+            clear_caches(self.instance, only=['foo', 'missing'])
+
+
+class ExcludedState(ExcludeCacheStateMixin):
+    @cache_method
+    def foo(self):
+        return 'foo'
+
+    @cache_property(in_dict=True)
+    def bar(self):
+        return 'bar'
+
+    @cache_method(storage='weak')
+    def baz(self):
+        return 'baz'
+
+
+class ExcludedSlotsState(ExcludedState):
+    __slots__ = ('slot', 'hidden', 'empty')
+
+    def get_excluded_state_attributes(self):
+        return super(ExcludedSlotsState, self).get_excluded_state_attributes() + ['hidden']
+
+
+class ExcludedStateModel(ExcludeCacheStateMixin, models.Model):
+    class Meta(object):
+        app_label = 'django_auxilium'
+
+    @cache_method
+    def foo(self):
+        return 'foo'
+
+
+class TestExcludeCacheStateMixin(object):
+    def setup_method(self, method):
+        self.instance = ExcludedState()
+        self.instance.value = 5
+        self.instance.foo()
+        self.instance.bar
+        self.instance.baz()
+
+    def test_get_excluded_state_attributes(self):
+        assert sorted(self.instance.get_excluded_state_attributes()) == [
+            'bar', ExcludedState.__dict__['foo'].cache_attribute,
+        ]
+
+    def test_getstate(self):
+        assert self.instance.__getstate__() == {'value': 5}
+        assert len(vars(self.instance)) == 3
+
+    def test_pickle(self):
+        actual = pickle.loads(pickle.dumps(self.instance))
+
+        assert vars(actual) == {'value': 5}
+        assert actual.foo() == 'foo'
+        assert actual.bar == 'bar'
+
+    def test_copy(self):
+        assert vars(copy.copy(self.instance)) == {'value': 5}
+        assert vars(copy.deepcopy(self.instance)) == {'value': 5}
+
+    def test_slots(self):
+        instance = ExcludedSlotsState()
+        instance.slot = 1
+        instance.hidden = 2
+        instance.foo()
+
+        assert instance.__getstate__() == (None, {'slot': 1})
+
+        instance.value = 5
+
+        assert instance.__getstate__() == ({'value': 5}, {'slot': 1})
+
+        for actual in (pickle.loads(pickle.dumps(instance)), copy.deepcopy(instance)):
+            assert vars(actual) == {'value': 5}
+            assert actual.slot == 1
+            assert not hasattr(actual, 'hidden')
+            assert not hasattr(actual, 'empty')
+            assert actual.foo() == 'foo'
+
+    def test_django_model(self):
+        attribute = ExcludedStateModel.__dict__['foo'].cache_attribute
+        instance = ExcludedStateModel(pk=5)
+        instance.foo()
+
+        for actual in (pickle.loads(pickle.dumps(instance)),
+                       copy.copy(instance), copy.deepcopy(instance)):
+            assert actual.pk == 5
+            assert attribute not in vars(actual)
+            assert actual.foo() == 'foo'
+        assert attribute in vars(instance)
+
+
 class TestMemoizeDescriptor(object):
     def setup_method(self, method):
         def bar(self, a):
@@ -234,6 +1939,42 @@ class TestMemoizeDescriptor(object):
         assert self.descriptor.cache_class is Memoizing
         assert self.descriptor.cache_attribute.startswith('bar_memoize_')
 
+    def test_maxsize(self):
+        self.descriptor.cache_options = {'maxsize': 1}
+
+        self.instance.foo('a')
+        self.instance.foo('b')
+
+        cache = self.descriptor.get_cache(self.instance)
+        assert cache.maxsize == 1
+        assert cache.evictions == 1
+
+    def test_stats(self):
+        class Foo(object):
+            foo = MemoizeDescriptor(self.bar, stats=True, maxsize=1)
+
+        descriptor = Foo.__dict__['foo']
+        instance = Foo()
+
+        assert descriptor.stats in list(cache_stats_registry)
+        assert descriptor.stats.name.endswith('.bar')
+        assert isinstance(descriptor.get_cache(instance), InstrumentedCache)
+
+        instance.foo('a')
+        instance.foo('a')
+        instance.foo('b')
+        instance.foo.pop('b')
+
+        assert instance.foo.cache_info() == descriptor.cache_info()
+        info = descriptor.cache_info()
+        assert info[:4] == (1, 2, 1, 1)
+        assert info.compute_time > 0
+
+    def test_no_stats(self):
+        assert self.descriptor.stats is None
+        assert not isinstance(self.descriptor.get_cache(self.instance), InstrumentedCache)
+        assert not hasattr(self.instance.foo, 'cache_info')
+
 
 class TestCacheDecorator(object):
     def test_function(self):
@@ -257,6 +1998,88 @@ class TestCacheDecorator(object):
         assert foo.pop() == 1
         assert foo() == 2
 
+    def test_function_lock(self):
+        release = threading.Event()
+        self.counter = 0
+
+        @CacheDecorator(lock=True)
+        def foo():
+            self.counter += 1
+            release.wait()
+            return self.counter
+
+        assert isinstance(foo.decorator.single_flight, SingleFlight)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(foo())) for _ in range(5)]
+        for t in threads:
+            t.start()
+        time.sleep(0.1)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert results == [1] * 5
+        assert foo.pop() == 1
+
+    def test_function_ttl(self):
+        self.counter = 0
+        clock = Clock()
+
+        @CacheDecorator(ttl=5, clock=clock)
+        def foo():
+            self.counter += 1
+            return self.counter
+
+        assert foo() == 1
+        clock.now = 4
+        assert foo() == 1
+        clock.now = 5
+        assert foo() == 2
+
+    def test_function_stale_while_revalidate(self):
+        self.counter = 0
+        clock = Clock()
+
+        @CacheDecorator(ttl=5, clock=clock, stale_while_revalidate=5)
+        def foo():
+            self.counter += 1
+            return self.counter
+
+        assert foo() == 1
+        clock.now = 5
+        assert foo() == 1
+        cache_revalidator.join()
+        assert self.counter == 2
+        assert foo() == 2
+
+        clock.now = 20
+        assert foo() == 3
+        cache_revalidator.join()
+        assert self.counter == 3
+
+    def test_property_ttl(self):
+        clock = Clock()
+
+        class Foo(object):
+            def __init__(self):
+                self.counter = 0
+
+            @CacheDecorator(as_property=True, ttl=5, clock=clock)
+            def foo(self):
+                self.counter += 1
+                return self.counter
+
+        f = Foo()
+
+        assert f.foo == 1
+        clock.now = 5
+        assert f.foo == 2
+        f.foo = 10
+        assert f.foo == 10
+        clock.now = 10
+        assert f.foo == 3
+
     def test_method(self):
         class Foo(object):
             def __init__(self):
@@ -287,6 +2110,131 @@ class TestCacheDecorator(object):
         assert isinstance(descriptor, CacheDescriptor)
         assert descriptor.as_property
 
+    def test_method_stats(self):
+        class Foo(object):
+            @CacheDecorator(is_method=True, stats=True)
+            def foo(self):
+                return 'foo'
+
+            @CacheDecorator(as_property=True, stats=True)
+            def bar(self):
+                return 'bar'
+
+        f = Foo()
+        f.foo()
+        f.foo()
+        f.bar
+
+        assert Foo.__dict__['foo'].cache_info().hits == 1
+        assert Foo.__dict__['foo'].cache_info().misses == 1
+        assert Foo.__dict__['bar'].cache_info().misses == 1
+
+    def test_property_in_dict(self):
+        class Foo(object):
+            @CacheDecorator(as_property=True, in_dict=True, lock=True)
+            def foo(self):
+                return 'foo'
+
+        descriptor = Foo.__dict__['foo']
+
+        assert isinstance(descriptor, DictCacheDescriptor)
+        assert descriptor.single_flight is not None
+        assert Foo().foo == 'foo'
+
+    def test_in_dict_without_property(self):
+        with pytest.raises(ValueError):
+            CacheDecorator(in_dict=True)
+
+    def test_in_dict_unsupported_options(self):
+        with pytest.raises(TypeError):
+            class Foo(object):
+                @CacheDecorator(as_property=True, in_dict=True, ttl=5)
+                def foo(self):
+                    return 'foo'
+
+    def test_property_cache_exceptions(self):
+        clock = Clock()
+
+        class Foo(object):
+            def __init__(self):
+                self.counter = 0
+
+            @CacheDecorator(as_property=True, cache_exceptions=(ValueError,), exception_ttl=5,
+                            clock=clock)
+            def foo(self):
+                self.counter += 1
+                raise ValueError(self.counter)
+
+        f = Foo()
+
+        for _ in range(2):
+            with pytest.raises(ValueError) as e:
+                f.foo
+            assert e.value.args == (1,)
+
+        clock.now = 5
+        with pytest.raises(ValueError) as e:
+            f.foo
+        assert e.value.args == (2,)
+
+    def test_cache_exceptions_without_ttl(self):
+        with pytest.raises(ValueError):
+            @CacheDecorator(cache_exceptions=(ValueError,))
+            def foo():
+                pass
+
+
+class TestWeakMemoizeDecorator(object):
+    def test_function(self):
+        self.counter = 0
+
+        @WeakMemoizeDecorator(maxsize=5)
+        def foo(obj, a):
+            self.counter += 1
+            return self.counter
+
+        a, b = Bunch(), Bunch()
+
+        assert isinstance(foo.decorator.cache, WeakMemoizing)
+        assert foo(a, 'x') == 1
+        assert foo(a, 'x') == 1
+        assert foo(b, 'x') == 2
+        assert foo(a, 'y') == 3
+        assert foo.pop(a, 'x') == 1
+        assert foo(a, 'x') == 4
+
+        del a
+        assert len(foo.decorator.cached_value) == 1
+
+    def test_function_lock(self):
+        @WeakMemoizeDecorator(lock=True)
+        def foo(obj):
+            return obj
+
+        a = Bunch()
+
+        assert foo(a) is a
+        assert foo(a) is a
+
+    def test_backend(self):
+        with pytest.raises(TypeError):
+            @WeakMemoizeDecorator(backend='default')
+            def foo(obj):
+                return obj
+
+    def test_persist(self, tmpdir):
+        with pytest.raises(TypeError):
+            @WeakMemoizeDecorator(persist=str(tmpdir.join('cache.db')))
+            def foo(obj):
+                return obj
+
+    def test_method(self):
+        with pytest.raises(TypeError):
+            class Foo(object):
+                @WeakMemoizeDecorator()
+                def foo(self, a):
+                    return a
+
 
 class TestMemoizeDecorator(object):
     def test_function(self):
@@ -312,6 +2260,425 @@ class TestMemoizeDecorator(object):
         assert foo('b') == 2
         assert foo('a') == 3
 
+    def test_function_normalize(self):
+        self.counter = 0
+
+        @MemoizeDecorator(normalize=True, lock=True, stats=True)
+        def foo(a, b=2):
+            self.counter += 1
+            return self.counter
+
+        assert isinstance(foo.decorator.cache, NormalizedCache)
+        assert foo(1) == 1
+        assert foo(1, 2) == 1
+        assert foo(1, b=2) == 1
+        assert foo(a=1, b=2) == 1
+        assert foo(1, 3) == 2
+        assert foo.cache_info().hits == 3
+        assert foo.pop(b=2, a=1) == 1
+        assert foo(1) == 3
+
+    def test_function_normalize_tags(self):
+        @MemoizeDecorator(normalize=True, tags=['normalized'])
+        def foo(a, b=2):
+            return a + b
+
+        assert foo(1) == foo(a=1, b=2) == 3
+        assert len(cache_tag_index.tags['normalized']) == 1
+        assert invalidate_tags('normalized') == 1
+
+    def test_get_cache_descriptor_options(self):
+        decorator = MemoizeDecorator(normalize=True, maxsize=5)
+        decorator.to_wrap = lambda self, a: a
+
+        assert decorator.get_cache_descriptor_options() == {
+            'lock': False,
+            'stats': False,
+            'tags': None,
+            'cache_exceptions': None,
+            'exception_ttl': None,
+            'normalize': True,
+            'maxsize': 5,
+        }
+
+    def test_method_normalize(self):
+        class Foo(object):
+            counter = 0
+
+            @MemoizeDecorator(normalize=True)
+            def foo(self, a, b=2):
+                self.counter += 1
+                return self.counter
+
+        f = Foo()
+
+        assert isinstance(Foo.__dict__['foo'].get_cache(f), NormalizedCache)
+        assert f.foo(1) == 1
+        assert f.foo(1, b=2) == 1
+        assert f.foo(a=1, b=2) == 1
+        assert f.foo.pop(1, 2) == 1
+        assert f.foo(a=1) == 2
+        assert Foo().foo(1) == 1
+
+    def test_function_maxsize(self):
+        self.counter = 0
+
+        @MemoizeDecorator(maxsize=1)
+        def foo(a):
+            self.counter += 1
+            return self.counter
+
+        assert foo.decorator.cache.maxsize == 1
+
+        assert foo('a') == 1
+        assert foo('b') == 2
+        assert foo('a') == 3
+        assert foo.decorator.cache.evictions == 2
+
+    def test_method_ttl(self):
+        clock = Clock()
+
+        class Foo(object):
+            def __init__(self):
+                self.counter = 0
+
+            @MemoizeDecorator(maxsize=5, ttl=5, clock=clock)
+            def foo(self, a):
+                self.counter += 1
+                return self.counter
+
+        f = Foo()
+
+        assert f.foo('a') == 1
+        assert f.foo('b') == 2
+        clock.now = 5
+        assert f.foo('a') == 3
+
+    def test_method_stale_while_revalidate(self):
+        clock = Clock()
+
+        class Foo(object):
+            def __init__(self):
+                self.counter = 0
+
+            @MemoizeDecorator(ttl=5, clock=clock, stale_while_revalidate=5)
+            def foo(self, a):
+                self.counter += 1
+                return self.counter
+
+        f = Foo()
+
+        assert f.foo('a') == 1
+        clock.now = 5
+        assert f.foo('a') == 1
+        cache_revalidator.join()
+        assert f.counter == 2
+        assert f.foo('a') == 2
+
+        clock.now = 20
+        assert f.foo('a') == 3
+
+    def test_function_max_bytes(self):
+        @MemoizeDecorator(max_bytes=10, sizer=len, stats=True)
+        def foo(a):
+            return a * 4
+
+        assert foo.decorator.cache.max_bytes == 10
+
+        assert foo('a') == 'aaaa'
+        assert foo('b') == 'bbbb'
+        assert foo.cache_info().nbytes == 8
+        assert foo('c') == 'cccc'
+        assert foo.cache_info().evictions == 1
+        assert foo.cache_info().nbytes == 8
+
+    def test_method_max_bytes(self):
+        class Foo(object):
+            @MemoizeDecorator(max_bytes=10, sizer=len, stats=True)
+            def foo(self, a):
+                return a * 4
+
+        f = Foo()
+        other = Foo()
+        f.foo('a')
+        other.foo('a')
+        other.foo('b')
+        other.foo('c')
+
+        assert Foo.__dict__['foo'].cache_info().nbytes == 12
+        del other
+        assert Foo.__dict__['foo'].cache_info().nbytes == 4
+
+    def test_function_cache_exceptions(self):
+        self.counter = 0
+        clock = Clock()
+
+        @MemoizeDecorator(cache_exceptions=(KeyError,), exception_ttl=5, clock=clock,
+                          stats=True)
+        def foo(a):
+            self.counter += 1
+            if a == 'missing':
+                raise KeyError(a)
+            if a == 'error':
+                raise ValueError(a)
+            return a
+
+        for _ in range(2):
+            with pytest.raises(KeyError):
+                foo('missing')
+            with pytest.raises(ValueError):
+                foo('error')
+            assert foo('a') == 'a'
+
+        assert self.counter == 4
+        assert foo.cache_info().hits == 2
+        assert foo.pop('missing') is None
+        with pytest.raises(KeyError):
+            foo('missing')
+        assert self.counter == 5
+
+        clock.now = 5
+        with pytest.raises(KeyError):
+            foo('missing')
+        assert self.counter == 6
+        assert foo('a') == 'a'
+
+    def test_method_cache_exceptions(self):
+        clock = Clock()
+
+        class Foo(object):
+            def __init__(self):
+                self.counter = 0
+
+            @MemoizeDecorator(cache_exceptions=(KeyError,), exception_ttl=5, clock=clock,
+                              lock=True)
+            def foo(self, a):
+                self.counter += 1
+                raise KeyError(a)
+
+        f = Foo()
+
+        for _ in range(2):
+            with pytest.raises(KeyError):
+                f.foo('a')
+        assert f.counter == 1
+
+        clock.now = 5
+        with pytest.raises(KeyError):
+            f.foo('a')
+        assert f.counter == 2
+
+    def test_function_backend_cache_exceptions(self):
+        caches['default'].clear()
+        self.counter = 0
+
+        @MemoizeDecorator(backend='default', timeout=60, cache_exceptions=(KeyError,),
+                          exception_ttl=5)
+        def foo(a):
+            self.counter += 1
+            raise KeyError(a)
+
+        for _ in range(2):
+            with pytest.raises(KeyError):
+                foo('a')
+        assert self.counter == 1
+
+    def test_function_backend(self):
+        caches['default'].clear()
+        self.counter = 0
+
+        @MemoizeDecorator(backend='default', timeout=60, version=2)
+        def foo(a):
+            self.counter += 1
+            return self.counter
+
+        assert isinstance(foo.decorator.cache, DjangoMemoizing)
+        assert foo.decorator.cache.namespace == (
+            'tests.utils.functools.test_cache.'
+            'TestMemoizeDecorator.test_function_backend.<locals>.foo'
+        )
+        assert foo.decorator.cache.timeout == 60
+        assert foo.decorator.cache.version == 2
+
+        assert foo('a') == 1
+        assert foo('b') == 2
+        assert foo('a') == 1
+        assert foo.pop('a') == 1
+        assert foo('a') == 3
+
+    def test_function_persist(self, tmpdir):
+        path = str(tmpdir.join('cache.db'))
+        self.counter = 0
+
+        def foo(a):
+            self.counter += 1
+            return self.counter
+
+        wrapped = MemoizeDecorator(persist=path, version=2)(foo)
+
+        assert isinstance(wrapped.decorator.cache, SQLiteMemoizing)
+        assert wrapped.decorator.cache.path == path
+        assert wrapped.decorator.cache.namespace == wrapped.decorator.get_namespace()
+        assert wrapped.decorator.cache.version == 2
+
+        assert wrapped('a') == 1
+        assert wrapped('b') == 2
+        assert wrapped('a') == 1
+
+        # same function in a new process
+        wrapped = MemoizeDecorator(persist=path, version=2)(foo)
+        assert wrapped('a') == 1
+        assert wrapped.pop('a') == 1
+        assert wrapped('a') == 3
+
+    def test_function_persist_typed_key(self, tmpdir):
+        path = str(tmpdir.join('cache.db'))
+
+        @MemoizeDecorator(persist=path, typed=True)
+        def foo(a):
+            return type(a)
+
+        @MemoizeDecorator(persist=path, namespace='bar', key=lambda a: abs(a))
+        def bar(a):
+            return a
+
+        assert foo(1) is int
+        assert foo(1.0) is float
+        assert bar(-1) == -1
+        assert bar(1) == -1
+
+    def test_persist_with_backend(self, tmpdir):
+        with pytest.raises(ValueError):
+            MemoizeDecorator(backend='default', persist=str(tmpdir.join('cache.db')))
+
+    def test_method_persist(self, tmpdir):
+        with pytest.raises(TypeError):
+            class Foo(object):
+                @MemoizeDecorator(persist=str(tmpdir.join('cache.db')))
+                def foo(self, a):
+                    return a
+
+    def test_function_tiered(self):
+        caches['default'].clear()
+        self.counter = 0
+
+        @MemoizeDecorator(backend='default', tiered=True, maxsize=10, timeout=60)
+        def foo(a):
+            self.counter += 1
+            return self.counter
+
+        assert isinstance(foo.decorator.cache, TieredMemoizing)
+        assert foo.decorator.cache.l1.maxsize == 10
+        assert foo.decorator.cache.l2.timeout == 60
+
+        assert foo('a') == 1
+        assert foo('a') == 1
+        assert foo.decorator.cache.l1_hits == 1
+
+    def test_function_warm(self):
+        self.counter = 0
+
+        @MemoizeDecorator(cache_exceptions=(KeyError,), exception_ttl=60)
+        def foo(a, b=1):
+            self.counter += 1
+            if a == 'missing':
+                raise KeyError(a)
+            return a * b
+
+        foo('a')
+        with pytest.raises(KeyError):
+            foo('missing')
+
+        report = foo.warm(['a', 'missing', ('b', 2), {'a': 'c', 'b': 3}], workers=2)
+
+        assert report[:4] == (4, 2, 2, 0)
+        assert self.counter == 4
+        assert foo('b', 2) == 'bb'
+        assert foo(a='c', b=3) == 'ccc'
+        assert self.counter == 4
+
+    def test_function_warm_process(self):
+        square.decorator.cache.set(-1, 1)
+
+        report = square.warm([1, 2, 3, -1], workers=2, executor='process')
+
+        assert report[:4] == (4, 2, 1, 1)
+        assert square.decorator.cache.get(2) == 4
+        assert square.decorator.cache.get(3) == 9
+        assert square(1) == -1
+
+    def test_function_stats(self):
+        @MemoizeDecorator(stats=True, maxsize=1)
+        def foo(a):
+            return a
+
+        assert foo.decorator.stats in list(cache_stats_registry)
+        assert foo.decorator.stats.name == (
+            'tests.utils.functools.test_cache.'
+            'TestMemoizeDecorator.test_function_stats.<locals>.foo'
+        )
+
+        foo('a')
+        foo('a')
+        foo('b')
+        foo.pop('b')
+
+        assert foo.cache_info()[:4] == (1, 2, 1, 1)
+
+    def test_function_no_stats(self):
+        @MemoizeDecorator()
+        def foo(a):
+            return a
+
+        assert foo.decorator.stats is None
+        assert not hasattr(foo, 'cache_info')
+
+    def test_method_stats(self):
+        class Foo(object):
+            @MemoizeDecorator(stats=True)
+            def foo(self, a):
+                return a
+
+        descriptor = Foo.__dict__['foo']
+        Foo().foo('a')
+
+        assert descriptor.cache_info().misses == 1
+
+    def test_tiered_without_backend(self):
+        with pytest.raises(ValueError):
+            MemoizeDecorator(tiered=True)
+
+    def test_method_backend(self):
+        with pytest.raises(TypeError):
+            class Foo(object):
+                @MemoizeDecorator(backend='default')
+                def foo(self, a):
+                    return a
+
+    def test_method_slots(self):
+        class Foo(object):
+            __slots__ = ('__weakref__',)
+
+            @MemoizeDecorator(maxsize=5, storage='weak')
+            def foo(self, a):
+                return a
+
+        descriptor = Foo.__dict__['foo']
+
+        assert descriptor.storage == 'weak'
+        assert descriptor.cache_options == {'maxsize': 5}
+        assert Foo().foo('a') == 'a'
+
+    def test_method_maxsize(self):
+        class Foo(object):
+            @MemoizeDecorator(maxsize=5)
+            def foo(self, a):
+                return a
+
+        descriptor = Foo.__dict__['foo']
+
+        assert descriptor.cache_options == {'maxsize': 5}
+
     def test_method(self):
         class Foo(object):
             def __init__(self):
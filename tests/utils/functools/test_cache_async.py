@@ -0,0 +1,331 @@
+from __future__ import absolute_import, print_function
+import asyncio
+import sys
+
+import pytest
+
+from django_auxilium.utils.functools.cache import (
+    AsyncFlight,
+    CacheDecorator,
+    CacheDescriptor,
+    CacheStats,
+    MemoizeDecorator,
+    NotInCache,
+    is_coroutine_function,
+)
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCacheStats(object):
+    def test_timed(self):
+        stats = CacheStats('foo')
+
+        async def foo():
+            await asyncio.sleep(0.01)
+            return 'foo'
+
+        wrapped = stats.timed(foo)
+
+        assert run(wrapped()) == 'foo'
+        assert stats.compute_time >= 0.01
+
+
+class TestAsyncFlight(object):
+    def test_run_concurrent(self):
+        flight = AsyncFlight()
+        calls = []
+        stored = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 'foo'
+
+        async def f():
+            return await asyncio.gather(*[
+                flight.run('key', compute, stored.append) for _ in range(5)
+            ])
+
+        assert run(f()) == ['foo'] * 5
+        assert calls == [1]
+        assert stored == ['foo']
+        assert flight.tasks == {}
+
+    def test_run_exception(self):
+        flight = AsyncFlight()
+        stored = []
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise ValueError
+
+        async def f():
+            return await asyncio.gather(*[
+                flight.run('key', compute, stored.append) for _ in range(3)
+            ], return_exceptions=True)
+
+        results = run(f())
+
+        assert len(results) == 3
+        assert all(isinstance(i, ValueError) for i in results)
+        assert results[0] is results[1] is results[2]
+        assert stored == []
+        assert flight.tasks == {}
+
+
+class TestCacheDecorator(object):
+    def test_function(self):
+        self.counter = 0
+
+        @CacheDecorator()
+        async def foo():
+            self.counter += 1
+            await asyncio.sleep(0)
+            return self.counter
+
+        assert is_coroutine_function(foo)
+
+        async def f():
+            assert await asyncio.gather(foo(), foo()) == [1, 1]
+            assert await foo() == 1
+            assert foo.pop() == 1
+            assert await foo() == 2
+
+        run(f())
+
+    def test_function_exception(self):
+        self.counter = 0
+
+        @CacheDecorator()
+        async def foo():
+            self.counter += 1
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            run(foo())
+        with pytest.raises(ValueError):
+            run(foo())
+        with pytest.raises(NotInCache):
+            foo.pop()
+        assert self.counter == 2
+
+    def test_property_ttl(self):
+        clock = Clock()
+
+        class Foo(object):
+            def __init__(self):
+                self.counter = 0
+
+            @CacheDecorator(as_property=True, ttl=5, clock=clock)
+            async def foo(self):
+                self.counter += 1
+                return self.counter
+
+        assert isinstance(Foo.__dict__['foo'], CacheDescriptor)
+
+        f = Foo()
+
+        assert run(f.foo) == 1
+        assert run(f.foo) == 1
+        clock.now = 5
+        assert run(f.foo) == 2
+
+    def test_method_task(self):
+        class Foo(object):
+            def __init__(self):
+                self.counter = 0
+
+            @CacheDecorator()
+            async def foo(self):
+                self.counter += 1
+                return self.counter
+
+        f = Foo()
+
+        async def test():
+            assert await asyncio.ensure_future(f.foo()) == 1
+            assert await asyncio.get_event_loop().create_task(f.foo()) == 1
+
+        run(test())
+        assert f.counter == 1
+
+    def test_property_stale_while_revalidate(self):
+        clock = Clock()
+
+        class Foo(object):
+            def __init__(self):
+                self.counter = 0
+
+            @CacheDecorator(as_property=True, ttl=5, clock=clock, stale_while_revalidate=5)
+            async def foo(self):
+                self.counter += 1
+                return self.counter
+
+        f = Foo()
+
+        async def test():
+            assert await f.foo == 1
+            clock.now = 5
+            assert await f.foo == 1
+            # let refresh task finish
+            await asyncio.sleep(0.01)
+            assert await f.foo == 2
+            clock.now = 20
+            assert await f.foo == 3
+
+        run(test())
+
+    def test_function_stale_while_revalidate_exception(self):
+        clock = Clock()
+        self.counter = 0
+
+        @CacheDecorator(ttl=5, clock=clock, stale_while_revalidate=5)
+        async def foo():
+            self.counter += 1
+            if self.counter > 1:
+                raise ValueError
+            return self.counter
+
+        async def test():
+            assert await foo() == 1
+            clock.now = 5
+            assert await foo() == 1
+            # let refresh task finish
+            await asyncio.sleep(0.01)
+            assert await foo() == 1
+            await asyncio.sleep(0.01)
+            assert self.counter == 3
+
+        run(test())
+
+
+class TestCachedCoroutineFunction(object):
+    def setup_method(self, method):
+        self.calls = []
+
+        @MemoizeDecorator()
+        async def foo(a):
+            self.calls.append(a)
+            await asyncio.sleep(0)
+            return a
+
+        self.foo = foo
+
+    def test_task(self):
+        async def test():
+            # miss and then hit
+            for _ in range(2):
+                assert await asyncio.ensure_future(self.foo('a')) == 'a'
+                assert await asyncio.get_event_loop().create_task(self.foo('b')) == 'b'
+
+        run(test())
+        assert self.calls == ['a', 'b']
+
+    @pytest.mark.skipif(sys.version_info < (3, 7), reason='requires asyncio.run')
+    def test_asyncio_run(self):
+        assert asyncio.run(self.foo('a')) == 'a'
+        assert asyncio.run(self.foo('a')) == 'a'
+        assert self.calls == ['a']
+
+    def test_not_awaited(self):
+        coroutine = self.foo('a')
+        coroutine.close()
+
+        assert self.calls == []
+        with pytest.raises(NotInCache):
+            self.foo.pop('a')
+
+
+class TestMemoizeDecorator(object):
+    def test_cache_exceptions(self):
+        with pytest.raises(TypeError):
+            @MemoizeDecorator(cache_exceptions=(ValueError,), exception_ttl=5)
+            async def foo(a):
+                return a
+
+        with pytest.raises(TypeError):
+            class Foo(object):
+                @MemoizeDecorator(cache_exceptions=(ValueError,), exception_ttl=5)
+                async def foo(self, a):
+                    return a
+
+    def test_function_warm(self):
+        @MemoizeDecorator()
+        async def foo(a):
+            return a
+
+        with pytest.raises(TypeError):
+            foo.warm([1, 2])
+
+    def test_function_maxsize(self):
+        self.calls = []
+
+        @MemoizeDecorator(maxsize=1)
+        async def foo(a):
+            self.calls.append(a)
+            return a
+
+        async def f():
+            assert await asyncio.gather(foo('a'), foo('a')) == ['a', 'a']
+            assert await foo('b') == 'b'
+            assert await foo('b') == 'b'
+            assert await foo('a') == 'a'
+
+        run(f())
+
+        assert self.calls == ['a', 'b', 'a']
+        assert foo.decorator.cache.evictions == 2
+
+    def test_method(self):
+        class Foo(object):
+            def __init__(self):
+                self.calls = []
+
+            @MemoizeDecorator()
+            async def foo(self, a):
+                self.calls.append(a)
+                await asyncio.sleep(0)
+                return a
+
+        f = Foo()
+
+        async def test():
+            assert await asyncio.gather(f.foo('a'), f.foo('a')) == ['a', 'a']
+            assert await f.foo('a') == 'a'
+            assert f.foo.pop('a') == 'a'
+            assert await f.foo('a') == 'a'
+
+        run(test())
+
+        assert f.calls == ['a', 'a']
+
+
+class TestMemoizeDecoratorStats(object):
+    def test_function(self):
+        @MemoizeDecorator(stats=True)
+        async def foo(a):
+            await asyncio.sleep(0.01)
+            return a
+
+        assert is_coroutine_function(foo)
+        assert run(foo('a')) == 'a'
+        assert run(foo('a')) == 'a'
+
+        info = foo.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+        assert info.compute_time >= 0.01
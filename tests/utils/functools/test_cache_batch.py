@@ -0,0 +1,142 @@
+from __future__ import absolute_import, print_function
+
+import pytest
+
+from django_auxilium.utils.functools.cache_batch import (
+    BatchCacheDecorator,
+    BatchCacheDescriptor,
+    BatchGroups,
+)
+
+
+class Bunch(object):
+    pass
+
+
+class TestBatchGroups(object):
+    def test_get_not_registered(self):
+        groups = BatchGroups()
+        obj = Bunch()
+
+        assert groups.get(obj) == [obj]
+
+    def test_register(self):
+        groups = BatchGroups()
+        a, b, c = Bunch(), Bunch(), Bunch()
+        groups.register([a, b])
+
+        assert groups.get(a) == [a, b]
+        assert groups.get(b) == [a, b]
+        assert groups.get(c) == [c]
+
+        groups.register([b, c])
+
+        assert groups.get(a) == [a, b]
+        assert groups.get(b) == [b, c]
+
+    def test_weak(self):
+        groups = BatchGroups()
+        a, b = Bunch(), Bunch()
+        groups.register([a, b])
+        del b
+
+        assert groups.get(a) == [a]
+        assert len(groups.groups) == 1
+
+
+class TestBatchCacheDescriptor(object):
+    def setup_method(self, method):
+        self.calls = []
+
+        class Foo(object):
+            def __init__(self, name):
+                self.name = name
+
+            length = BatchCacheDescriptor(self.length)
+
+        self.klass = Foo
+        self.descriptor = Foo.__dict__['length']
+        self.groups = BatchGroups()
+        self.descriptor.groups = self.groups
+        self.instances = [Foo('a'), Foo('bb'), Foo('ccc')]
+
+    def length(self, instances):
+        self.calls.append([i.name for i in instances])
+        return [len(i.name) for i in instances]
+
+    def test_init(self):
+        assert self.descriptor.cache_attribute.startswith('length_batch_')
+
+    def test_get_class(self):
+        assert self.klass.length is self.descriptor
+
+    def test_getter_not_grouped(self):
+        assert self.instances[1].length() == 2
+        assert self.instances[1].length() == 2
+        assert self.calls == [['bb']]
+
+    def test_getter_grouped(self):
+        self.groups.register(self.instances)
+        self.instances[0].length()
+
+        assert self.instances[1].length() == 2
+        assert self.instances[2].length() == 3
+        assert self.calls == [['a', 'bb', 'ccc']]
+
+    def test_getter_grouped_partially_cached(self):
+        self.groups.register(self.instances)
+        self.instances[1].length.push(5)
+        self.instances[2].length.push(6)
+        self.instances[2].length.pop()
+
+        assert self.instances[2].length() == 3
+        assert self.instances[0].length() == 1
+        assert self.instances[1].length() == 5
+        assert self.calls == [['a', 'ccc']]
+
+    def test_getter_lock(self):
+        descriptor = BatchCacheDescriptor(self.length, lock=True)
+        descriptor.groups = self.groups
+        self.groups.register(self.instances)
+
+        assert descriptor.getter(self.instances[0]) == 1
+        assert descriptor.getter(self.instances[1]) == 2
+        assert self.calls == [['a', 'bb', 'ccc']]
+
+    def test_prime(self):
+        self.instances[0].length()
+
+        assert self.descriptor.prime(self.instances) == [2, 3]
+        assert self.descriptor.prime(self.instances) == []
+        assert [i.length() for i in self.instances] == [1, 2, 3]
+        assert self.calls == [['a'], ['bb', 'ccc']]
+
+    def test_batch_invalid(self):
+        descriptor = BatchCacheDescriptor(lambda instances: [])
+
+        with pytest.raises(ValueError):
+            descriptor.batch(self.instances)
+
+
+class TestBatchCacheDecorator(object):
+    def test_method(self):
+        def length(instances):
+            return [len(i.name) for i in instances]
+
+        class Foo(object):
+            def __init__(self, name):
+                self.name = name
+
+            length_method = BatchCacheDecorator()(length)
+
+            @BatchCacheDecorator(as_property=True)
+            def length_property(instances):
+                return [len(i.name) for i in instances]
+
+        assert isinstance(Foo.__dict__['length_method'], BatchCacheDescriptor)
+        assert Foo('foo').length_method() == 3
+        assert Foo('foo').length_property == 3
+
+    def test_in_dict(self):
+        with pytest.raises(ValueError):
+            BatchCacheDecorator(as_property=True, in_dict=True)
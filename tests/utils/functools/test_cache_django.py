@@ -0,0 +1,241 @@
+from __future__ import absolute_import, print_function
+import os
+import subprocess
+import sys
+
+import mock
+import pytest
+from django.core.cache import caches
+
+from django_auxilium.utils.functools.cache import (
+    CacheEntry,
+    Memoizing,
+    NotInCache,
+    StaleInCache,
+)
+from django_auxilium.utils.functools.cache_django import DjangoMemoizing, TieredMemoizing
+
+
+class Bunch(object):
+    pass
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_not_imported_by_package():
+    env = dict(os.environ)
+    env.pop('DJANGO_SETTINGS_MODULE', None)
+    code = (
+        'import sys; '
+        'import django_auxilium.utils.functools; '
+        'print("django.core.cache" in sys.modules)'
+    )
+    output = subprocess.check_output([sys.executable, '-c', code], env=env)
+
+    assert output.strip() == b'False'
+
+
+class TestDjangoMemoizing(object):
+    def setup_method(self, method):
+        caches['default'].clear()
+        self.object = Bunch()
+        self.cache = DjangoMemoizing(self.object, 'cache', namespace='foo.bar')
+
+    def test_init(self):
+        assert self.cache.alias == 'default'
+        assert self.cache.backend is caches['default']
+        assert DjangoMemoizing(self.object, 'cache').namespace == 'cache'
+        assert DjangoMemoizing(self.object, 'cache', ttl=5).timeout == 5
+        assert DjangoMemoizing(self.object, 'cache', ttl=5, timeout=None).timeout is None
+
+    def test_get_key(self):
+        key = self.cache._get_key('foo', bar=5)
+
+        assert key.startswith('django_auxilium.memoize:foo.bar:1:')
+        assert key == self.cache._get_key('foo', bar=5)
+        assert key != self.cache._get_key('foo', bar=6)
+        assert key != DjangoMemoizing(self.object, 'cache', namespace='foo.bar', version=2)._get_key('foo', bar=5)
+
+    def test_get_key_typed(self):
+        class List(list):
+            pass
+
+        cache = DjangoMemoizing(self.object, 'cache', typed=True)
+
+        assert self.cache._get_key([1], a=[1]) == self.cache._get_key(List([1]), a=List([1]))
+        assert cache._get_key([1]) != cache._get_key(List([1]))
+        assert cache._get_key(a=[1]) != cache._get_key(a=List([1]))
+        assert cache._get_key([1]) == cache._get_key([1])
+
+    def test_get_key_custom(self):
+        cache = DjangoMemoizing(self.object, 'cache', key=lambda a, b=None: a)
+
+        assert cache._get_key('foo', b=1) == cache._get_key('foo', b=2)
+        assert cache._get_key('foo') != cache._get_key('bar')
+
+    def test_get_not_present(self):
+        with pytest.raises(NotInCache):
+            self.cache.get('foo')
+
+    def test_set_get(self):
+        assert self.cache.set(None, 'foo') is None
+        assert self.cache.get('foo') is None
+        assert not hasattr(self.object, 'cache')
+
+    def test_shared(self):
+        self.cache.set('foo', 'foo')
+
+        assert DjangoMemoizing(Bunch(), 'cache', namespace='foo.bar').get('foo') == 'foo'
+
+    def test_delete(self):
+        self.cache.set('foo', 'foo')
+
+        assert self.cache.delete('foo') == 'foo'
+        with pytest.raises(NotInCache):
+            self.cache.delete('foo')
+
+    def test_stale_while_revalidate(self):
+        clock = Clock()
+        cache = DjangoMemoizing(
+            self.object, 'cache', namespace='foo.bar', timeout=10, clock=clock,
+            stale_while_revalidate=5,
+        )
+
+        with mock.patch.object(cache.backend, 'set', wraps=cache.backend.set) as backend_set:
+            cache.set('foo', 'foo')
+        assert backend_set.call_args[0][1:] == (CacheEntry('foo', 10), 15)
+        assert cache.get('foo') == 'foo'
+
+        clock.now = 10
+        with pytest.raises(StaleInCache) as e:
+            cache.get('foo')
+        assert e.value.value == 'foo'
+
+        clock.now = 15
+        with pytest.raises(NotInCache):
+            cache.get('foo')
+
+    def test_stale_while_revalidate_delete(self):
+        cache = DjangoMemoizing(
+            self.object, 'cache', namespace='foo.bar', timeout=10, stale_while_revalidate=5,
+        )
+        cache.set('foo', 'foo')
+
+        assert cache.delete('foo') == 'foo'
+
+    def test_stale_while_revalidate_without_timeout(self):
+        with pytest.raises(ValueError):
+            DjangoMemoizing(self.object, 'cache', stale_while_revalidate=5)
+        with pytest.raises(ValueError):
+            DjangoMemoizing(self.object, 'cache', timeout=None, stale_while_revalidate=5)
+
+    def test_file_based(self, settings, tmpdir):
+        settings.CACHES = {
+            'files': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': str(tmpdir),
+            },
+        }
+        cache = DjangoMemoizing(self.object, 'cache', alias='files', timeout=60)
+
+        cache.set(['foo'], 'foo')
+
+        assert cache.get('foo') == ['foo']
+        assert tmpdir.listdir()
+
+
+class TestTieredMemoizing(object):
+    def setup_method(self, method):
+        caches['default'].clear()
+        self.object = Bunch()
+        self.clock = Clock()
+        self.cache = TieredMemoizing(
+            self.object, 'cache', namespace='foo.bar', maxsize=2,
+            ttl=5, timeout=60, clock=self.clock,
+        )
+
+    def test_init(self):
+        assert isinstance(self.cache.l1, Memoizing)
+        assert self.cache.l1.maxsize == 2
+        assert self.cache.l1.ttl == 5
+        assert isinstance(self.cache.l2, DjangoMemoizing)
+        assert self.cache.l2.timeout == 60
+        assert self.cache.l2.namespace == 'foo.bar'
+
+    def test_typed_key(self):
+        def key(a, b=None):
+            return a
+
+        cache = TieredMemoizing(self.object, 'cache', typed=True, key=key)
+
+        assert cache.l1.typed and cache.l2.typed
+        assert cache.l1.key is key and cache.l2.key is key
+
+        cache.set('value', 'a', b=1)
+        cache.l1.delete('a', b=2)
+        assert cache.get('a', b=3) == 'value'
+        assert cache.l2_hits == 1
+
+    def test_get_not_present(self):
+        with pytest.raises(NotInCache):
+            self.cache.get('foo')
+
+        assert self.cache.misses == 1
+
+    def test_get_l1(self):
+        self.cache.set('foo', 'foo')
+
+        assert self.cache.get('foo') == 'foo'
+        assert self.cache.l1_hits == 1
+        assert self.cache.l2_hits == 0
+
+    def test_get_l2_promotes(self):
+        self.cache.l2.set('foo', 'foo')
+
+        assert self.cache.get('foo') == 'foo'
+        assert self.cache.get('foo') == 'foo'
+        assert self.cache.l1_hits == 1
+        assert self.cache.l2_hits == 1
+
+    def test_get_l1_expired(self):
+        self.cache.set('foo', 'foo')
+        self.clock.now = 5
+
+        assert self.cache.get('foo') == 'foo'
+        assert self.cache.l2_hits == 1
+
+    def test_delete(self):
+        self.cache.set('foo', 'foo')
+
+        assert self.cache.delete('foo') == 'foo'
+        with pytest.raises(NotInCache):
+            self.cache.l2.get('foo')
+        with pytest.raises(NotInCache):
+            self.cache.delete('foo')
+
+    def test_stale_while_revalidate(self):
+        cache = TieredMemoizing(
+            self.object, 'cache', namespace='foo.bar', ttl=5, timeout=60,
+            clock=self.clock, stale_while_revalidate=5,
+        )
+        cache.set('foo', 'foo')
+        cache.l2.set('bar', 'foo')
+        self.clock.now = 5
+
+        assert cache.l1.stale_while_revalidate == 5
+        assert cache.l2.stale_while_revalidate == 5
+        assert cache.get('foo') == 'bar'
+        assert cache.l2_hits == 1
+
+        cache.l2.delete('foo')
+        self.clock.now = 10
+        with pytest.raises(StaleInCache) as e:
+            cache.get('foo')
+        assert e.value.value == 'bar'
+        assert cache.misses == 1
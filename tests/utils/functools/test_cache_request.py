@@ -0,0 +1,152 @@
+from __future__ import absolute_import, print_function
+import threading
+import time
+
+import pytest
+
+from django_auxilium.utils.functools.cache import NotInCache
+from django_auxilium.utils.functools.cache_request import (
+    RequestCache,
+    RequestMemoizeDecorator,
+    RequestMemoizing,
+    ThreadLocalVar,
+    request_cache_context,
+    request_cache_scope,
+)
+
+
+mock_owner = object()
+
+
+class TestThreadLocalVar(object):
+    def test_get_set_reset(self):
+        var = ThreadLocalVar('foo', default='default')
+
+        assert var.get() == 'default'
+        token = var.set('foo')
+        assert var.get() == 'foo'
+
+        values = []
+        t = threading.Thread(target=lambda: values.append(var.get()))
+        t.start()
+        t.join()
+        assert values == ['default']
+
+        var.reset(token)
+        assert var.get() == 'default'
+
+
+class TestRequestCacheScope(object):
+    def test_scope(self):
+        assert request_cache_context.get() is None
+
+        with request_cache_scope() as outer:
+            assert isinstance(outer, RequestCache)
+            assert request_cache_context.get() is outer
+
+            with request_cache_scope() as inner:
+                assert request_cache_context.get() is inner
+            assert request_cache_context.get() is outer
+
+        assert request_cache_context.get() is None
+
+
+class TestRequestMemoizing(object):
+    def setup_method(self, method):
+        self.cache = RequestMemoizing(mock_owner, 'cache')
+
+    def test_init(self):
+        assert self.cache.parent is mock_owner
+        assert self.cache.container is None
+
+    def test_no_scope(self):
+        assert self.cache.set('foo', 'foo') == 'foo'
+
+        with pytest.raises(NotInCache):
+            self.cache.get('foo')
+        with pytest.raises(NotInCache):
+            self.cache.delete('foo')
+
+    def test_scope(self):
+        with request_cache_scope() as scope:
+            self.cache.set('foo', 'foo')
+
+            assert self.cache.get('foo') == 'foo'
+            assert scope.cache == {'foo': 'foo'}
+
+        with request_cache_scope():
+            with pytest.raises(NotInCache):
+                self.cache.get('foo')
+
+
+class TestRequestMemoizeDecorator(object):
+    def test_function(self):
+        self.counter = 0
+
+        @RequestMemoizeDecorator()
+        def foo(a):
+            self.counter += 1
+            return self.counter
+
+        @RequestMemoizeDecorator()
+        def bar(a):
+            return 'bar'
+
+        assert isinstance(foo.decorator.cache, RequestMemoizing)
+        assert foo.decorator.cache.attr != bar.decorator.cache.attr
+
+        with request_cache_scope():
+            assert foo('a') == 1
+            assert bar('a') == 'bar'
+            assert foo('a') == 1
+            assert foo('b') == 2
+        with request_cache_scope():
+            assert foo('a') == 3
+        assert foo('a') == 4
+        assert foo('a') == 5
+
+    def test_function_lock(self):
+        release = threading.Event()
+        lock = threading.Lock()
+        self.counter = 0
+
+        @RequestMemoizeDecorator(lock=True)
+        def foo(a):
+            with lock:
+                self.counter += 1
+                value = self.counter
+            release.wait()
+            return value
+
+        results = []
+
+        def request():
+            with request_cache_scope():
+                results.append(foo('a'))
+                results.append(foo('a'))
+
+        threads = [threading.Thread(target=request) for _ in range(2)]
+        for t in threads:
+            t.start()
+        time.sleep(0.1)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert sorted(results) == [1, 1, 2, 2]
+
+    def test_get_flight_key(self):
+        @RequestMemoizeDecorator(lock=True)
+        def foo(a):
+            return a
+
+        assert foo.decorator.get_flight_key('a') != foo.decorator.get_flight_key('a')
+        with request_cache_scope() as scope:
+            assert foo.decorator.get_flight_key('a') == (id(scope), 'a')
+
+    def test_method(self):
+        with pytest.raises(TypeError):
+            class Foo(object):
+                @RequestMemoizeDecorator()
+                def foo(self, a):
+                    return a
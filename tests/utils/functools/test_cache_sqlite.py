@@ -0,0 +1,159 @@
+from __future__ import absolute_import, print_function
+import threading
+import time
+
+import mock
+import pytest
+
+from django_auxilium.utils.functools.cache import NotInCache, StaleInCache
+from django_auxilium.utils.functools.cache_sqlite import SQLiteMemoizing
+
+
+class Bunch(object):
+    pass
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class Unloadable(object):
+    def __setstate__(self, state):
+        raise RuntimeError('unloadable')
+
+
+class TestSQLiteMemoizing(object):
+    def setup_method(self, method):
+        self.object = Bunch()
+
+    def get_cache(self, tmpdir, **kwargs):
+        kwargs.setdefault('namespace', 'foo.bar')
+        return SQLiteMemoizing(self.object, 'cache', str(tmpdir.join('cache.db')), **kwargs)
+
+    def test_init(self, tmpdir):
+        cache = SQLiteMemoizing(self.object, 'cache', str(tmpdir.join('cache.db')))
+
+        assert cache.namespace == 'cache'
+        assert cache.version == 1
+        assert cache.clock is time.time
+
+    def test_get_key(self, tmpdir):
+        cache = self.get_cache(tmpdir)
+        key = cache._get_key('foo', bar=5)
+
+        assert key.startswith('foo.bar:1:')
+        assert key == cache._get_key('foo', bar=5)
+        assert key != cache._get_key('foo', bar=6)
+        assert key != self.get_cache(tmpdir, version=2)._get_key('foo', bar=5)
+
+    def test_get_key_typed(self, tmpdir):
+        cache = self.get_cache(tmpdir, typed=True)
+
+        assert cache._get_key(1, bar=5) == cache._get_key(1, bar=5)
+        assert cache._get_key(1, bar=5) != cache._get_key(1.0, bar=5)
+        assert cache._get_key(1, bar=5) != cache._get_key(1, bar=5.0)
+
+    def test_get_key_custom(self, tmpdir):
+        cache = self.get_cache(tmpdir, key=lambda a, b=None: a)
+
+        assert cache._get_key('foo', b=1) == cache._get_key('foo', b=2)
+        assert cache._get_key('foo') != cache._get_key('bar')
+
+    def test_get_not_present(self, tmpdir):
+        with pytest.raises(NotInCache):
+            self.get_cache(tmpdir).get('foo')
+
+    def test_set_get(self, tmpdir):
+        cache = self.get_cache(tmpdir)
+
+        assert cache.set({'foo': [1, 2]}, 'foo') == {'foo': [1, 2]}
+        assert cache.get('foo') == {'foo': [1, 2]}
+        assert cache.set(None, 'foo') is None
+        assert cache.get('foo') is None
+        assert not hasattr(self.object, 'cache')
+        assert tmpdir.join('cache.db').check()
+
+    def test_shared(self, tmpdir):
+        self.get_cache(tmpdir).set('foo', 'foo')
+
+        assert self.get_cache(tmpdir).get('foo') == 'foo'
+        with pytest.raises(NotInCache):
+            self.get_cache(tmpdir, version=2).get('foo')
+        with pytest.raises(NotInCache):
+            self.get_cache(tmpdir, namespace='other').get('foo')
+
+    def test_delete(self, tmpdir):
+        cache = self.get_cache(tmpdir)
+        cache.set('foo', 'foo')
+
+        assert cache.delete('foo') == 'foo'
+        with pytest.raises(NotInCache):
+            cache.delete('foo')
+
+    def test_ttl(self, tmpdir):
+        clock = Clock()
+        cache = self.get_cache(tmpdir, ttl=10, clock=clock, stale_while_revalidate=5)
+        cache.set('foo', 'foo')
+
+        assert cache.get('foo') == 'foo'
+        clock.now = 10
+        with pytest.raises(StaleInCache):
+            cache.get('foo')
+        clock.now = 15
+        with pytest.raises(NotInCache):
+            cache.get('foo')
+
+        count = cache.connection.execute('SELECT COUNT(*) FROM {0}'.format(cache.table))
+        assert count.fetchone()[0] == 0
+
+    def test_not_loadable(self, tmpdir):
+        cache = self.get_cache(tmpdir)
+        cache.set('foo', 'foo')
+        with cache.connection as connection:
+            connection.execute('UPDATE {0} SET value = ?'.format(cache.table), (b'invalid',))
+
+        with pytest.raises(NotInCache):
+            cache.get('foo')
+        with pytest.raises(NotInCache):
+            cache.delete('foo')
+
+    def test_loading_error(self, tmpdir):
+        cache = self.get_cache(tmpdir)
+        value = Unloadable()
+        value.foo = 'foo'
+        cache.set(value, 'foo')
+
+        with pytest.raises(RuntimeError):
+            cache.get('foo')
+
+        count = cache.connection.execute('SELECT COUNT(*) FROM {0}'.format(cache.table))
+        assert count.fetchone()[0] == 1
+
+    def test_connection_per_thread(self, tmpdir):
+        cache = self.get_cache(tmpdir)
+        cache.set('foo', 'foo')
+        connections = []
+        results = []
+
+        def target():
+            connections.append(cache.connection)
+            results.append(cache.get('foo'))
+
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+
+        assert results == ['foo']
+        assert connections[0] is not cache.connection
+
+    def test_connection_per_process(self, tmpdir):
+        cache = self.get_cache(tmpdir)
+        connection = cache.connection
+
+        assert cache.connection is connection
+        with mock.patch('os.getpid', return_value=-1):
+            assert cache.connection is not connection
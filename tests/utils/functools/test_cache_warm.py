@@ -0,0 +1,200 @@
+from __future__ import absolute_import, print_function
+import multiprocessing
+import sys
+import threading
+
+import mock
+import pytest
+from django.db import connections
+
+from django_auxilium.utils.functools.cache import CacheDecorator, cache_method, cache_property
+from django_auxilium.utils.functools.cache_warm import (
+    CacheWarmer,
+    WarmReport,
+    discard_inherited_connections,
+    get_call_arguments,
+    warm_cached_property,
+    warm_call,
+    warm_thread_call,
+)
+
+
+class TestGetCallArguments(object):
+    def test_get_call_arguments(self):
+        assert get_call_arguments((1, 2)) == ((1, 2), {})
+        assert get_call_arguments({'a': 1}) == ((), {'a': 1})
+        assert get_call_arguments([1]) == (([1],), {})
+
+
+class TestWarmCall(object):
+    def test_warm_call(self):
+        error = ValueError()
+
+        def f(a, b=None):
+            if b is None:
+                raise error
+            return a + b
+
+        assert warm_call(f, ((1,), {'b': 2})) == ((1,), {'b': 2}, True, 3)
+        assert warm_call(f, ((1,), {})) == ((1,), {}, False, error)
+
+    def test_warm_thread_call(self):
+        def f(a):
+            if a is None:
+                raise ValueError
+            return a
+
+        with mock.patch.object(connections, 'close_all') as close_all:
+            assert warm_thread_call(f, ((1,), {})) == ((1,), {}, True, 1)
+            assert warm_thread_call(f, ((None,), {}))[2] is False
+
+        assert close_all.call_count == 2
+
+
+class TestCacheWarmer(object):
+    def setup_method(self, method):
+        self.cache = {}
+        self.lock = threading.Lock()
+
+    def compute(self, a, b=0):
+        if a < 0:
+            raise ValueError(a)
+        with self.lock:
+            self.cache[(a, b)] = a + b
+        return a + b
+
+    def is_cached(self, a, b=0):
+        return (a, b) in self.cache
+
+    def test_init(self):
+        with pytest.raises(ValueError):
+            CacheWarmer(executor='foo')
+
+    def test_init_without_fork(self):
+        with mock.patch.object(multiprocessing, 'get_context', create=True,
+                               side_effect=ValueError):
+            with pytest.raises(ValueError):
+                CacheWarmer(executor='process')
+            assert CacheWarmer().executor == 'thread'
+
+    @pytest.mark.skipif(sys.version_info < (3,), reason='requires start methods')
+    def test_get_pool_fork(self):
+        warmer = CacheWarmer(executor='process')
+
+        with mock.patch.object(multiprocessing, 'get_context') as get_context:
+            pool = warmer.get_pool()
+
+        get_context.assert_called_with('fork')
+        get_context.return_value.Pool.assert_called_once_with(
+            1, initializer=discard_inherited_connections,
+        )
+        assert pool is get_context.return_value.Pool.return_value
+
+    def test_discard_inherited_connections(self):
+        opened, closed = mock.MagicMock(), mock.MagicMock(connection=None)
+        raw = opened.connection
+
+        with mock.patch.object(connections, 'all', return_value=[opened, closed]):
+            with mock.patch.object(connections, 'close_all') as close_all:
+                module = sys.modules[discard_inherited_connections.__module__]
+                with mock.patch.object(module, 'inherited_connections', []) as inherited:
+                    discard_inherited_connections()
+
+        assert not close_all.called
+        assert not opened.close.called
+        assert opened.connection is None
+        assert inherited == [raw]
+
+    def test_warm(self):
+        self.cache[(1, 0)] = 1
+        progress = []
+        warmer = CacheWarmer(workers=3, progress=lambda *args: progress.append(args))
+
+        report = warmer.warm([1, 2, (3, 1), {'a': 4, 'b': 2}, -1], self.compute, self.is_cached)
+
+        assert isinstance(report, WarmReport)
+        assert report[:4] == (5, 3, 1, 1)
+        assert report.elapsed > 0
+        assert self.cache == {(1, 0): 1, (2, 0): 2, (3, 1): 4, (4, 2): 6}
+        assert sorted(progress) == [(1, 4), (2, 4), (3, 4), (4, 4)]
+
+    def test_warm_store(self):
+        stored = []
+        warmer = CacheWarmer()
+
+        report = warmer.warm(
+            [1, 2], lambda a: a * 2, lambda a: False,
+            lambda value, a: stored.append((a, value)),
+        )
+
+        assert report.computed == 2
+        assert sorted(stored) == [(1, 2), (2, 4)]
+
+    def test_warm_nothing_missing(self):
+        warmer = CacheWarmer()
+
+        with mock.patch.object(warmer, 'get_pool') as get_pool:
+            report = warmer.warm([1], self.compute, lambda a: True)
+
+        assert report[:4] == (1, 0, 1, 0)
+        assert not get_pool.called
+
+
+class TestWarmCachedProperty(object):
+    def setup_method(self, method):
+        class Foo(object):
+            def __init__(self, value):
+                self.value = value
+
+            @cache_property
+            def prop(self):
+                if self.value < 0:
+                    raise ValueError
+                return self.value * 2
+
+            @cache_method
+            def method(self):
+                return self.value * 3
+
+            @CacheDecorator(as_property=True, in_dict=True)
+            def dict_prop(self):
+                return self.value * 4
+
+        self.klass = Foo
+        self.instances = [Foo(i) for i in range(5)]
+
+    def test_property(self):
+        self.instances[0].prop
+        progress = []
+
+        report = warm_cached_property(
+            self.instances + [self.klass(-1)], 'prop', workers=2,
+            progress=lambda *args: progress.append(args),
+        )
+
+        assert report[:4] == (6, 4, 1, 1)
+        assert len(progress) == 5
+        descriptor = self.klass.__dict__['prop']
+        for i in self.instances:
+            assert getattr(i, descriptor.cache_attribute) == i.value * 2
+
+    def test_method(self):
+        report = warm_cached_property(self.instances, 'method', workers=2)
+
+        assert report.computed == 5
+        descriptor = self.klass.__dict__['method']
+        for i in self.instances:
+            assert getattr(i, descriptor.cache_attribute) == i.value * 3
+        assert warm_cached_property(self.instances, 'method').cached == 5
+
+    def test_in_dict(self):
+        report = warm_cached_property(self.instances, 'dict_prop')
+
+        assert report.computed == 5
+        for i in self.instances:
+            assert i.__dict__['dict_prop'] == i.value * 4
+        assert warm_cached_property(self.instances, 'dict_prop').cached == 5
+
+    def test_not_cached_attribute(self):
+        with pytest.raises(AttributeError):
+            warm_cached_property(self.instances, 'value')